@@ -0,0 +1,97 @@
+"""This module is a benchmark of the csv readers of the InputHandler. It
+times building Transactions from csv.DictReader rows against building them
+from csv.reader values with the precompiled column indexes.
+
+To run the benchmark use this command in the terminal.
+python3 -m benchmarks.benchmark_csv_reader 1000000
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from input_handler.input_handler import InputHandler
+
+TRANSACTION_TYPES = ["deposit", "withdrawal", "transfer", "refund"]
+CURRENCIES = ["CAD", "CAD", "CAD", "USD", "XRP", "LTC"]
+
+
+def write_transactions(file_path: str, row_count: int) -> None:
+    """Writes a csv file of random transactions like input_data.csv.
+
+    Args:
+        file_path (str): The path of the file to write.
+        row_count (int): The number of rows to write.
+    """
+    generator = random.Random(7)
+
+    with open(file_path, "w", newline="") as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(["Transaction ID", "Account number", "Date",
+                         "Transaction type", "Amount", "Currency",
+                         "Description"])
+        for transaction_id in range(1, row_count + 1):
+            writer.writerow([transaction_id,
+                             generator.randint(1000, 99999),
+                             f"2023-{generator.randint(1, 12):02d}-"
+                             f"{generator.randint(1, 28):02d}",
+                             generator.choice(TRANSACTION_TYPES),
+                             round(generator.uniform(-100, 20000), 2),
+                             generator.choice(CURRENCIES),
+                             "Benchmark"])
+
+
+def time_reader(name: str, read, row_count: int) -> list:
+    """Times one reader and prints the result.
+
+    Args:
+        name (str): The name printed for the reader.
+        read: A function returning the list of Transactions.
+        row_count (int): The number of rows in the file.
+
+    Returns:
+        transactions: the list the reader returned.
+    """
+    started = time.perf_counter()
+    transactions = read()
+    seconds = time.perf_counter() - started
+    print(f"{name:<28}{seconds:8.2f} s{row_count / seconds:14,.0f} rows/s")
+    return transactions
+
+
+def main(row_count: int) -> None:
+    """Writes a file of row_count transactions and times both readers on it.
+
+    Args:
+        row_count (int): The number of rows in the file.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "benchmark.csv")
+        write_transactions(file_path, row_count)
+        input_handler = InputHandler(file_path)
+
+        def read_with_dict_reader() -> list:
+            with open(file_path, "r") as input_file:
+                transactions = map(input_handler.parse_transaction,
+                                   csv.DictReader(input_file))
+                return [transaction for transaction in transactions
+                        if transaction is not None]
+
+        print(f"{row_count:,} rows")
+        expected = time_reader("csv.DictReader", read_with_dict_reader,
+                               row_count)
+        actual = time_reader("csv.reader + column indexes",
+                             lambda: list(input_handler.iter_transactions()),
+                             row_count)
+
+        if expected != actual:
+            raise AssertionError("The readers returned different transactions.")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,137 @@
+"""This module is a benchmark of the ways amounts can be added up. It times
+summing the amounts of each account as floats, as Decimals and as integer
+minor units, and shows how far the float totals drift from the exact ones.
+Every path starts from the amount string and the float the validation
+already parsed from it. It then times DataProcessor in its float and
+minor_units money modes.
+
+To run the benchmark use this command in the terminal.
+python3 -m benchmarks.benchmark_money 1000000
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import random
+import sys
+import time
+from decimal import Decimal
+from data_processor.data_processor import DataProcessor
+from transaction.money import format_minor_units, parse_minor_units
+from transaction.transaction import Transaction
+
+ACCOUNT_COUNT = 1000
+"""The number of accounts the amounts are spread over."""
+
+
+def make_rows(row_count: int) -> list:
+    """Makes random (account number, amount string, amount float) rows.
+
+    Args:
+        row_count (int): The number of rows to make.
+
+    Returns:
+        rows: the list of rows.
+    """
+    generator = random.Random(7)
+    rows = []
+
+    for _ in range(row_count):
+        amount = f"{generator.randint(1, 2000000) / 100:.2f}"
+        rows.append((str(generator.randrange(ACCOUNT_COUNT)), amount,
+                     float(amount)))
+
+    return rows
+
+
+def sum_by_account(rows: list, convert, zero) -> dict:
+    """Converts and adds up the amounts of each account the way
+    DataProcessor does: into the balance, the total deposits and the
+    statistics total.
+
+    Args:
+        rows (list): The (account number, amount string, amount float) rows.
+        convert: The function taking the amount string and float and
+            returning the value to add.
+        zero: The starting total of an account.
+
+    Returns:
+        totals: the total of each account.
+    """
+    totals = {}
+    deposits = {}
+    statistics_total = zero
+
+    for account_number, amount, parsed in rows:
+        amount = convert(amount, parsed)
+        totals[account_number] = totals.get(account_number, zero) + amount
+        deposits[account_number] = deposits.get(account_number, zero) + amount
+        statistics_total += amount
+
+    return totals
+
+
+def time_function(name: str, function, row_count: int):
+    """Times one function and prints the result.
+
+    Args:
+        name (str): The name printed for the function.
+        function: The function to time.
+        row_count (int): The number of rows it handles.
+
+    Returns:
+        result: the value the function returned.
+    """
+    started = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - started
+    print(f"{name:<28}{seconds:8.2f} s{row_count / seconds:14,.0f} rows/s")
+    return result
+
+
+def main(row_count: int) -> None:
+    """Times each way of adding up row_count amounts.
+
+    Args:
+        row_count (int): The number of amounts.
+    """
+    rows = make_rows(row_count)
+    print(f"{row_count:,} rows over {ACCOUNT_COUNT:,} accounts")
+
+    floats = time_function(
+        "float",
+        lambda: sum_by_account(rows, lambda amount, parsed: parsed, 0.0),
+        row_count)
+    decimals = time_function(
+        "Decimal",
+        lambda: sum_by_account(rows, lambda amount, parsed: Decimal(amount),
+                               Decimal(0)),
+        row_count)
+    minor_units = time_function(
+        "integer minor units",
+        lambda: sum_by_account(rows, lambda amount, parsed: parse_minor_units(
+            amount, parsed=parsed), 0),
+        row_count)
+
+    if any(Decimal(format_minor_units(total)) != decimals[account_number]
+           for account_number, total in minor_units.items()):
+        raise AssertionError("The minor unit totals are not exact.")
+
+    drift = max(abs(Decimal(total) - decimals[account_number])
+                for account_number, total in floats.items())
+    print(f"largest float drift from the exact total: {drift:.2E}")
+
+    transactions = [Transaction(str(index), account_number, "2023-03-01",
+                                "deposit", parsed, "CAD", "Benchmark",
+                                amount)
+                    for index, (account_number, amount, parsed)
+                    in enumerate(rows)]
+
+    for money_mode in DataProcessor.MONEY_MODES:
+        time_function(f"DataProcessor {money_mode}",
+                      DataProcessor(transactions, money_mode=money_mode).process_data,
+                      row_count)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,226 @@
+"""
+Mergeable Aggregates Module
+
+This module provides the combine functions for the partial results of
+DataProcessor, so that results computed over separate parts of the
+transactions can be merged into one. Each merge function returns a new
+value without changing its arguments and has the empty value of its type
+({} or []) as identity. Float totals are merged with +, which is not
+associative, so merging the same parts in another order can change the
+last bits of a total.
+
+The sum functions combine any number of partial results at once. They add
+float totals with math.fsum, which gives the correctly rounded sum of the
+partial totals, so the result does not depend on the order of the parts.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import heapq
+import math
+
+ACCOUNT_SUMMARY_TOTALS = ("balance", "total_deposits", "total_withdrawals")
+"""
+Account summary fields that are added together when summaries are merged.
+"""
+
+TRANSACTION_STATISTIC_TOTALS = ("total_amount", "transaction_count")
+"""
+Transaction statistic fields that are added together when statistics are merged.
+"""
+
+
+def merge_totals(left: dict, right: dict, fields: tuple) -> dict:
+    """
+    Merge two dictionaries of per-key totals.
+
+    Keys keep the order of left followed by the new keys of right. The
+    totals of a key found in both are added together, left first.
+
+    Args:
+        left: Dictionary of per-key total dictionaries
+        right: Dictionary of per-key total dictionaries
+        fields: Names of the total fields to add together
+
+    Returns:
+        New dictionary of merged per-key total dictionaries
+    """
+    merged = {key: dict(totals) for key, totals in left.items()}
+
+    for key, totals in right.items():
+        if key not in merged:
+            merged[key] = dict(totals)
+            continue
+
+        merged_totals = merged[key]
+        for field in fields:
+            merged_totals[field] += totals[field]
+
+    return merged
+
+
+def add_totals(totals: list):
+    """
+    Add up a list of totals in a way that does not depend on their order.
+
+    Args:
+        totals: List of int or float totals
+
+    Returns:
+        The int sum if every total is an int, otherwise the correctly
+        rounded float sum from math.fsum
+    """
+    if all(total.__class__ is int for total in totals):
+        return sum(totals)
+    return math.fsum(totals)
+
+
+def sum_totals(parts: list, fields: tuple) -> dict:
+    """
+    Add up any number of dictionaries of per-key totals.
+
+    Keys keep the order of first appearance across the parts. The other
+    fields of a key are taken from the first part that has it.
+
+    Args:
+        parts: List of dictionaries of per-key total dictionaries
+        fields: Names of the total fields to add together
+
+    Returns:
+        New dictionary of summed per-key total dictionaries
+    """
+    totals_by_key = {}
+
+    for part in parts:
+        for key, totals in part.items():
+            totals_by_key.setdefault(key, []).append(totals)
+
+    summed = {}
+
+    for key, key_totals in totals_by_key.items():
+        summed[key] = dict(key_totals[0])
+        if len(key_totals) > 1:
+            for field in fields:
+                summed[key][field] = add_totals([totals[field] for totals in key_totals])
+
+    return summed
+
+
+def sum_balances(parts: list) -> dict:
+    """
+    Add up any number of dictionaries of balances by key.
+
+    Args:
+        parts: List of dictionaries of balances by key
+
+    Returns:
+        New dictionary of summed balances
+    """
+    balances_by_key = {}
+
+    for part in parts:
+        for key, balance in part.items():
+            balances_by_key.setdefault(key, []).append(balance)
+
+    return {key: add_totals(balances) for key, balances in balances_by_key.items()}
+
+
+def sum_currency_balances(parts: list) -> dict:
+    """
+    Add up any number of dictionaries of per-currency balances by account
+    number.
+
+    Args:
+        parts: List of dictionaries of balances by currency, by account number
+
+    Returns:
+        New dictionary of summed per-currency balances
+    """
+    balances_by_account = {}
+
+    for part in parts:
+        for account_number, balances in part.items():
+            balances_by_account.setdefault(account_number, []).append(balances)
+
+    return {account_number: sum_balances(account_balances)
+            for account_number, account_balances in balances_by_account.items()}
+
+
+def merge_account_summaries(left: dict, right: dict) -> dict:
+    """
+    Merge two partial account summary dictionaries.
+
+    Args:
+        left: Account summaries by account number
+        right: Account summaries by account number
+
+    Returns:
+        New dictionary of merged account summaries
+    """
+    return merge_totals(left, right, ACCOUNT_SUMMARY_TOTALS)
+
+
+def merge_transaction_statistics(left: dict, right: dict) -> dict:
+    """
+    Merge two partial transaction statistics dictionaries.
+
+    Counts are exact. Float totals are added in merge order, so they can
+    differ in the last bits from a single running total over all rows.
+
+    Args:
+        left: Transaction statistics by transaction type
+        right: Transaction statistics by transaction type
+
+    Returns:
+        New dictionary of merged transaction statistics
+    """
+    return merge_totals(left, right, TRANSACTION_STATISTIC_TOTALS)
+
+
+def merge_groups(left: dict, right: dict) -> dict:
+    """
+    Merge two dictionaries of groups of mergeable accumulators, such as
+    DataProcessor.amount_distributions or DataProcessor.unique_accounts.
+    Accumulators under the same group and key are combined with their
+    merge method.
+
+    Args:
+        left: Dictionary of accumulator dictionaries by group, or None
+        right: Dictionary of accumulator dictionaries by group, or None
+
+    Returns:
+        New dictionary of merged accumulators, or None if both are None
+    """
+    if left is None or right is None:
+        return right if left is None else left
+
+    merged = {}
+
+    for group in dict.fromkeys([*left, *right]):
+        accumulators = dict(left.get(group, {}))
+        for key, accumulator in right.get(group, {}).items():
+            accumulators[key] = accumulators[key].merge(accumulator) \
+                if key in accumulators else accumulator
+        merged[group] = accumulators
+
+    return merged
+
+
+def merge_suspicious_transactions(left: list, right: list) -> list:
+    """
+    Merge two lists of indexed suspicious transactions.
+
+    Each list holds tuples starting with the row index, e.g. (row index,
+    transaction), sorted by row index, and the merged list is sorted by row
+    index too, so the original row order is kept however the rows were
+    split up.
+
+    Args:
+        left: List of tuples starting with the row index
+        right: List of tuples starting with the row index
+
+    Returns:
+        New merged list of tuples
+    """
+    return list(heapq.merge(left, right, key=lambda indexed: indexed[0]))
@@ -0,0 +1,181 @@
+"""
+Distinct Count Sketch Module
+
+This module provides a HyperLogLog sketch for counting distinct values,
+e.g. unique accounts per transaction type, in a fixed amount of memory
+whatever the number of values. Sketches with the same precision merge into
+the sketch of the union of their values.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import base64
+import hashlib
+import math
+from functools import lru_cache
+
+HASH_BITS = 64
+"""
+Number of bits of the value hashes.
+"""
+
+
+@lru_cache(maxsize=65536)
+def hash_value(value: str) -> int:
+    """
+    Hash a value for HyperLogLog.
+
+    BLAKE2b is used instead of hash() so that sketches made by different
+    processes and runs can be merged. The same account numbers repeat
+    across many transactions, so the hashes are cached.
+
+    Args:
+        value: Value to hash
+
+    Returns:
+        64-bit hash of the value
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"),
+                                          digest_size=8).digest(), "big")
+
+
+def precision_for_error(error: float) -> int:
+    """
+    Get the smallest precision whose standard error is at most error.
+
+    The standard error of HyperLogLog with 2**precision registers is about
+    1.04 / sqrt(2**precision).
+
+    Args:
+        error: Relative standard error, e.g. 0.01 for 1%
+
+    Returns:
+        Precision from 4 to 18
+    """
+    return min(18, max(4, math.ceil(math.log2((1.04 / error) ** 2))))
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct count sketch with one byte per register.
+    """
+
+    def __init__(self, error: float = 0.01, precision: int = None):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            error: Relative standard error the precision is chosen for
+            precision: Number of index bits, which overrides error
+        """
+        self.__precision = precision or precision_for_error(error)
+        self.__registers = bytearray(1 << self.__precision)
+
+    @property
+    def precision(self) -> int:
+        """
+        Get the number of index bits.
+
+        Returns:
+            Precision of the sketch
+        """
+        return self.__precision
+
+    @property
+    def error(self) -> float:
+        """
+        Get the relative standard error of the estimates.
+
+        Returns:
+            Relative standard error
+        """
+        return 1.04 / math.sqrt(len(self.__registers))
+
+    def add(self, value: str) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value: Value to count
+        """
+        self.add_hash(hash_value(value))
+
+    def add_hash(self, value_hash: int) -> None:
+        """
+        Add a value by its hash_value, so a value added to many sketches is
+        only hashed once.
+
+        Args:
+            value_hash: 64-bit hash from hash_value
+        """
+        remaining_bits = HASH_BITS - self.__precision
+        index = value_hash >> remaining_bits
+        rank = remaining_bits - (value_hash & ((1 << remaining_bits) - 1)).bit_length() + 1
+
+        if rank > self.__registers[index]:
+            self.__registers[index] = rank
+
+    def estimate(self) -> float:
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            Estimated distinct count
+        """
+        register_count = len(self.__registers)
+        alpha = 0.7213 / (1 + 1.079 / register_count)
+        estimate = alpha * register_count * register_count \
+            / math.fsum(2.0 ** -register for register in self.__registers)
+        empty_count = self.__registers.count(0)
+
+        if estimate <= 2.5 * register_count and empty_count:
+            # Linear counting is more accurate for small counts.
+            return register_count * math.log(register_count / empty_count)
+        return estimate
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merge two sketches with the same precision.
+
+        Args:
+            other: Sketch to merge with this one
+
+        Returns:
+            New sketch of the union of the values of both
+
+        Raises:
+            ValueError: If the sketches have different precisions
+        """
+        if other.__precision != self.__precision:
+            raise ValueError("Sketches with different precisions cannot be merged.")
+
+        merged = HyperLogLog(precision=self.__precision)
+        merged.__registers = bytearray(map(max, self.__registers,
+                                           other.__registers))
+        return merged
+
+    def to_dict(self) -> dict:
+        """
+        Get the state of the sketch as JSON-serializable values.
+
+        Returns:
+            Dictionary the sketch can be rebuilt from with from_dict
+        """
+        return {"precision": self.__precision,
+                "registers": base64.b64encode(self.__registers).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "HyperLogLog":
+        """
+        Rebuild a sketch from the state returned by to_dict.
+
+        Args:
+            state: Dictionary from to_dict
+
+        Returns:
+            The rebuilt sketch
+        """
+        sketch = cls(precision=state["precision"])
+        sketch.__registers = bytearray(base64.b64decode(state["registers"]))
+        return sketch
@@ -0,0 +1,257 @@
+"""
+Columnar Transaction Processing Module
+
+This module provides a NumPy backend that computes the same results as
+DataProcessor.process_data with whole-column operations instead of a Python
+loop over the transactions. NumPy is optional and only needed when this
+module's processor is used.
+
+Transfers with a Destination account are booked to two accounts, which the
+grouped sums do not do, so input with such transfers is handed to
+DataProcessor instead.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import logging
+from typing import Iterable
+from data_processor.data_processor import DataProcessor
+from data_processor.rules import RuleEngine
+from transaction.transaction import Transaction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def factorize(values: list) -> tuple:
+    """
+    Encode values as integer codes in order of first appearance.
+
+    Args:
+        values: List of hashable values
+
+    Returns:
+        Tuple of (numpy array of codes, list of distinct values by code)
+    """
+    codes_by_value = {}
+    codes = [codes_by_value.setdefault(value, len(codes_by_value))
+             for value in values]
+    return np.array(codes, dtype=np.intp), list(codes_by_value)
+
+
+class ColumnarDataProcessor:
+    """
+    Columnar financial transaction processor.
+
+    Produces the same account summaries, suspicious transactions and
+    transaction statistics as DataProcessor, in the same order and with
+    the same floating point sums, using grouped reductions over columns.
+    The default suspicious checks use DataProcessor.LARGE_TRANSACTION_THRESHOLD
+    and DataProcessor.UNCOMMON_CURRENCIES.
+    """
+
+    def __init__(self, transactions: Iterable, rules: list = None):
+        """
+        Initialize the processor with transaction data.
+
+        Args:
+            transactions: List or iterable of Transaction records or
+                transaction dictionaries to process
+            rules: Suspicious transaction rule definitions, see the rules
+                module, checked with RuleEngine.match_batch (default: the
+                DataProcessor checks, done with a vectorized mask)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If a rule definition is not valid
+        """
+        if np is None:
+            raise ImportError("ColumnarDataProcessor requires NumPy to be installed.")
+
+        self.__transactions = transactions
+        self.__rules = rules
+        self.__rule_engine = None if rules is None else RuleEngine(rules)
+        self.__account_summaries = {}
+        self.__suspicious_transactions = []
+        self.__suspicious_rule_names = []
+        self.__transaction_statistics = {}
+        self.__input_processed = False
+
+    @property
+    def account_summaries(self) -> dict:
+        """
+        Get the processed account summaries.
+
+        Returns:
+            Dictionary of account-level transaction summaries
+        """
+        return self.__account_summaries
+
+    @property
+    def suspicious_transactions(self) -> list:
+        """
+        Get flagged suspicious transactions.
+
+        Returns:
+            List of transactions that met suspicious criteria
+        """
+        return self.__suspicious_transactions
+
+    @property
+    def suspicious_rule_names(self) -> list:
+        """
+        Get the name of the rule that flagged each suspicious transaction.
+
+        Returns:
+            List of rule names in the order of suspicious_transactions
+        """
+        return self.__suspicious_rule_names
+
+    @property
+    def transaction_statistics(self) -> dict:
+        """
+        Get transaction type statistics.
+
+        Returns:
+            Dictionary of transaction statistics by type
+        """
+        return self.__transaction_statistics
+
+    def process_data(self) -> dict:
+        """
+        Process all transactions and generate summary data.
+
+        Account numbers, transaction types and currencies are encoded as
+        integer codes, the sums are grouped reductions (np.bincount) over
+        those codes and suspicious rows are found with a vectorized mask.
+        If a transfer has a Destination account, the records are processed
+        by DataProcessor instead. The input data is only processed by the
+        first call.
+
+        Returns:
+            Dictionary containing all processed data results
+        """
+        if not self.__input_processed:
+            self.__input_processed = True
+            self.__process([Transaction.coerce(transaction)
+                            for transaction in self.__transactions])
+
+        return {
+            "account_summaries": self.__account_summaries,
+            "suspicious_transactions": self.__suspicious_transactions,
+            "transaction_statistics": self.__transaction_statistics
+        }
+
+    def __process(self, records: list) -> None:
+        """
+        Compute the results of the records with columns, or with
+        DataProcessor when they hold transfers with a Destination account.
+        """
+        if any(record.destination_account is not None
+               and record.transaction_type == "transfer" for record in records):
+            logging.info("Transfers with a Destination account are processed "
+                         "row by row with DataProcessor")
+            data_processor = DataProcessor(records, rules=self.__rules)
+            processed_data = data_processor.process_data()
+            self.__account_summaries.update(
+                (account_number, dict(summary)) for account_number, summary
+                in processed_data["account_summaries"].items())
+            self.__transaction_statistics.update(processed_data["transaction_statistics"])
+            self.__suspicious_transactions.extend(processed_data["suspicious_transactions"])
+            self.__suspicious_rule_names.extend(data_processor.suspicious_rule_names)
+            return
+
+        amounts = np.fromiter((record.amount for record in records),
+                              dtype=np.float64, count=len(records))
+        account_codes, account_numbers = factorize(
+            [record.account_number for record in records])
+        type_codes, transaction_types = factorize(
+            [record.transaction_type for record in records])
+        currency_codes, currencies = factorize(
+            [record.currency for record in records])
+
+        self.__summarize_accounts(amounts, account_codes, account_numbers,
+                                  type_codes, transaction_types)
+        self.__summarize_types(amounts, type_codes, transaction_types)
+
+        if self.__rule_engine is not None:
+            for record, rule_name in zip(records, self.__rule_engine.match_batch(records)):
+                if rule_name is not None:
+                    self.__suspicious_transactions.append(record)
+                    self.__suspicious_rule_names.append(rule_name)
+            return
+
+        # The same checks, in the same order, as DataProcessor's default rules.
+        large = amounts > DataProcessor.LARGE_TRANSACTION_THRESHOLD
+        uncommon = np.isin(currency_codes,
+                           [code for code, currency in enumerate(currencies)
+                            if currency in DataProcessor.UNCOMMON_CURRENCIES])
+        for index in np.flatnonzero(large | uncommon).tolist():
+            self.__suspicious_transactions.append(records[index])
+            self.__suspicious_rule_names.append(
+                "large_transaction" if large[index] else "uncommon_currency")
+
+    def __summarize_accounts(self, amounts, account_codes, account_numbers,
+                             type_codes, transaction_types) -> None:
+        """
+        Build the account summaries with one grouped sum per column.
+
+        The balance is summed from signed amounts in row order, so it has
+        exactly the rounding of the running balance in DataProcessor.
+        Totals with no rows stay the integer 0, as in DataProcessor.
+        """
+        account_count = len(account_numbers)
+        deposit_code = self.__code_of("deposit", transaction_types)
+        withdrawal_code = self.__code_of("withdrawal", transaction_types)
+        is_deposit = type_codes == deposit_code
+        is_withdrawal = type_codes == withdrawal_code
+        signs = is_deposit.astype(np.float64) - is_withdrawal
+
+        def grouped(weights):
+            return np.bincount(account_codes, weights=weights,
+                               minlength=account_count).tolist()
+
+        def counted(mask):
+            return np.bincount(account_codes[mask],
+                               minlength=account_count).tolist()
+
+        balances = grouped(amounts * signs)
+        deposits = grouped(np.where(is_deposit, amounts, 0.0))
+        withdrawals = grouped(np.where(is_withdrawal, amounts, 0.0))
+        deposit_counts = counted(is_deposit)
+        withdrawal_counts = counted(is_withdrawal)
+
+        for code, account_number in enumerate(account_numbers):
+            self.__account_summaries[account_number] = {
+                "account_number": account_number,
+                "balance": balances[code]
+                    if deposit_counts[code] or withdrawal_counts[code] else 0,
+                "total_deposits": deposits[code] if deposit_counts[code] else 0,
+                "total_withdrawals": withdrawals[code]
+                    if withdrawal_counts[code] else 0
+            }
+
+    def __summarize_types(self, amounts, type_codes, transaction_types) -> None:
+        """
+        Build the transaction statistics with a grouped sum and count.
+        """
+        type_count = len(transaction_types)
+        totals = np.bincount(type_codes, weights=amounts,
+                             minlength=type_count).tolist()
+        counts = np.bincount(type_codes, minlength=type_count).tolist()
+
+        for code, transaction_type in enumerate(transaction_types):
+            self.__transaction_statistics[transaction_type] = {
+                "total_amount": totals[code],
+                "transaction_count": counts[code]
+            }
+
+    @staticmethod
+    def __code_of(value, values: list) -> int:
+        """
+        Get the code of a value, or -1 if it does not appear.
+        """
+        return values.index(value) if value in values else -1
@@ -6,6 +6,18 @@ including account tracking, suspicious activity detection, and statistical analy
 """
 
 import logging
+from typing import Iterable
+from data_processor import snapshot
+from data_processor.account_store import AccountSummaryStore
+from data_processor.cardinality import HyperLogLog, hash_value
+from data_processor.deduplication import DuplicateFilter
+from data_processor.distribution import AmountDistribution
+from data_processor.fx_rates import FxRateTable
+from data_processor.rollups import TimeRollups
+from data_processor.rules import RuleEngine, default_rules
+from data_processor.transfer_graph import TransferGraph
+from transaction.money import MINOR_UNIT_SCALE, parse_minor_units
+from transaction.transaction import Transaction
 __author__ = "sandeep kaur"
 __version__ = "1.0."
 
@@ -33,23 +45,107 @@ class DataProcessor:
     List of currency codes considered uncommon or high-risk.
     """
 
-    def __init__(self, transactions: list,logging_level: str = "WARNING",
+    RULE_BATCH_SIZE = 1024
+    """
+    Number of transactions checked against the suspicious rules at a time.
+    """
+
+    MONEY_MODES = ("float", "minor_units")
+    """
+    Ways amounts can be added up: as floats, or exactly as integer minor
+    units (cents) parsed straight from the Amount strings.
+    """
+
+    def __init__(self, transactions: Iterable,logging_level: str = "WARNING",
                  logging_format: str = "%(asctime)s - %(levelname)s - %(message)s",
-                 log_file:str=""
+                 log_file:str="",
+                 rules: list = None,
+                 velocity_detectors: list = None,
+                 money_mode: str = "float",
+                 track_distributions: bool = False,
+                 unique_account_error: float = None,
+                 track_rollups: bool = False,
+                 track_currency_balances: bool = False,
+                 fx_rates: FxRateTable = None,
+                 duplicate_filter: DuplicateFilter = None,
+                 track_transfer_graph: bool = False
                  ):
         """
         Initialize the processor with transaction data.
         
         Args:
-            transactions: List of transaction dictionaries to process
+            transactions: List or iterable (e.g. InputHandler.iter_transactions())
+                of transaction dictionaries to process
             logging_level: The level of severity for logging (default: WARNING)
             logging_format: Format string for log messages (default: timestamp-level-message format)
             log_file: File path for log output (default: empty string for console output)
+            rules: Suspicious transaction rule definitions, see the rules
+                module (default: LARGE_TRANSACTION_THRESHOLD and
+                UNCOMMON_CURRENCIES rules)
+            velocity_detectors: VelocityDetector instances that flag accounts
+                with too many or too large transactions in a time window
+                (default: none)
+            money_mode: One of MONEY_MODES (default: float). With minor_units
+                the balances and totals are integer cents, which
+                OutputHandler formats back to decimal strings, and
+                transactions with an amount such as "inf" that has no
+                minor units are skipped, see skipped_amount_count.
+            track_distributions: True to keep the standard deviation, min,
+                max and approximate percentiles of the amounts of each
+                transaction type and currency (default: False)
+            unique_account_error: Relative standard error of the HyperLogLog
+                counts of unique accounts per transaction type, currency and
+                day, e.g. 0.01 (default: None to not count them)
+            track_rollups: True to keep daily and monthly totals of each
+                account and transaction type, see TimeRollups (default: False)
+            track_currency_balances: True to keep the balance of each
+                account in each currency (default: False)
+            fx_rates: FxRateTable to also keep the balance of each account
+                in its reporting currency, converting each amount at the
+                rate of its Date. Turns on track_currency_balances.
+            duplicate_filter: DuplicateFilter that drops transactions whose
+                Transaction ID was already seen, in this run or an earlier
+                one. The IDs are committed by save_snapshot or
+                commit_transaction_ids (default: none)
+            track_transfer_graph: True to keep the graph of the transfers
+                with a Destination account, see TransferGraph
+                (default: False)
+
+        Raises:
+            ValueError: If money_mode is not one of MONEY_MODES
             """
+        if money_mode not in self.MONEY_MODES:
+            raise ValueError(f"Money mode: {money_mode} is not one of {self.MONEY_MODES}.")
+
         self.__transactions = transactions
-        self.__account_summaries = {}
+        self.__account_summaries = AccountSummaryStore(
+            "q" if money_mode == "minor_units" else "d")
         self.__suspicious_transactions = []
+        self.__suspicious_rule_names = []
         self.__transaction_statistics = {}
+        self.__rule_engine = RuleEngine(rules if rules is not None
+                                        else default_rules(self.LARGE_TRANSACTION_THRESHOLD,
+                                                           self.UNCOMMON_CURRENCIES))
+        self.__velocity_detectors = list(velocity_detectors or [])
+        self.__money_mode = money_mode
+        self.__amount_distributions = {"transaction_type": {}, "currency": {}} \
+            if track_distributions else None
+        self.__unique_account_error = unique_account_error
+        self.__unique_accounts = {"transaction_type": {}, "currency": {}, "date": {}} \
+            if unique_account_error else None
+        self.__rollups = TimeRollups() if track_rollups else None
+        self.__fx_rates = fx_rates
+        self.__currency_balances = {} \
+            if track_currency_balances or fx_rates is not None else None
+        self.__reporting_balances = {} if fx_rates is not None else None
+        self.__duplicate_filter = duplicate_filter
+        self.__transfer_graph = TransferGraph() if track_transfer_graph else None
+        self.__unresolved_transfer_count = 0
+        self.__skipped_amount_count = 0
+        self.__input_processed = False
+        self.__high_water_mark = None
+        self.__high_water_key = None
+        self.__resume_after = None
 
 
 # Configure logging
@@ -63,22 +159,146 @@ class DataProcessor:
                               format=logging_format)
 
     @property
-    def input_data(self) -> list:
+    def input_data(self) -> Iterable:
         """
         Get the original transaction data.
         
         Returns:
-            List of transaction dictionaries
+            List or iterable of transaction dictionaries
         """
         return self.__transactions
     
+    @property
+    def amount_distributions(self) -> dict:
+        """
+        Get the amount distributions by transaction type and by currency.
+        
+        Returns:
+            Dictionary with the keys transaction_type and currency, each a
+            dictionary of AmountDistribution by type or currency, or None
+            if distributions are not tracked
+        """
+        return self.__amount_distributions
+
+    @property
+    def unique_accounts(self) -> dict:
+        """
+        Get the unique account sketches by transaction type, currency and day.
+        
+        Returns:
+            Dictionary with the keys transaction_type, currency and date,
+            each a dictionary of HyperLogLog sketches whose estimate() is
+            the number of unique accounts, or None if they are not counted
+        """
+        return self.__unique_accounts
+
+    @property
+    def rollups(self) -> TimeRollups:
+        """
+        Get the daily and monthly totals of each account and transaction type.
+        
+        Returns:
+            TimeRollups, e.g. for balances_as_of("2023-03-15"), or None if
+            they are not tracked
+        """
+        return self.__rollups
+
+    @property
+    def currency_balances(self) -> dict:
+        """
+        Get the balance of each account in each currency.
+        
+        Returns:
+            Dictionary of balances by currency, by account number, or None
+            if they are not tracked
+        """
+        return self.__currency_balances
+
+    @property
+    def reporting_balances(self) -> dict:
+        """
+        Get the balance of each account in the reporting currency of fx_rates.
+        
+        Returns:
+            Dictionary of balances by account number, or None if no
+            fx_rates were given
+        """
+        return self.__reporting_balances
+
+    @property
+    def duplicate_count(self) -> int:
+        """
+        Get the number of transactions dropped as duplicates.
+        
+        Returns:
+            Number of transactions the duplicate_filter dropped, 0 if
+            there is none
+        """
+        if self.__duplicate_filter is None:
+            return 0
+        return self.__duplicate_filter.duplicate_count
+
+    @property
+    def skipped_amount_count(self) -> int:
+        """
+        Get the number of transactions skipped in minor_units mode because
+        their amount, e.g. "inf", cannot be converted to minor units.
+
+        Returns:
+            Number of skipped transactions
+        """
+        return self.__skipped_amount_count
+
+    @property
+    def transfer_graph(self) -> TransferGraph:
+        """
+        Get the graph of the transfers between accounts.
+        
+        Returns:
+            TransferGraph, e.g. for find_cycles(), or None if it is not
+            tracked
+        """
+        return self.__transfer_graph
+
+    @property
+    def unresolved_transfer_count(self) -> int:
+        """
+        Get the number of transfers without a Destination account.
+        
+        Returns:
+            Number of transfers that only counted against their own account
+        """
+        return self.__unresolved_transfer_count
+
+    @property
+    def money_mode(self) -> str:
+        """
+        Get how amounts are added up.
+        
+        Returns:
+            One of MONEY_MODES
+        """
+        return self.__money_mode
+
+    @property
+    def high_water_mark(self):
+        """
+        Get the highest Transaction ID processed, in the order of
+        snapshot.transaction_id_key.
+
+        Returns:
+            Transaction ID, or None if no transaction has been processed
+        """
+        return self.__high_water_mark
+
     @property
     def account_summaries(self) -> dict:
         """
         Get the processed account summaries.
         
         Returns:
-            Dictionary of account-level transaction summaries
+            AccountSummaryStore, a mapping of account numbers to account
+            summaries that reads like the dictionary of summaries
         """
         return self.__account_summaries
     
@@ -91,6 +311,16 @@ class DataProcessor:
             List of transactions that met suspicious criteria
         """
         return self.__suspicious_transactions
+
+    @property
+    def suspicious_rule_names(self) -> list:
+        """
+        Get the name of the rule that flagged each suspicious transaction.
+        
+        Returns:
+            List of rule names in the order of suspicious_transactions
+        """
+        return self.__suspicious_rule_names
     
     @property
     def transaction_statistics(self) -> dict:
@@ -106,6 +336,12 @@ class DataProcessor:
         """
         Process all transactions and generate summary data.
         
+        Transactions are consumed one at a time, so a generator such as
+        InputHandler.iter_transactions() is processed in constant memory.
+        The input data is only processed by the first call, so calling
+        this again returns the current results without counting the
+        transactions twice.
+        
         Performs complete data processing including:
         - Account summary updates
         - Suspicious transaction checks
@@ -114,10 +350,9 @@ class DataProcessor:
         Returns:
             Dictionary containing all processed data results
         """
-        for transaction in self.__transactions:
-            self.update_account_summary(transaction)
-            self.check_suspicious_transactions(transaction)
-            self.update_transaction_statistics(transaction)
+        if not self.__input_processed:
+            self.__input_processed = True
+            self.ingest(self.__transactions)
 
         return {
             "account_summaries": self.__account_summaries,
@@ -125,54 +360,288 @@ class DataProcessor:
             "transaction_statistics": self.__transaction_statistics
         }
 
-    def update_account_summary(self, transaction: dict) -> None:
+    def ingest(self, transactions: Iterable) -> None:
+        """
+        Fold more transactions into the current results.
+
+        The account summaries, suspicious transactions and statistics keep
+        their running state, so a long-running job can pass each new batch
+        here and read the properties at any point without reprocessing
+        the transactions it has already seen.
+
+        Args:
+            transactions: List or iterable of Transaction records or
+                transaction dictionaries to add
+        """
+        resume_after = self.__resume_after
+        velocity_detectors = self.__velocity_detectors
+        minor_units = self.__money_mode == "minor_units"
+        rollups = self.__rollups
+        batch = []
+        velocity_rule_names = []
+        duplicate_count = self.duplicate_count
+        skipped_amount_count = self.__skipped_amount_count
+
+        if self.__duplicate_filter is not None:
+            transactions = self.__duplicate_filter.filter(transactions)
+
+        for transaction in transactions:
+            # Build the typed record once so the amount is parsed only once.
+            transaction = Transaction.coerce(transaction)
+
+            id_key = snapshot.transaction_id_key(transaction.transaction_id)
+            if resume_after is not None and id_key <= resume_after:
+                continue
+
+            # Work out the minor units once for both totals.
+            amount = transaction.amount
+            if minor_units:
+                raw_amount = transaction.raw_amount
+                try:
+                    amount = parse_minor_units(amount if raw_amount is None
+                                               else raw_amount, parsed=amount)
+                except ValueError:
+                    # Validation keeps "inf" like the baseline did, but it
+                    # has no minor units, so skip it before any total changes.
+                    self.__skipped_amount_count += 1
+                    continue
+            self.update_account_summary(transaction, amount)
+            self.update_transaction_statistics(transaction, amount)
+            if rollups is not None:
+                rollups.add(transaction, amount)
+            # Keep the highest ID, not the last one, so input that is not
+            # in ID order does not move the mark back.
+            if self.__high_water_key is None or id_key > self.__high_water_key:
+                self.__high_water_key = id_key
+                self.__high_water_mark = transaction.transaction_id
+            batch.append(transaction)
+
+            if velocity_detectors:
+                # Every detector sees every transaction to keep its windows
+                # up to date, and the first one over a limit is recorded.
+                flagged = [detector.name for detector in velocity_detectors
+                           if detector.observe(transaction)]
+                velocity_rule_names.append(flagged[0] if flagged else None)
+
+            if len(batch) == self.RULE_BATCH_SIZE:
+                self.__check_suspicious_batch(batch, velocity_rule_names)
+                batch = []
+                velocity_rule_names = []
+
+        self.__check_suspicious_batch(batch, velocity_rule_names)
+
+        if self.duplicate_count > duplicate_count:
+            logging.warning("Dropped %d duplicate transactions",
+                            self.duplicate_count - duplicate_count)
+        if self.__skipped_amount_count > skipped_amount_count:
+            logging.warning("Skipped %d transactions with amounts that are not finite",
+                            self.__skipped_amount_count - skipped_amount_count)
+
+    def __check_suspicious_batch(self, batch: list,
+                                 velocity_rule_names: list) -> None:
+        """
+        Check a batch of transactions against the rules a column at a time
+        and flag the matching ones in order. A transaction no rule matches
+        is still flagged if a velocity detector flagged it.
+        """
+        velocity_rule_names = velocity_rule_names or [None] * len(batch)
+
+        for transaction, rule_name, velocity_rule_name in zip(
+                batch, self.__rule_engine.match_batch(batch),
+                velocity_rule_names):
+            rule_name = rule_name or velocity_rule_name
+            if rule_name is not None:
+                self.__suspicious_transactions.append(transaction)
+                self.__suspicious_rule_names.append(rule_name)
+
+    def save_snapshot(self, file_path: str) -> None:
+        """
+        Save the account summaries, statistics, amount distributions,
+        unique account sketches, rollups, currency balances, transfer graph
+        and high-water mark to a snapshot file.
+
+        Suspicious transactions are not saved, so a run that loads the
+        snapshot only flags its own new transactions.
+
+        Args:
+            file_path: Path of the snapshot file
+        """
+        snapshot.save_snapshot(file_path, self.__account_summaries,
+                               self.__transaction_statistics,
+                               self.__high_water_mark,
+                               self.__money_mode,
+                               self.__amount_distributions,
+                               self.__unique_accounts,
+                               self.__rollups,
+                               self.__currency_balances,
+                               self.__reporting_balances,
+                               self.__transfer_graph)
+        self.commit_transaction_ids()
+
+    def commit_transaction_ids(self) -> None:
+        """
+        Commit the Transaction IDs processed so far to the duplicate_filter,
+        so later runs drop them. Call it once the results are written out;
+        save_snapshot calls it after saving. Until then a run that stops
+        part way keeps the transactions when it is run again.
+        """
+        if self.__duplicate_filter is not None:
+            self.__duplicate_filter.commit()
+
+    def load_snapshot(self, file_path: str) -> None:
+        """
+        Load the state saved by save_snapshot in place of the current state.
+
+        Transactions with a Transaction ID at or below the snapshot's
+        high-water mark are skipped from then on, so the input of a new
+        run can still start with transactions the snapshot already holds.
+        The mark is the highest Transaction ID processed, so a transaction
+        with a lower ID that was not processed before the snapshot is
+        skipped as well.
+
+        Args:
+            file_path: Path of the snapshot file
+
+        Raises:
+            FileNotFoundError: If the snapshot file does not exist
+            ValueError: If the file is not a snapshot file, or was saved
+                by a processor with another money mode
+        """
+        state = snapshot.load_snapshot(file_path)
+
+        if state["money_mode"] is not None and state["money_mode"] != self.__money_mode:
+            raise ValueError(f"Snapshot: {file_path} has money mode {state['money_mode']}, "
+                             f"not {self.__money_mode}.")
+
+        self.__account_summaries.clear()
+        self.__account_summaries.update(state["account_summaries"])
+        self.__transaction_statistics.clear()
+        self.__transaction_statistics.update(state["transaction_statistics"])
+        self.__high_water_mark = state["high_water_mark"]
+        if self.__amount_distributions is not None \
+                and state["amount_distributions"] is not None:
+            self.__amount_distributions = state["amount_distributions"]
+        if self.__unique_accounts is not None \
+                and state["unique_accounts"] is not None:
+            self.__unique_accounts = state["unique_accounts"]
+        if self.__rollups is not None and state["rollups"] is not None:
+            self.__rollups = state["rollups"]
+        if self.__currency_balances is not None \
+                and state["currency_balances"] is not None:
+            self.__currency_balances = state["currency_balances"]
+        if self.__reporting_balances is not None \
+                and state["reporting_balances"] is not None:
+            self.__reporting_balances = state["reporting_balances"]
+        if self.__transfer_graph is not None \
+                and state["transfer_graph"] is not None:
+            self.__transfer_graph = state["transfer_graph"]
+        self.__resume_after = self.__high_water_key = \
+            None if state["high_water_mark"] is None \
+            else snapshot.transaction_id_key(state["high_water_mark"])
+
+    def get_amount(self, transaction: dict):
+        """
+        Get the amount of a transaction in the processor's money mode.
+        
+        Args:
+            transaction: Transaction or dictionary containing transaction details
+            
+        Returns:
+            Float amount, or integer minor units in minor_units mode
+        """
+        transaction = Transaction.coerce(transaction)
+
+        if self.__money_mode == "float":
+            return transaction.amount
+
+        raw_amount = transaction.raw_amount
+        return parse_minor_units(transaction.amount if raw_amount is None
+                                 else raw_amount, parsed=transaction.amount)
+
+    def update_account_summary(self, transaction: dict, amount=None) -> None:
         """
         Update account summary with new transaction.
         
         Updates account balance and transaction totals based on
-        transaction type (deposit/withdrawal).
+        transaction type (deposit/withdrawal), and the per-currency and
+        reporting currency balances when they are tracked. A transfer with
+        a Destination account is booked twice, out of its account and into
+        the destination account, and added to the transfer graph.
         
         Args:
-            transaction: Dictionary containing transaction details
-        """
-        account_number = transaction["Account number"]
-        transaction_type = transaction["Transaction type"]
-        amount = float(transaction["Amount"])
-
-        if account_number not in self.__account_summaries:
-            self.__account_summaries[account_number] = {
-                "account_number": account_number,
-                "balance": 0,
-                "total_deposits": 0,
-                "total_withdrawals": 0
-            }
+            transaction: Transaction or dictionary containing transaction details
+            amount: Amount from get_amount (default: got from the transaction)
+
+        Raises:
+            ValueError: If fx_rates has no rate for the transaction's
+                currency on its date, in which case nothing is updated
+        """
+        transaction = Transaction.coerce(transaction)
+        account_number = transaction.account_number
+        transaction_type = transaction.transaction_type
+        destination = transaction.destination_account \
+            if transaction_type == "transfer" else None
+        if amount is None:
+            amount = self.get_amount(transaction)
 
         if transaction_type == "deposit":
-            self.__account_summaries[account_number]["balance"] += amount
-            self.__account_summaries[account_number]["total_deposits"] += amount
+            entries = ((account_number, amount),)
         elif transaction_type == "withdrawal":
-            self.__account_summaries[account_number]["balance"] -= amount
-            self.__account_summaries[account_number]["total_withdrawals"] += amount
+            entries = ((account_number, -amount),)
+        elif destination is not None:
+            entries = ((account_number, -amount), (destination, amount))
+        else:
+            entries = ()
+
+        # Look up the rate before changing anything, so a missing rate
+        # leaves the processor as it was.
+        rate = self.__fx_rates.rate(transaction.currency, transaction.date) \
+            if entries and self.__fx_rates is not None else None
+
+        self.__account_summaries.add(account_number, transaction_type, amount)
+
+        if destination is not None:
+            self.__account_summaries.transfer(account_number, destination, amount)
+            if self.__transfer_graph is not None:
+                self.__transfer_graph.add(account_number, destination, amount,
+                                          transaction.date)
+        elif transaction_type == "transfer":
+            self.__unresolved_transfer_count += 1
+
+        if entries and self.__currency_balances is not None:
+            currency = transaction.currency
+
+            for entry_account, signed_amount in entries:
+                balances = self.__currency_balances.get(entry_account)
+                if balances is None:
+                    balances = self.__currency_balances[entry_account] = {}
+                balances[currency] = balances.get(currency, 0) + signed_amount
+
+                if rate is not None:
+                    converted = signed_amount * rate
+                    if self.__money_mode == "minor_units":
+                        converted = round(converted)
+                    self.__reporting_balances[entry_account] = \
+                        self.__reporting_balances.get(entry_account, 0) + converted
 
     def check_suspicious_transactions(self, transaction: dict) -> None:
         """
         Check if transaction meets suspicious criteria.
         
-        Flags transactions that:
+        Flags transactions that match one of the rules, by default those that:
         - Exceed LARGE_TRANSACTION_THRESHOLD
         - Use currencies in UNCOMMON_CURRENCIES
         
         Args:
-            transaction: Dictionary containing transaction details
+            transaction: Transaction or dictionary containing transaction details
         """
-        amount = float(transaction["Amount"])
-        currency = transaction["Currency"]
+        rule_name = self.__rule_engine.match(Transaction.coerce(transaction))
 
-        if amount > self.LARGE_TRANSACTION_THRESHOLD \
-            or currency in self.UNCOMMON_CURRENCIES:
+        if rule_name is not None:
             self.__suspicious_transactions.append(transaction)
+            self.__suspicious_rule_names.append(rule_name)
 
-    def update_transaction_statistics(self, transaction: dict) -> None:
+    def update_transaction_statistics(self, transaction: dict, amount=None) -> None:
         """
         Update statistical totals for transaction type.
         
@@ -181,10 +650,13 @@ class DataProcessor:
         - Transaction count by type
         
         Args:
-            transaction: Dictionary containing transaction details
+            transaction: Transaction or dictionary containing transaction details
+            amount: Amount from get_amount (default: got from the transaction)
         """
-        transaction_type = transaction["Transaction type"]
-        amount = float(transaction["Amount"])
+        transaction = Transaction.coerce(transaction)
+        transaction_type = transaction.transaction_type
+        if amount is None:
+            amount = self.get_amount(transaction)
 
         if transaction_type not in self.__transaction_statistics:
             self.__transaction_statistics[transaction_type] = {
@@ -195,17 +667,49 @@ class DataProcessor:
         self.__transaction_statistics[transaction_type]["total_amount"] += amount
         self.__transaction_statistics[transaction_type]["transaction_count"] += 1
 
+        if self.__amount_distributions is not None:
+            # The distributions are approximate, so they take the float
+            # amount in every money mode.
+            for distributions, key in (
+                    (self.__amount_distributions["transaction_type"], transaction_type),
+                    (self.__amount_distributions["currency"], transaction.currency)):
+                if key not in distributions:
+                    distributions[key] = AmountDistribution()
+                distributions[key].add(transaction.amount)
+
+        if self.__unique_accounts is not None:
+            account_hash = hash_value(transaction.account_number)
+            date = transaction.date
+            for sketches, key in (
+                    (self.__unique_accounts["transaction_type"], transaction_type),
+                    (self.__unique_accounts["currency"], transaction.currency),
+                    (self.__unique_accounts["date"],
+                     date[:10] if isinstance(date, str) else date)):
+                if key not in sketches:
+                    sketches[key] = HyperLogLog(self.__unique_account_error)
+                sketches[key].add_hash(account_hash)
+
     def get_average_transaction_amount(self, transaction_type: str) -> float:
         """
         Calculate average transaction amount for specified type.
         
+        The average comes from the running totals, so it takes the same
+        time however many transactions have been ingested.
+        
         Args:
             transaction_type: Type of transaction to calculate average for
             
         Returns:
-            Average amount per transaction, or 0 if no transactions exist
+            Average amount per transaction, in major units (e.g. dollars)
+            in every money mode, or 0 if no transactions exist
         """
-        total_amount = self.__transaction_statistics[transaction_type]["total_amount"]
-        transaction_count = self.__transaction_statistics[transaction_type]["transaction_count"]
-    
-        return 0 if transaction_count == 0 else total_amount / transaction_count
\ No newline at end of file
+        statistics = self.__transaction_statistics.get(transaction_type)
+
+        if not statistics or statistics["transaction_count"] == 0:
+            return 0
+
+        average = statistics["total_amount"] / statistics["transaction_count"]
+
+        if self.__money_mode == "minor_units":
+            return average / 10 ** MINOR_UNIT_SCALE
+        return average
\ No newline at end of file
@@ -0,0 +1,458 @@
+"""
+Duplicate Transaction Detection Module
+
+This module provides a filter that drops transactions whose Transaction ID
+has been seen before, in this run or an earlier one. The IDs are kept in an
+on-disk SQLite table, which decides what is a duplicate, so no new
+transaction is ever dropped and memory stays at the SQLite page cache. It
+has two modes:
+
+- exact: every ID is looked up in the table.
+- bloom: a Bloom filter saved next to the table is checked first, and only
+  the IDs it has probably seen are looked up. It uses about 1.8 bytes per
+  ID for a 0.1% error rate. A false positive only costs a lookup.
+
+The IDs are only committed by a call to commit, which is made once the
+results of their transactions are saved, e.g. by
+DataProcessor.save_snapshot. A run that stops before then leaves the IDs
+uncommitted, so a rerun keeps their transactions.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+from itertools import islice
+from os import path
+from typing import Iterable, Iterator
+from transaction.transaction import Transaction
+
+BLOOM_MAGIC = b"FDPBLOOM"
+"""
+Bytes every Bloom filter file starts with.
+"""
+
+
+class BloomFilter:
+    """
+    Bloom filter of strings.
+
+    The bit positions of a value come from one 128-bit BLAKE2b hash with
+    double hashing, so the filter gives the same answers in every process
+    and run.
+    """
+
+    def __init__(self, capacity: int = 100000000, error_rate: float = 0.001,
+                 max_bytes: int = None):
+        """
+        Initialize an empty filter sized for capacity values.
+
+        Args:
+            capacity: Number of values the filter is sized for
+            error_rate: False positive rate once capacity values are added
+            max_bytes: Most bytes of bits, which raises the error rate if
+                it is smaller than the size for capacity and error_rate
+
+        Raises:
+            ValueError: If capacity is not positive or error_rate is not
+                between 0 and 1
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity: {capacity} is not a positive number.")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"Error rate: {error_rate} is not between 0 and 1.")
+
+        bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            bit_count = min(bit_count, max_bytes * 8)
+
+        self.__bit_count = max(8, bit_count - bit_count % 8)
+        self.__hash_count = max(1, round(self.__bit_count / capacity * math.log(2)))
+        self.__bits = bytearray(self.__bit_count // 8)
+        self.__count = 0
+
+    @property
+    def count(self) -> int:
+        """
+        Get the number of values added that were not already in the filter.
+
+        Returns:
+            Number of values
+        """
+        return self.__count
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Get the memory used by the bits.
+
+        Returns:
+            Number of bytes
+        """
+        return len(self.__bits)
+
+    def add(self, value: str) -> bool:
+        """
+        Add a value to the filter.
+
+        Args:
+            value: Value to add
+
+        Returns:
+            True if the value was probably in the filter already, False if
+            it certainly was not
+        """
+        digest = int.from_bytes(hashlib.blake2b(value.encode("utf-8"),
+                                                digest_size=16).digest(), "big")
+        position = digest >> 64
+        step = digest & 0xFFFFFFFFFFFFFFFF | 1
+        bit_count = self.__bit_count
+        bits = self.__bits
+        found = True
+
+        for _ in range(self.__hash_count):
+            index = position % bit_count
+            mask = 1 << (index & 7)
+            byte = bits[index >> 3]
+            if not byte & mask:
+                bits[index >> 3] = byte | mask
+                found = False
+            position += step
+
+        if not found:
+            self.__count += 1
+        return found
+
+    def __contains__(self, value: str) -> bool:
+        """
+        Check if a value is probably in the filter.
+
+        Args:
+            value: Value to look for
+
+        Returns:
+            True if the value was probably added, False if it certainly was not
+        """
+        digest = int.from_bytes(hashlib.blake2b(value.encode("utf-8"),
+                                                digest_size=16).digest(), "big")
+        position = digest >> 64
+        step = digest & 0xFFFFFFFFFFFFFFFF | 1
+
+        for _ in range(self.__hash_count):
+            index = position % self.__bit_count
+            if not self.__bits[index >> 3] & (1 << (index & 7)):
+                return False
+            position += step
+        return True
+
+    def save(self, file_path: str) -> None:
+        """
+        Save the filter to a file, replacing it in a single step.
+
+        Args:
+            file_path: Path of the filter file
+        """
+        directory = path.dirname(path.abspath(file_path))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory,
+                                                           suffix=".tmp")
+
+        with os.fdopen(file_descriptor, "wb") as filter_file:
+            filter_file.write(BLOOM_MAGIC)
+            for number in (self.__bit_count, self.__hash_count, self.__count):
+                filter_file.write(number.to_bytes(8, "little"))
+            filter_file.write(self.__bits)
+
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str) -> "BloomFilter":
+        """
+        Load a filter saved by save.
+
+        Args:
+            file_path: Path of the filter file
+
+        Returns:
+            The loaded filter
+
+        Raises:
+            FileNotFoundError: If the filter file does not exist
+            ValueError: If the file is not a Bloom filter file
+        """
+        with open(file_path, "rb") as filter_file:
+            if filter_file.read(len(BLOOM_MAGIC)) != BLOOM_MAGIC:
+                raise ValueError(f"File: {file_path} is not a Bloom filter file.")
+
+            bloom_filter = cls.__new__(cls)
+            bloom_filter.__bit_count, bloom_filter.__hash_count, bloom_filter.__count = (
+                int.from_bytes(filter_file.read(8), "little") for _ in range(3))
+            bloom_filter.__bits = bytearray(bloom_filter.__bit_count // 8)
+
+            if filter_file.readinto(bloom_filter.__bits) != len(bloom_filter.__bits):
+                raise ValueError(f"File: {file_path} is not a complete Bloom filter file.")
+
+        return bloom_filter
+
+
+class TransactionIdStore:
+    """
+    Exact set of Transaction IDs in an SQLite table.
+
+    The IDs are the primary key of a WITHOUT ROWID table, so each is stored
+    once in the B-tree with no separate index. Added IDs are kept in an open
+    SQLite transaction until commit is called.
+    """
+
+    def __init__(self, file_path: str, cache_bytes: int = 64 * 1024 * 1024):
+        """
+        Open or create the ID store.
+
+        Args:
+            file_path: Path of the SQLite file, or ":memory:"
+            cache_bytes: Most memory SQLite uses to cache pages
+        """
+        self.__connection = sqlite3.connect(file_path, isolation_level=None)
+        self.__connection.execute(f"PRAGMA cache_size = -{max(1, cache_bytes // 1024)}")
+        self.__connection.execute("PRAGMA journal_mode = WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS transaction_ids "
+            "(transaction_id TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    @property
+    def count(self) -> int:
+        """
+        Get the number of IDs in the store.
+
+        Returns:
+            Number of IDs
+        """
+        return self.__connection.execute(
+            "SELECT COUNT(*) FROM transaction_ids").fetchone()[0]
+
+    def add_new(self, transaction_ids: list, maybe_seen: list = None) -> list:
+        """
+        Add a batch of IDs, telling which of them were new.
+
+        The IDs are not committed until commit is called.
+
+        Args:
+            transaction_ids: List of Transaction IDs
+            maybe_seen: List of False for each ID known not to be in the
+                store, e.g. by a Bloom filter, and True for the others,
+                which are looked up (default: look up every ID). If an ID
+                said to be unseen is in the store after all, the batch is
+                done again looking up every ID.
+
+        Returns:
+            List of True for each ID seen for the first time, counting
+            repeats within the batch, and False for each duplicate
+        """
+        connection = self.__connection
+
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+        connection.execute("SAVEPOINT batch")
+
+        existing = set()
+        unique_ids = list(dict.fromkeys(
+            transaction_ids if maybe_seen is None
+            else (transaction_id for transaction_id, seen
+                  in zip(transaction_ids, maybe_seen) if seen)))
+
+        # SQLite allows at most 999 parameters in older versions.
+        for start in range(0, len(unique_ids), 999):
+            chunk = unique_ids[start:start + 999]
+            existing.update(row[0] for row in connection.execute(
+                "SELECT transaction_id FROM transaction_ids WHERE transaction_id IN "
+                f"({','.join('?' * len(chunk))})", chunk))
+
+        new_flags = []
+        new_ids = []
+        for transaction_id in transaction_ids:
+            if transaction_id in existing:
+                new_flags.append(False)
+            else:
+                existing.add(transaction_id)
+                new_ids.append((transaction_id,))
+                new_flags.append(True)
+
+        changes = connection.total_changes
+        connection.executemany(
+            "INSERT OR IGNORE INTO transaction_ids VALUES (?)", new_ids)
+
+        if connection.total_changes - changes != len(new_ids):
+            connection.execute("ROLLBACK TO batch")
+            connection.execute("RELEASE batch")
+            return self.add_new(transaction_ids)
+
+        connection.execute("RELEASE batch")
+        return new_flags
+
+    def commit(self) -> None:
+        """
+        Commit the IDs added since the last commit.
+        """
+        if self.__connection.in_transaction:
+            self.__connection.execute("COMMIT")
+
+    def iter_ids(self) -> Iterator:
+        """
+        Iterate over the IDs in the store.
+
+        Yields:
+            Transaction IDs
+        """
+        yield from (row[0] for row in self.__connection.execute(
+            "SELECT transaction_id FROM transaction_ids"))
+
+    def close(self) -> None:
+        """
+        Close the SQLite connection, dropping the IDs that were not committed.
+        """
+        self.__connection.close()
+
+
+class DuplicateFilter:
+    """
+    Filter that drops transactions with an already seen Transaction ID.
+
+    Transactions without a Transaction ID are always kept. Use it as a
+    context manager, or call close, so the Bloom filter is saved for the
+    next run.
+    """
+
+    MODES = ("exact", "bloom")
+    """
+    Ways the seen IDs can be kept, see the module docstring.
+    """
+
+    BATCH_SIZE = 4096
+    """
+    Number of transactions looked up and committed at a time.
+    """
+
+    def __init__(self, file_path: str, mode: str = "exact",
+                 max_bytes: int = 64 * 1024 * 1024,
+                 capacity: int = 100000000, error_rate: float = 0.001):
+        """
+        Open the seen IDs of earlier runs, or start with none.
+
+        Args:
+            file_path: Path of the SQLite file, or ":memory:". In bloom mode
+                the Bloom filter is saved to file_path + ".bloom", and built
+                from the SQLite file if that does not exist.
+            mode: One of MODES
+            max_bytes: Most memory used by the SQLite page cache, and in
+                bloom mode by the Bloom filter bits as well
+            capacity: Number of IDs the Bloom filter is sized for
+            error_rate: False positive rate of the Bloom filter at capacity
+
+        Raises:
+            ValueError: If mode is not one of MODES
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Mode: {mode} is not one of {self.MODES}.")
+
+        self.__mode = mode
+        self.__duplicate_count = 0
+        self.__store = TransactionIdStore(file_path, max_bytes)
+        self.__bloom_filter = None
+        self.__bloom_path = None
+
+        if mode == "bloom":
+            if file_path != ":memory:":
+                self.__bloom_path = file_path + ".bloom"
+            if self.__bloom_path is not None and path.exists(self.__bloom_path):
+                self.__bloom_filter = BloomFilter.load(self.__bloom_path)
+            else:
+                self.__bloom_filter = BloomFilter(capacity, error_rate, max_bytes)
+                for transaction_id in self.__store.iter_ids():
+                    self.__bloom_filter.add(transaction_id)
+
+    @property
+    def mode(self) -> str:
+        """
+        Get how the seen IDs are kept.
+
+        Returns:
+            One of MODES
+        """
+        return self.__mode
+
+    @property
+    def duplicate_count(self) -> int:
+        """
+        Get the number of transactions dropped as duplicates.
+
+        Returns:
+            Number of dropped transactions
+        """
+        return self.__duplicate_count
+
+    def filter(self, transactions: Iterable, commit: bool = False) -> Iterator:
+        """
+        Yield the transactions whose Transaction ID has not been seen, and
+        remember their IDs.
+
+        Args:
+            transactions: Iterable of Transaction records or transaction
+                dictionaries
+            commit: True to commit the IDs of each batch when the
+                transaction after the batch is asked for, by which time the
+                batch has been used, e.g. when each transaction is written
+                out as it is used. False to leave them to a call to commit
+                once the results are saved.
+
+        Yields:
+            Transaction records in their order, without the duplicates
+        """
+        transactions = map(Transaction.coerce, transactions)
+
+        while True:
+            batch = list(islice(transactions, self.BATCH_SIZE))
+            if not batch:
+                return
+
+            transaction_ids = [None if transaction.transaction_id in (None, "")
+                               else str(transaction.transaction_id)
+                               for transaction in batch]
+            known_ids = [transaction_id for transaction_id in transaction_ids
+                         if transaction_id is not None]
+            maybe_seen = None if self.__bloom_filter is None \
+                else list(map(self.__bloom_filter.add, known_ids))
+            new_flags = iter(self.__store.add_new(known_ids, maybe_seen))
+
+            for transaction, transaction_id in zip(batch, transaction_ids):
+                if transaction_id is None or next(new_flags):
+                    yield transaction
+                else:
+                    self.__duplicate_count += 1
+
+            if commit:
+                self.__store.commit()
+
+    def commit(self) -> None:
+        """
+        Commit the IDs of the transactions filtered so far, so later runs
+        drop them. Call it once the results of the transactions are saved.
+        """
+        self.__store.commit()
+
+    def close(self) -> None:
+        """
+        Save the Bloom filter, and close the SQLite store. IDs that were not
+        committed are dropped, so their transactions are kept on a rerun.
+        """
+        if self.__bloom_path is not None:
+            self.__bloom_filter.save(self.__bloom_path)
+        self.__store.close()
+
+    def __enter__(self) -> "DuplicateFilter":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
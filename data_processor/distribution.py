@@ -0,0 +1,355 @@
+"""
+Amount Distribution Statistics Module
+
+This module provides one-pass accumulators for the distribution of
+transaction amounts: count, mean and standard deviation with Welford's
+method, min and max, and approximate percentiles from a DDSketch-style
+quantile sketch. No amounts are kept, each accumulator uses a small fixed
+amount of memory and two accumulators can be merged into one.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import math
+
+PERCENTILES = (50, 95, 99)
+"""
+Percentiles reported by AmountDistribution.summary.
+"""
+
+
+class QuantileSketch:
+    """
+    DDSketch-style quantile sketch.
+
+    Values are counted in buckets whose bounds grow geometrically, so any
+    quantile of positive values is returned within relative_accuracy of a
+    true value of that rank. Values of 0 or less are counted together as 0.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Relative error of the quantiles
+            max_buckets: Most buckets kept. When there are more, the lowest
+                buckets are folded together, which only makes the lowest
+                quantiles less accurate.
+        """
+        self.__relative_accuracy = relative_accuracy
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__max_buckets = max_buckets
+        self.__buckets = {}
+        self.__zero_count = 0
+        self.__count = 0
+
+    @property
+    def count(self) -> int:
+        """
+        Get the number of values added.
+
+        Returns:
+            Number of values
+        """
+        return self.__count
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the sketch.
+
+        Args:
+            value: Value to add
+        """
+        self.__count += 1
+
+        if value <= 0:
+            self.__zero_count += 1
+            return
+
+        index = math.ceil(math.log(value) / self.__log_gamma)
+        buckets = self.__buckets
+        buckets[index] = buckets.get(index, 0) + 1
+
+        if len(buckets) > self.__max_buckets:
+            self.__collapse()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """
+        Merge two sketches with the same relative accuracy.
+
+        Args:
+            other: Sketch to merge with this one
+
+        Returns:
+            New sketch holding the values of both
+
+        Raises:
+            ValueError: If the sketches have different relative accuracies
+        """
+        if other.__relative_accuracy != self.__relative_accuracy:
+            raise ValueError("Sketches with different relative accuracies cannot be merged.")
+
+        merged = QuantileSketch(self.__relative_accuracy, self.__max_buckets)
+        merged.__buckets = dict(self.__buckets)
+        for index, count in other.__buckets.items():
+            merged.__buckets[index] = merged.__buckets.get(index, 0) + count
+        merged.__zero_count = self.__zero_count + other.__zero_count
+        merged.__count = self.__count + other.__count
+
+        while len(merged.__buckets) > merged.__max_buckets:
+            merged.__collapse()
+        return merged
+
+    def quantile(self, quantile: float) -> float:
+        """
+        Get an approximate quantile of the values.
+
+        Args:
+            quantile: Quantile from 0 to 1, e.g. 0.95
+
+        Returns:
+            Approximate value of the quantile, or None if the sketch is empty
+        """
+        if not self.__count:
+            return None
+
+        rank = quantile * (self.__count - 1)
+        seen = self.__zero_count
+        if seen > rank:
+            return 0.0
+
+        for index in sorted(self.__buckets):
+            seen += self.__buckets[index]
+            if seen > rank:
+                return 2 * self.__gamma ** index / (self.__gamma + 1)
+
+        return 2 * self.__gamma ** max(self.__buckets) / (self.__gamma + 1)
+
+    def to_dict(self) -> dict:
+        """
+        Get the state of the sketch as JSON-serializable values.
+
+        Returns:
+            Dictionary the sketch can be rebuilt from with from_dict
+        """
+        return {"relative_accuracy": self.__relative_accuracy,
+                "max_buckets": self.__max_buckets,
+                "buckets": [[index, count] for index, count
+                            in self.__buckets.items()],
+                "zero_count": self.__zero_count,
+                "count": self.__count}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "QuantileSketch":
+        """
+        Rebuild a sketch from the state returned by to_dict.
+
+        Args:
+            state: Dictionary from to_dict
+
+        Returns:
+            The rebuilt sketch
+        """
+        sketch = cls(state["relative_accuracy"], state["max_buckets"])
+        sketch.__buckets = {index: count for index, count in state["buckets"]}
+        sketch.__zero_count = state["zero_count"]
+        sketch.__count = state["count"]
+        return sketch
+
+    def __collapse(self) -> None:
+        """
+        Fold the lowest bucket into the next one up.
+        """
+        lowest, second = sorted(self.__buckets)[:2]
+        self.__buckets[second] += self.__buckets.pop(lowest)
+
+
+class AmountDistribution:
+    """
+    One-pass, mergeable summary of a distribution of amounts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        Initialize an empty distribution.
+
+        Args:
+            relative_accuracy: Relative error of the percentiles
+        """
+        self.__count = 0
+        self.__mean = 0.0
+        self.__sum_of_squares = 0.0
+        self.__minimum = math.inf
+        self.__maximum = -math.inf
+        self.__sketch = QuantileSketch(relative_accuracy)
+
+    @property
+    def count(self) -> int:
+        """
+        Get the number of amounts added.
+
+        Returns:
+            Number of amounts
+        """
+        return self.__count
+
+    @property
+    def mean(self) -> float:
+        """
+        Get the mean of the amounts.
+
+        Returns:
+            Mean, or 0.0 if no amounts were added
+        """
+        return self.__mean
+
+    @property
+    def standard_deviation(self) -> float:
+        """
+        Get the population standard deviation of the amounts.
+
+        Returns:
+            Standard deviation, or 0.0 if no amounts were added
+        """
+        if not self.__count:
+            return 0.0
+        return math.sqrt(self.__sum_of_squares / self.__count)
+
+    @property
+    def minimum(self) -> float:
+        """
+        Get the smallest amount.
+
+        Returns:
+            Smallest amount, or None if no amounts were added
+        """
+        return self.__minimum if self.__count else None
+
+    @property
+    def maximum(self) -> float:
+        """
+        Get the largest amount.
+
+        Returns:
+            Largest amount, or None if no amounts were added
+        """
+        return self.__maximum if self.__count else None
+
+    def add(self, amount: float) -> None:
+        """
+        Add an amount with Welford's update of the mean and the sum of
+        squared differences from the mean.
+
+        Args:
+            amount: Amount to add
+        """
+        self.__count += 1
+        delta = amount - self.__mean
+        self.__mean += delta / self.__count
+        self.__sum_of_squares += delta * (amount - self.__mean)
+
+        if amount < self.__minimum:
+            self.__minimum = amount
+        if amount > self.__maximum:
+            self.__maximum = amount
+
+        self.__sketch.add(amount)
+
+    def merge(self, other: "AmountDistribution") -> "AmountDistribution":
+        """
+        Merge two distributions with Chan's parallel formula.
+
+        Args:
+            other: Distribution to merge with this one
+
+        Returns:
+            New distribution of the amounts of both
+        """
+        merged = AmountDistribution()
+        count = self.__count + other.__count
+        merged.__count = count
+
+        if count:
+            delta = other.__mean - self.__mean
+            merged.__mean = self.__mean + delta * other.__count / count
+            merged.__sum_of_squares = self.__sum_of_squares \
+                + other.__sum_of_squares \
+                + delta * delta * self.__count * other.__count / count
+
+        merged.__minimum = min(self.__minimum, other.__minimum)
+        merged.__maximum = max(self.__maximum, other.__maximum)
+        merged.__sketch = self.__sketch.merge(other.__sketch)
+        return merged
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Get an approximate percentile of the amounts, kept between the
+        smallest and largest amount.
+
+        Args:
+            percentile: Percentile from 0 to 100, e.g. 95
+
+        Returns:
+            Approximate percentile, or None if no amounts were added
+        """
+        value = self.__sketch.quantile(percentile / 100)
+
+        if value is None:
+            return None
+        return min(max(value, self.__minimum), self.__maximum)
+
+    def summary(self) -> dict:
+        """
+        Get the statistics of the distribution.
+
+        Returns:
+            Dictionary with count, mean, std, min, max and a p<N> key for
+            each of PERCENTILES
+        """
+        summary = {"count": self.__count,
+                   "mean": self.__mean,
+                   "std": self.standard_deviation,
+                   "min": self.minimum,
+                   "max": self.maximum}
+
+        for percentile in PERCENTILES:
+            summary[f"p{percentile}"] = self.percentile(percentile)
+        return summary
+
+    def to_dict(self) -> dict:
+        """
+        Get the state of the distribution as JSON-serializable values.
+
+        Returns:
+            Dictionary the distribution can be rebuilt from with from_dict
+        """
+        return {"count": self.__count,
+                "mean": self.__mean,
+                "sum_of_squares": self.__sum_of_squares,
+                "minimum": self.minimum,
+                "maximum": self.maximum,
+                "sketch": self.__sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "AmountDistribution":
+        """
+        Rebuild a distribution from the state returned by to_dict.
+
+        Args:
+            state: Dictionary from to_dict
+
+        Returns:
+            The rebuilt distribution
+        """
+        distribution = cls()
+        distribution.__count = state["count"]
+        distribution.__mean = state["mean"]
+        distribution.__sum_of_squares = state["sum_of_squares"]
+        if state["count"]:
+            distribution.__minimum = state["minimum"]
+            distribution.__maximum = state["maximum"]
+        distribution.__sketch = QuantileSketch.from_dict(state["sketch"])
+        return distribution
@@ -0,0 +1,158 @@
+"""
+Foreign Exchange Rate Module
+
+This module provides a table of exchange rates by currency and date for
+converting amounts to a reporting currency. The rates of each currency are
+kept sorted by date, so the rate in effect on a date is found by binary
+search, and the rate of each (currency, date) pair is looked up only once.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import csv
+from bisect import bisect_right, insort
+from data_processor.rollups import get_day
+
+
+class FxRateTable:
+    """
+    Exchange rates to a reporting currency by currency and date.
+
+    A rate is the amount of the reporting currency one unit of the currency
+    is worth. The rate on a date is the one with the latest date on or
+    before it.
+    """
+
+    def __init__(self, reporting_currency: str = "CAD"):
+        """
+        Initialize an empty table.
+
+        Args:
+            reporting_currency: Currency amounts are converted to
+        """
+        self.__reporting_currency = reporting_currency
+        self.__dates = {}
+        self.__rates = {}
+        self.__cache = {}
+
+    @property
+    def reporting_currency(self) -> str:
+        """
+        Get the currency amounts are converted to.
+
+        Returns:
+            Reporting currency code
+        """
+        return self.__reporting_currency
+
+    @classmethod
+    def from_csv(cls, file_path: str, reporting_currency: str = "CAD") -> "FxRateTable":
+        """
+        Load the rates of a CSV file with the columns Currency, Date and Rate.
+
+        Args:
+            file_path: Path of the CSV file
+            reporting_currency: Currency the rates convert to
+
+        Returns:
+            Table of the rates
+
+        Raises:
+            ValueError: If a row has a Date or Rate that is not valid
+        """
+        table = cls(reporting_currency)
+
+        with open(file_path, "r", newline="") as rates_file:
+            for row in csv.DictReader(rates_file):
+                table.add_rate(row["Currency"], row["Date"], row["Rate"])
+
+        return table
+
+    def add_rate(self, currency: str, date: str, rate) -> None:
+        """
+        Add or replace the rate of a currency from a date on.
+
+        Args:
+            currency: Currency code
+            date: Day the rate takes effect
+            rate: Amount of the reporting currency one unit is worth
+
+        Raises:
+            ValueError: If date is not a valid date or rate is not a
+                positive number
+        """
+        day = get_day(date)
+
+        if day is None:
+            raise ValueError(f"Date: {date} is not a valid date.")
+
+        rate = float(rate)
+
+        if not rate > 0:
+            raise ValueError(f"Rate: {rate} of {currency} is not a positive number.")
+
+        dates = self.__dates.setdefault(currency, [])
+        rates = self.__rates.setdefault(currency, [])
+        index = bisect_right(dates, day)
+
+        if index and dates[index - 1] == day:
+            rates[index - 1] = rate
+        else:
+            insort(dates, day)
+            rates.insert(index, rate)
+
+        self.__cache.clear()
+
+    def rate(self, currency: str, date: str) -> float:
+        """
+        Get the rate of a currency on a date.
+
+        Args:
+            currency: Currency code
+            date: Day, or a Date value whose day is used
+
+        Returns:
+            Amount of the reporting currency one unit is worth, 1.0 for the
+            reporting currency itself
+
+        Raises:
+            ValueError: If there is no rate of the currency on or before the
+                date, or the date is not valid
+        """
+        rate = self.__cache.get((currency, date))
+
+        if rate is None:
+            rate = self.__cache[(currency, date)] = self.__find_rate(currency,
+                                                                     get_day(date))
+        return rate
+
+    def convert(self, amount, currency: str, date: str) -> float:
+        """
+        Convert an amount to the reporting currency.
+
+        Args:
+            amount: Amount in currency
+            currency: Currency code
+            date: Date of the amount
+
+        Returns:
+            Amount in the reporting currency
+        """
+        return amount * self.rate(currency, date)
+
+    def __find_rate(self, currency: str, day: str) -> float:
+        """
+        Find the rate of a currency on a day by binary search.
+        """
+        if currency == self.__reporting_currency:
+            return 1.0
+
+        if day is None:
+            raise ValueError(f"Date of the {currency} amount is not a valid date.")
+
+        index = bisect_right(self.__dates.get(currency, []), day)
+
+        if not index:
+            raise ValueError(f"There is no {currency} rate on or before {day}.")
+        return self.__rates[currency][index - 1]
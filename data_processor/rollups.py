@@ -0,0 +1,367 @@
+"""
+Time-Bucketed Rollup Module
+
+This module provides daily and monthly rollups of the transactions of each
+account and each transaction type, keyed by (account, period) and
+(transaction type, period). The periods of each account are kept sorted
+with the running balance at the end of each day, so questions such as the
+balances as of a date or the months of an account in a date range are
+answered by binary search without going back over the transactions.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date as Date
+from functools import lru_cache
+from itertools import accumulate
+
+GRANULARITIES = {"day": 10, "month": 7}
+"""
+Rollup granularities with the length of their period keys, e.g.
+2023-03-15 for a day and 2023-03 for a month.
+"""
+
+ACCOUNT_TOTALS = ("balance_change", "total_deposits", "total_withdrawals",
+                  "transaction_count")
+"""
+Totals of an account rollup bucket.
+"""
+
+TYPE_TOTALS = ("total_amount", "transaction_count")
+"""
+Totals of a transaction type rollup bucket.
+"""
+
+
+@lru_cache(maxsize=None)
+def parse_day(day: str) -> str:
+    """
+    Check a YYYY-MM-DD day and normalize it.
+
+    There are few distinct days however many transactions there are, so
+    every day is parsed only once.
+
+    Args:
+        day: Day part of a Date value
+
+    Returns:
+        ISO 8601 day, or None if it is not a valid day
+    """
+    try:
+        return Date.fromisoformat(day).isoformat()
+    except ValueError:
+        return None
+
+
+def get_day(date) -> str:
+    """
+    Get the day of a Date value such as 2023-03-15 or 2023-03-15 10:00.
+
+    Args:
+        date: Date value of a transaction
+
+    Returns:
+        ISO 8601 day, or None if the date is missing or not valid
+    """
+    if not isinstance(date, str):
+        return None
+    return parse_day(date[:10])
+
+
+class TimeRollups:
+    """
+    Daily and monthly totals of each account and transaction type.
+
+    Account buckets hold balance_change, total_deposits, total_withdrawals
+    and transaction_count, worked out the same way as the account summaries
+    of DataProcessor. A transfer with a Destination account moves its amount
+    from the balance_change of the source to that of the destination, and
+    counts as a transaction of the source only. Transaction type buckets
+    hold total_amount and transaction_count.
+    """
+
+    def __init__(self):
+        """
+        Initialize empty rollups.
+        """
+        self.__account_buckets = {granularity: {} for granularity in GRANULARITIES}
+        self.__account_periods = {granularity: {} for granularity in GRANULARITIES}
+        self.__type_buckets = {granularity: {} for granularity in GRANULARITIES}
+        self.__type_periods = {granularity: {} for granularity in GRANULARITIES}
+        self.__balance_prefixes = {}
+        self.__undated_count = 0
+
+    @property
+    def undated_count(self) -> int:
+        """
+        Get the number of transactions left out for a missing or invalid Date.
+
+        Returns:
+            Number of transactions without a valid date
+        """
+        return self.__undated_count
+
+    def add(self, transaction, amount) -> bool:
+        """
+        Add a transaction to the buckets of its day and month.
+
+        Args:
+            transaction: Transaction record
+            amount: Amount in the money mode of the totals
+
+        Returns:
+            True if the transaction was added, False if its Date is not valid
+        """
+        day = get_day(transaction.date)
+
+        if day is None:
+            self.__undated_count += 1
+            return False
+
+        account_number = transaction.account_number
+        transaction_type = transaction.transaction_type
+        destination = None
+
+        if transaction_type == "deposit":
+            account_totals = (amount, amount, 0, 1)
+        elif transaction_type == "withdrawal":
+            account_totals = (-amount, 0, amount, 1)
+        elif transaction_type == "transfer" \
+                and transaction.destination_account is not None:
+            account_totals = (-amount, 0, 0, 1)
+            destination = transaction.destination_account
+        else:
+            account_totals = (0, 0, 0, 1)
+
+        for granularity, period in (("day", day), ("month", day[:7])):
+            self.__add_totals(self.__account_buckets[granularity],
+                              self.__account_periods[granularity],
+                              account_number, period, ACCOUNT_TOTALS,
+                              account_totals)
+            if destination is not None:
+                self.__add_totals(self.__account_buckets[granularity],
+                                  self.__account_periods[granularity],
+                                  destination, period, ACCOUNT_TOTALS,
+                                  (amount, 0, 0, 0))
+            self.__add_totals(self.__type_buckets[granularity],
+                              self.__type_periods[granularity],
+                              transaction_type, period, TYPE_TOTALS,
+                              (amount, 1))
+
+        self.__balance_prefixes.pop(account_number, None)
+        if destination is not None:
+            self.__balance_prefixes.pop(destination, None)
+        return True
+
+    def account_rollups(self, account_number: str, granularity: str = "day",
+                        start: str = None, end: str = None) -> list:
+        """
+        Get the buckets of an account in a date range.
+
+        Args:
+            account_number: Account number
+            granularity: One of GRANULARITIES
+            start: First day or period of the range (default: no limit)
+            end: Last day or period of the range (default: no limit)
+
+        Returns:
+            List of (period, bucket) pairs in period order
+
+        Raises:
+            ValueError: If granularity is not one of GRANULARITIES
+        """
+        return self.__range(self.__account_buckets, self.__account_periods,
+                            account_number, granularity, start, end)
+
+    def type_rollups(self, transaction_type: str, granularity: str = "day",
+                     start: str = None, end: str = None) -> list:
+        """
+        Get the buckets of a transaction type in a date range.
+
+        Args:
+            transaction_type: Transaction type
+            granularity: One of GRANULARITIES
+            start: First day or period of the range (default: no limit)
+            end: Last day or period of the range (default: no limit)
+
+        Returns:
+            List of (period, bucket) pairs in period order
+
+        Raises:
+            ValueError: If granularity is not one of GRANULARITIES
+        """
+        return self.__range(self.__type_buckets, self.__type_periods,
+                            transaction_type, granularity, start, end)
+
+    def balance_as_of(self, account_number: str, date: str):
+        """
+        Get the balance of an account at the end of a day.
+
+        Args:
+            account_number: Account number
+            date: Day, or a Date value whose day is used
+
+        Returns:
+            Balance from the transactions up to and including that day,
+            or 0 if the account has none
+
+        Raises:
+            ValueError: If date is not a valid date
+        """
+        day = get_day(date)
+
+        if day is None:
+            raise ValueError(f"Date: {date} is not a valid date.")
+
+        days = self.__account_periods["day"].get(account_number)
+
+        if not days:
+            return 0
+
+        index = bisect_right(days, day)
+        return self.__balance_prefix(account_number)[index - 1] if index else 0
+
+    def balances_as_of(self, date: str) -> dict:
+        """
+        Get the balance of every account at the end of a day.
+
+        Args:
+            date: Day, or a Date value whose day is used
+
+        Returns:
+            Dictionary of balances by account number
+
+        Raises:
+            ValueError: If date is not a valid date
+        """
+        return {account_number: self.balance_as_of(account_number, date)
+                for account_number in self.__account_periods["day"]}
+
+    def merge(self, other: "TimeRollups") -> "TimeRollups":
+        """
+        Merge two rollups, adding up the buckets they share.
+
+        Args:
+            other: Rollups to merge with these
+
+        Returns:
+            New rollups of the transactions of both
+        """
+        merged = TimeRollups()
+
+        for rollups in (self, other):
+            for granularity in GRANULARITIES:
+                for (owner, period), bucket in rollups.__account_buckets[granularity].items():
+                    merged.__add_totals(merged.__account_buckets[granularity],
+                                        merged.__account_periods[granularity],
+                                        owner, period, ACCOUNT_TOTALS,
+                                        [bucket[total] for total in ACCOUNT_TOTALS])
+                for (owner, period), bucket in rollups.__type_buckets[granularity].items():
+                    merged.__add_totals(merged.__type_buckets[granularity],
+                                        merged.__type_periods[granularity],
+                                        owner, period, TYPE_TOTALS,
+                                        [bucket[total] for total in TYPE_TOTALS])
+
+        merged.__undated_count = self.__undated_count + other.__undated_count
+        return merged
+
+    def to_dict(self) -> dict:
+        """
+        Get the state of the rollups as JSON-serializable values.
+
+        Returns:
+            Dictionary the rollups can be rebuilt from with from_dict
+        """
+        return {
+            "accounts": {granularity: [[owner, period] + [bucket[total] for total in ACCOUNT_TOTALS]
+                                       for (owner, period), bucket in buckets.items()]
+                         for granularity, buckets in self.__account_buckets.items()},
+            "types": {granularity: [[owner, period] + [bucket[total] for total in TYPE_TOTALS]
+                                    for (owner, period), bucket in buckets.items()]
+                      for granularity, buckets in self.__type_buckets.items()},
+            "undated_count": self.__undated_count
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "TimeRollups":
+        """
+        Rebuild rollups from the state returned by to_dict.
+
+        Args:
+            state: Dictionary from to_dict
+
+        Returns:
+            The rebuilt rollups
+        """
+        rollups = cls()
+
+        for granularity in GRANULARITIES:
+            for owner, period, *totals in state["accounts"][granularity]:
+                rollups.__add_totals(rollups.__account_buckets[granularity],
+                                     rollups.__account_periods[granularity],
+                                     owner, period, ACCOUNT_TOTALS, totals)
+            for owner, period, *totals in state["types"][granularity]:
+                rollups.__add_totals(rollups.__type_buckets[granularity],
+                                     rollups.__type_periods[granularity],
+                                     owner, period, TYPE_TOTALS, totals)
+
+        rollups.__undated_count = state["undated_count"]
+        return rollups
+
+    @staticmethod
+    def __add_totals(buckets: dict, periods: dict, owner: str, period: str,
+                     names: tuple, totals) -> None:
+        """
+        Add totals to the bucket of (owner, period), creating it and
+        putting the period in the owner's sorted periods if it is new.
+        """
+        bucket = buckets.get((owner, period))
+
+        if bucket is None:
+            bucket = buckets[(owner, period)] = dict.fromkeys(names, 0)
+            owner_periods = periods.setdefault(owner, [])
+            # Transactions mostly arrive in date order, so this is usually
+            # an append.
+            if not owner_periods or owner_periods[-1] < period:
+                owner_periods.append(period)
+            else:
+                insort(owner_periods, period)
+
+        for name, total in zip(names, totals):
+            bucket[name] += total
+
+    def __balance_prefix(self, account_number: str) -> list:
+        """
+        Get the running balances at the end of each day of an account,
+        rebuilding them if the account has changed since the last query.
+        """
+        prefix = self.__balance_prefixes.get(account_number)
+
+        if prefix is None:
+            buckets = self.__account_buckets["day"]
+            prefix = self.__balance_prefixes[account_number] = list(accumulate(
+                buckets[(account_number, day)]["balance_change"]
+                for day in self.__account_periods["day"][account_number]))
+        return prefix
+
+    @staticmethod
+    def __range(buckets: dict, periods: dict, owner: str, granularity: str,
+                start: str, end: str) -> list:
+        """
+        Get the (period, bucket) pairs of an owner from start to end.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity: {granularity} is not one of "
+                             f"{tuple(GRANULARITIES)}.")
+
+        buckets = buckets[granularity]
+        owner_periods = periods[granularity].get(owner, [])
+        length = GRANULARITIES[granularity]
+        low = 0 if start is None else bisect_left(owner_periods, start[:length])
+        high = len(owner_periods) if end is None \
+            else bisect_right(owner_periods, end[:length])
+
+        return [(period, buckets[(owner, period)])
+                for period in owner_periods[low:high]]
@@ -0,0 +1,279 @@
+"""
+Suspicious Transaction Rules Module
+
+This module provides the rule engine used to flag suspicious transactions.
+Rules are plain dictionaries, so they can be kept in a JSON file, and are
+compiled once into predicates over Transaction attributes.
+
+A rule has a "name" and one or more conditions, all of which must hold:
+- "account_numbers": list of account numbers (e.g. a deny-list)
+- "currencies": list of currency codes
+- "transaction_types": list of transaction types
+- "amount_above": amount the transaction amount must be greater than
+- "description_keywords": list of words searched for in the description,
+  ignoring case
+
+Example:
+    >>> engine = RuleEngine([
+    ...     {"name": "large_usd", "currencies": ["USD"], "amount_above": 5000},
+    ...     {"name": "gambling", "description_keywords": ["casino", "bet"]}])
+    >>> engine.match(transaction)
+    'large_usd'
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import json
+import re
+from operator import attrgetter
+from typing import Iterable
+
+CONDITIONS = {
+    # condition: (Transaction attribute, evaluation rank)
+    "account_numbers": ("account_number", 0),
+    "currencies": ("currency", 1),
+    "transaction_types": ("transaction_type", 2),
+    "amount_above": ("amount", 3),
+    "description_keywords": ("description", 4)
+}
+"""
+Supported rule conditions with the Transaction attribute each one tests.
+
+Conditions are evaluated in rank order: the set lookups, which are cheap
+and usually pass for few transactions, come first and the regular
+expression search comes last.
+"""
+
+
+def default_rules(large_transaction_threshold: float,
+                  uncommon_currencies: Iterable) -> list:
+    """
+    Get the rules matching the original hard-coded checks.
+
+    Args:
+        large_transaction_threshold: Amount above which a transaction is flagged
+        uncommon_currencies: Currency codes that are always flagged
+
+    Returns:
+        List of rule definitions
+    """
+    return [
+        {"name": "large_transaction",
+         "amount_above": large_transaction_threshold},
+        {"name": "uncommon_currency",
+         "currencies": list(uncommon_currencies)}
+    ]
+
+
+def load_rules(file_path: str) -> list:
+    """
+    Load rule definitions from a JSON file holding a list of rules.
+
+    Args:
+        file_path: Path of the JSON file
+
+    Returns:
+        List of rule definitions
+    """
+    with open(file_path, "r") as rules_file:
+        return json.load(rules_file)
+
+
+def compile_condition(condition: str, value):
+    """
+    Compile one rule condition into a predicate of an attribute value.
+
+    Args:
+        condition: Name of the condition, a key of CONDITIONS
+        value: Value of the condition from the rule definition
+
+    Returns:
+        Function taking the attribute value and returning True if it passes
+    """
+    if condition == "amount_above":
+        threshold = value
+        return lambda amount: amount > threshold
+
+    if condition == "description_keywords":
+        search = re.compile("|".join(re.escape(keyword) for keyword in value),
+                            re.IGNORECASE).search
+        return lambda description: bool(description) \
+            and search(description) is not None
+
+    return frozenset(str(item) for item in value).__contains__
+
+
+def compile_column_filter(condition: str, value):
+    """
+    Compile one rule condition into a filter over a column of values.
+
+    The comparison is written out in each filter instead of calling the
+    predicate, which saves a function call for every value.
+
+    Args:
+        condition: Name of the condition, a key of CONDITIONS
+        value: Value of the condition from the rule definition
+
+    Returns:
+        Function taking a column and the indexes to test and returning
+        the list of indexes that pass
+    """
+    if condition == "amount_above":
+        threshold = value
+        return lambda column, indexes: [index for index in indexes
+                                        if column[index] > threshold]
+
+    if condition == "description_keywords":
+        predicate = compile_condition(condition, value)
+        return lambda column, indexes: [index for index in indexes
+                                        if predicate(column[index])]
+
+    values = frozenset(str(item) for item in value)
+    return lambda column, indexes: [index for index in indexes
+                                    if column[index] in values]
+
+
+def compile_matcher(predicates: list):
+    """
+    Combine the predicates of a rule into one function of a transaction.
+
+    Args:
+        predicates: List of (attribute, predicate) pairs in evaluation order
+
+    Returns:
+        Function taking a Transaction and returning True if every
+        predicate passes
+    """
+    getters = [(attrgetter(attribute), predicate)
+               for attribute, predicate in predicates]
+
+    if len(getters) == 1:
+        (get, predicate), = getters
+        return lambda transaction: predicate(get(transaction))
+
+    return lambda transaction: all(predicate(get(transaction))
+                                   for get, predicate in getters)
+
+
+def compile_rule(rule: dict) -> tuple:
+    """
+    Compile a rule definition.
+
+    Args:
+        rule: Rule definition dictionary
+
+    Returns:
+        Tuple of the rule name and a list of (attribute, predicate, column
+        filter) tuples in evaluation order
+
+    Raises:
+        ValueError: If the rule has no name, no conditions or an unknown condition
+    """
+    name = rule.get("name")
+    conditions = [condition for condition in rule if condition != "name"]
+    unknown = [condition for condition in conditions
+               if condition not in CONDITIONS]
+
+    if not name:
+        raise ValueError(f"Rule: {rule} has no name.")
+    if not conditions or unknown:
+        raise ValueError(f"Rule: {name} has unknown or no conditions: {unknown}.")
+
+    conditions.sort(key=lambda condition: CONDITIONS[condition][1])
+
+    return name, [(CONDITIONS[condition][0],
+                   compile_condition(condition, rule[condition]),
+                   compile_column_filter(condition, rule[condition]))
+                  for condition in conditions]
+
+
+class RuleEngine:
+    """
+    Compiled set of suspicious transaction rules.
+
+    A transaction is suspicious if any rule matches it, and the rule
+    recorded for it is the first matching rule in definition order.
+    """
+
+    def __init__(self, rules: list):
+        """
+        Compile the rules.
+
+        Args:
+            rules: List of rule definition dictionaries
+
+        Raises:
+            ValueError: If a rule definition is not valid
+        """
+        self.__rules = [compile_rule(rule) for rule in rules]
+        self.__matchers = [
+            (name, compile_matcher([(attribute, predicate)
+                                    for attribute, predicate, _ in conditions]))
+            for name, conditions in self.__rules]
+
+    @property
+    def rule_names(self) -> list:
+        """
+        Get the names of the rules.
+
+        Returns:
+            List of rule names in definition order
+        """
+        return [name for name, _ in self.__rules]
+
+    def match(self, transaction) -> str:
+        """
+        Find the first rule that matches a transaction.
+
+        Args:
+            transaction: Transaction record
+
+        Returns:
+            Name of the matching rule, or None if no rule matches
+        """
+        for name, matcher in self.__matchers:
+            if matcher(transaction):
+                return name
+
+        return None
+
+    def match_batch(self, transactions: list) -> list:
+        """
+        Find the first matching rule of each transaction in a batch.
+
+        Each condition is evaluated a column at a time, only over the
+        transactions that are still candidates, so a selective first
+        condition leaves little work for the conditions after it.
+
+        Args:
+            transactions: List of Transaction records
+
+        Returns:
+            List with the name of the matching rule, or None, for each
+            transaction
+        """
+        matches = [None] * len(transactions)
+        unmatched = range(len(transactions))
+        columns = {}
+
+        for name, conditions in self.__rules:
+            candidates = unmatched
+
+            for attribute, _, column_filter in conditions:
+                if attribute not in columns:
+                    columns[attribute] = list(map(attrgetter(attribute),
+                                                  transactions))
+                candidates = column_filter(columns[attribute], candidates)
+                if not candidates:
+                    break
+
+            for index in candidates:
+                matches[index] = name
+
+            if candidates:
+                matched = set(candidates)
+                unmatched = [index for index in unmatched
+                             if index not in matched]
+
+        return matches
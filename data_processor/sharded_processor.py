@@ -0,0 +1,484 @@
+"""
+Sharded Transaction Processing Module
+
+This module provides a parallel version of DataProcessor.process_data. The
+transactions are split into shards by a hash of the account number, each
+shard is processed by DataProcessor in a worker process and the partial
+results are merged with the functions of the aggregates module.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+from typing import Iterable
+from data_processor.aggregates import (ACCOUNT_SUMMARY_TOTALS,
+                                       TRANSACTION_STATISTIC_TOTALS,
+                                       merge_groups,
+                                       merge_suspicious_transactions,
+                                       sum_balances,
+                                       sum_currency_balances,
+                                       sum_totals)
+from data_processor.data_processor import DataProcessor
+from data_processor.deduplication import DuplicateFilter
+from data_processor.fx_rates import FxRateTable
+from data_processor.rollups import TimeRollups
+from data_processor.transfer_graph import TransferGraph
+from transaction.transaction import Transaction
+
+
+def get_shard(account_number: str, shard_count: int) -> int:
+    """
+    Get the shard of an account number.
+
+    CRC-32 is used instead of hash() so that the shard of an account is the
+    same in every process and every run.
+
+    Args:
+        account_number: Account number of the transaction
+        shard_count: Number of shards
+
+    Returns:
+        Shard index from 0 to shard_count - 1
+    """
+    return zlib.crc32(account_number.encode("utf-8")) % shard_count
+
+
+def process_shard(indexed_transactions: list, rules: list = None,
+                  velocity_detectors: list = None,
+                  money_mode: str = "float",
+                  track_distributions: bool = False,
+                  unique_account_error: float = None,
+                  track_rollups: bool = False,
+                  track_currency_balances: bool = False,
+                  fx_rates: FxRateTable = None,
+                  track_transfer_graph: bool = False) -> dict:
+    """
+    Process the transactions of one shard with DataProcessor.
+
+    This runs in a worker process.
+
+    Args:
+        indexed_transactions: List of (row index, Transaction) pairs in row order
+        rules: Suspicious transaction rule definitions passed to DataProcessor
+        velocity_detectors: VelocityDetector instances passed to DataProcessor
+        money_mode: Money mode passed to DataProcessor
+        track_distributions: Passed to DataProcessor
+        unique_account_error: Passed to DataProcessor
+        track_rollups: Passed to DataProcessor
+        track_currency_balances: Passed to DataProcessor
+        fx_rates: Passed to DataProcessor
+        track_transfer_graph: Passed to DataProcessor
+
+    Returns:
+        Dictionary of the partial results. The suspicious transactions are
+        (row index, Transaction, rule name) tuples, and first_rows holds the
+        row index at which each account number, transaction type, currency
+        and day first appears. A Destination account first seen in a row
+        gets the row index plus 0.5, as DataProcessor adds it after the
+        account of the row.
+    """
+    data_processor = DataProcessor(
+        [transaction for _, transaction in indexed_transactions], rules=rules,
+        velocity_detectors=velocity_detectors, money_mode=money_mode,
+        track_distributions=track_distributions,
+        unique_account_error=unique_account_error,
+        track_rollups=track_rollups,
+        track_currency_balances=track_currency_balances, fx_rates=fx_rates,
+        track_transfer_graph=track_transfer_graph)
+    processed_data = data_processor.process_data()
+    first_rows = {}
+    suspicious_transactions = []
+    rows = iter(indexed_transactions)
+
+    for index, transaction in indexed_transactions:
+        first_rows.setdefault(("account", transaction.account_number), index)
+        if transaction.transaction_type == "transfer" \
+                and transaction.destination_account is not None:
+            first_rows.setdefault(("account", transaction.destination_account),
+                                  index + 0.5)
+        first_rows.setdefault(("type", transaction.transaction_type), index)
+        first_rows.setdefault(("currency", transaction.currency), index)
+        if unique_account_error:
+            date = transaction.date
+            first_rows.setdefault(
+                ("date", date[:10] if isinstance(date, str) else date), index)
+
+    # The suspicious transactions are in row order, so each one is found
+    # by walking forward through the rows.
+    for suspicious, rule_name in zip(processed_data["suspicious_transactions"],
+                                     data_processor.suspicious_rule_names):
+        for index, transaction in rows:
+            if transaction is suspicious:
+                suspicious_transactions.append((index, transaction, rule_name))
+                break
+
+    return {
+        "account_summaries": processed_data["account_summaries"],
+        "suspicious_transactions": suspicious_transactions,
+        "transaction_statistics": processed_data["transaction_statistics"],
+        "amount_distributions": data_processor.amount_distributions,
+        "unique_accounts": data_processor.unique_accounts,
+        "rollups": data_processor.rollups,
+        "currency_balances": data_processor.currency_balances,
+        "reporting_balances": data_processor.reporting_balances,
+        "transfer_graph": data_processor.transfer_graph,
+        "first_rows": first_rows
+    }
+
+
+class ShardedDataProcessor:
+    """
+    Multi-process financial transaction processor.
+
+    Every transaction of an account is in the same shard and is processed
+    in row order, so the account summaries are exactly those of
+    DataProcessor, except that a transfer to an account of another shard
+    is added to its balance in shard order. The results are put back in the order DataProcessor
+    makes them: accounts and transaction types by first appearance and
+    suspicious transactions by row. Statistic counts are exact. The totals
+    of the shards are added with math.fsum, so they do not depend on the
+    order the shards are merged in, but float totals can still differ from
+    the running totals of DataProcessor in the last bits. Use the
+    minor_units money mode for totals that are exactly those of
+    DataProcessor.
+    """
+
+    def __init__(self, transactions: Iterable, workers: int = 0,
+                 rules: list = None, velocity_detectors: list = None,
+                 money_mode: str = "float", track_distributions: bool = False,
+                 unique_account_error: float = None,
+                 track_rollups: bool = False,
+                 track_currency_balances: bool = False,
+                 fx_rates: FxRateTable = None,
+                 duplicate_filter: DuplicateFilter = None,
+                 track_transfer_graph: bool = False):
+        """
+        Initialize the processor with transaction data.
+
+        Args:
+            transactions: List or iterable of Transaction records or
+                transaction dictionaries to process
+            workers: Number of worker processes, which is also the number
+                of shards (default: 0 for the number of CPUs). With 1 the
+                shard is processed in this process.
+            rules: Suspicious transaction rule definitions, see the rules
+                module (default: the DataProcessor rules)
+            velocity_detectors: VelocityDetector instances. Each worker gets
+                its own copy, which sees every transaction of its accounts.
+            money_mode: One of DataProcessor.MONEY_MODES. With minor_units
+                the merged statistic totals are exact as well.
+            track_distributions: True to keep the amount distributions of
+                each transaction type and currency, see DataProcessor
+            unique_account_error: Relative standard error of the unique
+                account counts, see DataProcessor (default: None to not
+                count them). The sketches of the shards are merged, so the
+                counts are the same as those of DataProcessor.
+            track_rollups: True to keep daily and monthly totals of each
+                account and transaction type, see DataProcessor
+            track_currency_balances: True to keep the balance of each
+                account in each currency, see DataProcessor
+            fx_rates: FxRateTable for the reporting currency balances, see
+                DataProcessor. Each worker gets its own copy.
+            duplicate_filter: DuplicateFilter applied to all the
+                transactions before they are split into shards
+            track_transfer_graph: True to keep the graph of the transfers
+                between accounts, see DataProcessor. The graphs of the
+                shards are merged, so it has the same edges as that of
+                DataProcessor.
+
+        Raises:
+            ValueError: If money_mode is not one of DataProcessor.MONEY_MODES
+        """
+        if money_mode not in DataProcessor.MONEY_MODES:
+            raise ValueError(f"Money mode: {money_mode} is not one of "
+                             f"{DataProcessor.MONEY_MODES}.")
+
+        self.__transactions = transactions
+        self.__workers = workers if workers > 0 else os.cpu_count() or 1
+        self.__account_summaries = {}
+        self.__rules = rules
+        self.__velocity_detectors = velocity_detectors
+        self.__money_mode = money_mode
+        self.__track_distributions = track_distributions
+        self.__amount_distributions = None
+        self.__unique_account_error = unique_account_error
+        self.__unique_accounts = None
+        self.__track_rollups = track_rollups
+        self.__rollups = None
+        self.__track_currency_balances = track_currency_balances
+        self.__fx_rates = fx_rates
+        self.__currency_balances = None
+        self.__reporting_balances = None
+        self.__duplicate_filter = duplicate_filter
+        self.__track_transfer_graph = track_transfer_graph
+        self.__transfer_graph = None
+        self.__suspicious_transactions = []
+        self.__suspicious_rule_names = []
+        self.__transaction_statistics = {}
+        self.__input_processed = False
+
+    @property
+    def account_summaries(self) -> dict:
+        """
+        Get the processed account summaries.
+
+        Returns:
+            Dictionary of account-level transaction summaries
+        """
+        return self.__account_summaries
+
+    @property
+    def suspicious_transactions(self) -> list:
+        """
+        Get flagged suspicious transactions.
+
+        Returns:
+            List of transactions that met suspicious criteria
+        """
+        return self.__suspicious_transactions
+
+    @property
+    def suspicious_rule_names(self) -> list:
+        """
+        Get the name of the rule that flagged each suspicious transaction.
+
+        Returns:
+            List of rule names in the order of suspicious_transactions
+        """
+        return self.__suspicious_rule_names
+
+    @property
+    def amount_distributions(self) -> dict:
+        """
+        Get the amount distributions by transaction type and by currency.
+
+        Returns:
+            Dictionary with the keys transaction_type and currency, each a
+            dictionary of AmountDistribution, or None if not tracked
+        """
+        return self.__amount_distributions
+
+    @property
+    def unique_accounts(self) -> dict:
+        """
+        Get the unique account sketches by transaction type, currency and day.
+
+        Returns:
+            Dictionary with the keys transaction_type, currency and date,
+            each a dictionary of HyperLogLog, or None if not counted
+        """
+        return self.__unique_accounts
+
+    @property
+    def rollups(self) -> TimeRollups:
+        """
+        Get the daily and monthly totals of each account and transaction type.
+
+        Returns:
+            TimeRollups, or None if not tracked
+        """
+        return self.__rollups
+
+    @property
+    def currency_balances(self) -> dict:
+        """
+        Get the balance of each account in each currency.
+
+        Returns:
+            Dictionary of balances by currency, by account number, or None
+            if not tracked
+        """
+        return self.__currency_balances
+
+    @property
+    def reporting_balances(self) -> dict:
+        """
+        Get the balance of each account in the reporting currency.
+
+        Returns:
+            Dictionary of balances by account number, or None if no
+            fx_rates were given
+        """
+        return self.__reporting_balances
+
+    @property
+    def duplicate_count(self) -> int:
+        """
+        Get the number of transactions dropped as duplicates.
+
+        Returns:
+            Number of transactions the duplicate_filter dropped, 0 if
+            there is none
+        """
+        if self.__duplicate_filter is None:
+            return 0
+        return self.__duplicate_filter.duplicate_count
+
+    @property
+    def transfer_graph(self) -> TransferGraph:
+        """
+        Get the graph of the transfers between accounts.
+
+        Returns:
+            TransferGraph, or None if not tracked
+        """
+        return self.__transfer_graph
+
+    @property
+    def transaction_statistics(self) -> dict:
+        """
+        Get transaction type statistics.
+
+        Returns:
+            Dictionary of transaction statistics by type
+        """
+        return self.__transaction_statistics
+
+    def process_data(self) -> dict:
+        """
+        Process all transactions and generate summary data.
+
+        The transactions are read into their shards first, so the whole
+        input is held in memory while the shards are processed. As with
+        DataProcessor, the input data is only processed by the first call,
+        so calling this again returns the current results without counting
+        the transactions twice.
+
+        Returns:
+            Dictionary containing all processed data results
+        """
+        if not self.__input_processed:
+            self.__input_processed = True
+            self.__process_shards()
+
+        return {
+            "account_summaries": self.__account_summaries,
+            "suspicious_transactions": self.__suspicious_transactions,
+            "transaction_statistics": self.__transaction_statistics
+        }
+
+    def __process_shards(self) -> None:
+        """
+        Split the transactions into shards, process each one with
+        process_shard and merge the results.
+        """
+        shards = [[] for _ in range(self.__workers)]
+        transactions = self.__transactions
+
+        if self.__duplicate_filter is not None:
+            # Every transaction is read before any is processed, so the IDs
+            # are committed once the shards are merged.
+            transactions = self.__duplicate_filter.filter(transactions, commit=False)
+
+        for index, transaction in enumerate(transactions):
+            transaction = Transaction.coerce(transaction)
+            shards[get_shard(transaction.account_number,
+                             self.__workers)].append((index, transaction))
+
+        shards = [shard for shard in shards if shard]
+
+        process = partial(process_shard, rules=self.__rules,
+                          velocity_detectors=self.__velocity_detectors,
+                          money_mode=self.__money_mode,
+                          track_distributions=self.__track_distributions,
+                          unique_account_error=self.__unique_account_error,
+                          track_rollups=self.__track_rollups,
+                          track_currency_balances=self.__track_currency_balances,
+                          fx_rates=self.__fx_rates,
+                          track_transfer_graph=self.__track_transfer_graph)
+
+        if len(shards) > 1:
+            with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+                partials = list(executor.map(process, shards))
+        else:
+            partials = [process(shard) for shard in shards]
+
+        self.__merge(partials)
+
+        if self.__duplicate_filter is not None:
+            self.__duplicate_filter.commit()
+
+    def __merge(self, partials: list) -> None:
+        """
+        Merge the partial results of the shards in shard order and put
+        accounts and transaction types in order of first appearance.
+        """
+        first_rows = {}
+        for partial in partials:
+            for key, index in partial["first_rows"].items():
+                first_rows[key] = min(index, first_rows.get(key, index))
+
+        account_summaries = sum_totals(
+            [partial["account_summaries"] for partial in partials],
+            ACCOUNT_SUMMARY_TOTALS)
+        transaction_statistics = sum_totals(
+            [partial["transaction_statistics"] for partial in partials],
+            TRANSACTION_STATISTIC_TOTALS)
+        suspicious_transactions = reduce(
+            merge_suspicious_transactions,
+            (partial["suspicious_transactions"] for partial in partials), [])
+
+        self.__account_summaries.update(sorted(
+            account_summaries.items(),
+            key=lambda item: first_rows[("account", item[0])]))
+        self.__transaction_statistics.update(sorted(
+            transaction_statistics.items(),
+            key=lambda item: first_rows[("type", item[0])]))
+        self.__amount_distributions = self.__merge_groups(
+            partials, "amount_distributions", first_rows,
+            {"transaction_type": {}, "currency": {}}
+            if self.__track_distributions else None)
+        self.__unique_accounts = self.__merge_groups(
+            partials, "unique_accounts", first_rows,
+            {"transaction_type": {}, "currency": {}, "date": {}}
+            if self.__unique_account_error else None)
+
+        if self.__track_rollups:
+            self.__rollups = reduce(
+                TimeRollups.merge,
+                (partial["rollups"] for partial in partials), TimeRollups())
+        if self.__track_transfer_graph:
+            self.__transfer_graph = reduce(
+                TransferGraph.merge,
+                (partial["transfer_graph"] for partial in partials), TransferGraph())
+
+        account_order = {account_number: index for index, account_number
+                         in enumerate(self.__account_summaries)}
+        if self.__track_currency_balances or self.__fx_rates is not None:
+            self.__currency_balances = dict(sorted(
+                sum_currency_balances(
+                    [partial["currency_balances"] for partial in partials]).items(),
+                key=lambda item: account_order[item[0]]))
+        if self.__fx_rates is not None:
+            self.__reporting_balances = dict(sorted(
+                sum_balances(
+                    [partial["reporting_balances"] for partial in partials]).items(),
+                key=lambda item: account_order[item[0]]))
+
+        self.__suspicious_transactions.extend(
+            transaction for _, transaction, _ in suspicious_transactions)
+        self.__suspicious_rule_names.extend(
+            rule_name for _, _, rule_name in suspicious_transactions)
+
+    @staticmethod
+    def __merge_groups(partials: list, name: str, first_rows: dict,
+                       initial: dict) -> dict:
+        """
+        Merge the groups of accumulators the shards returned under name
+        and put their keys in order of first appearance.
+        """
+        groups = reduce(merge_groups,
+                        (partial[name] for partial in partials), initial)
+
+        if groups is None:
+            return None
+
+        kinds = {"transaction_type": "type"}
+        return {group: dict(sorted(
+                    accumulators.items(),
+                    key=lambda item: first_rows[(kinds.get(group, group), item[0])]))
+                for group, accumulators in groups.items()}
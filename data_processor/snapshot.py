@@ -0,0 +1,282 @@
+"""
+Processing State Snapshot Module
+
+This module provides saving and loading of the running state of
+DataProcessor, so a new run can carry on from the last one instead of
+processing every transaction again.
+
+A snapshot file is laid out as:
+- MAGIC
+- the length of the header as an 8 byte little-endian integer
+- a JSON header padded with spaces to a multiple of 8 bytes
+- the balance, total deposits and total withdrawals of each account as
+  8 byte floats, or 8 byte integers for minor_units totals, in the order
+  of the header's account numbers
+- one byte per total that is 1 when the total is an integer
+
+The totals start on an 8 byte boundary, so they are read straight from a
+memory map of the file without copying the file into memory first.
+Minor units are kept as integers because a float is only exact up to
+2**53.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from os import path
+from data_processor.account_store import AccountSummaryStore
+from data_processor.cardinality import HyperLogLog
+from data_processor.distribution import AmountDistribution
+from data_processor.rollups import TimeRollups
+from data_processor.transfer_graph import TransferGraph
+from transaction.transaction import TRANSACTION_TYPES
+
+MAGIC = b"FDPSNAP1"
+"""
+Bytes at the start of every snapshot file.
+"""
+
+SUMMARY_TOTALS = ("balance", "total_deposits", "total_withdrawals")
+"""
+Account summary fields stored as totals, in their order in the file.
+"""
+
+TOTALS_TYPECODES = {"minor_units": "q"}
+"""
+Array typecode of the totals by money mode, "d" for the others.
+"""
+
+LENGTH_SIZE = 8
+"""
+Number of bytes of the header length.
+"""
+
+
+def transaction_id_key(transaction_id) -> tuple:
+    """
+    Get the sort key of a Transaction ID for the high-water mark.
+
+    Numeric IDs are compared as numbers and sort before other IDs, which
+    are compared as strings.
+
+    Args:
+        transaction_id: Transaction ID of a transaction
+
+    Returns:
+        Tuple that orders Transaction IDs
+    """
+    transaction_id = str(transaction_id)
+
+    if transaction_id.isdigit():
+        return (0, int(transaction_id), "")
+    return (1, 0, transaction_id)
+
+
+def save_snapshot(file_path: str, account_summaries: dict,
+                  transaction_statistics: dict, high_water_mark,
+                  money_mode: str = None,
+                  amount_distributions: dict = None,
+                  unique_accounts: dict = None,
+                  rollups: TimeRollups = None,
+                  currency_balances: dict = None,
+                  reporting_balances: dict = None,
+                  transfer_graph: TransferGraph = None) -> None:
+    """
+    Save processing state to a snapshot file.
+
+    The file is replaced in a single step, so a crash never leaves half a
+    snapshot.
+
+    Args:
+        file_path: Path of the snapshot file
+        account_summaries: Account summaries by account number
+        transaction_statistics: Transaction statistics by transaction type
+        high_water_mark: Transaction ID of the last processed transaction,
+            or None if nothing was processed
+        money_mode: Money mode of the totals, see DataProcessor.MONEY_MODES
+        amount_distributions: AmountDistribution dictionaries by
+            transaction_type and currency, or None if they are not tracked
+        unique_accounts: HyperLogLog dictionaries by transaction_type,
+            currency and date, or None if they are not counted
+        rollups: TimeRollups, or None if they are not tracked
+        currency_balances: Balances by currency by account number, or None
+            if they are not tracked
+        reporting_balances: Reporting currency balances by account number,
+            or None if they are not tracked
+        transfer_graph: TransferGraph, or None if it is not tracked
+    """
+    account_numbers = list(account_summaries)
+    totals_typecode = TOTALS_TYPECODES.get(money_mode, "d")
+    totals = array(totals_typecode)
+    integer_flags = bytearray()
+
+    if isinstance(account_summaries, AccountSummaryStore):
+        rows = account_summaries.rows()
+    else:
+        rows = ((account_number,) + tuple(account_summaries[account_number][field]
+                                          for field in SUMMARY_TOTALS)
+                for account_number in account_numbers)
+
+    for _, *summary_totals in rows:
+        for total in summary_totals:
+            totals.append(total)
+            integer_flags.append(isinstance(total, int))
+
+    header = json.dumps({
+        "byteorder": sys.byteorder,
+        "high_water_mark": high_water_mark,
+        "money_mode": money_mode,
+        "totals_typecode": totals_typecode,
+        "account_numbers": account_numbers,
+        "transaction_statistics": transaction_statistics,
+        "amount_distributions": groups_to_dict(amount_distributions),
+        "unique_accounts": groups_to_dict(unique_accounts),
+        "rollups": None if rollups is None else rollups.to_dict(),
+        "currency_balances": currency_balances,
+        "reporting_balances": reporting_balances,
+        "transfer_graph": None if transfer_graph is None else transfer_graph.to_dict()
+    }).encode("utf-8")
+    header += b" " * (-len(header) % 8)
+
+    directory = path.dirname(path.abspath(file_path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory,
+                                                       suffix=".tmp")
+
+    with os.fdopen(file_descriptor, "wb") as snapshot_file:
+        snapshot_file.write(MAGIC)
+        snapshot_file.write(len(header).to_bytes(LENGTH_SIZE, "little"))
+        snapshot_file.write(header)
+        totals.tofile(snapshot_file)
+        snapshot_file.write(integer_flags)
+
+    os.replace(temporary_path, file_path)
+
+
+def load_snapshot(file_path: str) -> dict:
+    """
+    Load processing state from a snapshot file.
+
+    Args:
+        file_path: Path of the snapshot file
+
+    Returns:
+        Dictionary with the account_summaries, transaction_statistics,
+        amount_distributions, unique_accounts, rollups, currency_balances,
+        reporting_balances, transfer_graph, high_water_mark and money_mode
+        of the snapshot. The money_mode is None for snapshots saved without
+        one.
+
+    Raises:
+        FileNotFoundError: If the snapshot file does not exist
+        ValueError: If the file is not a snapshot file
+    """
+    if not path.isfile(file_path):
+        raise FileNotFoundError(f"File: {file_path} does not exist.")
+
+    with open(file_path, "rb") as snapshot_file, \
+            mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = len(MAGIC) + LENGTH_SIZE
+
+        if len(data) < start or data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"File: {file_path} is not a snapshot file.")
+
+        header_size = int.from_bytes(data[len(MAGIC):start], "little")
+        header = json.loads(data[start:start + header_size])
+        totals_typecode = header.get("totals_typecode", "d")
+        account_numbers = header["account_numbers"]
+        total_count = len(account_numbers) * len(SUMMARY_TOTALS)
+        totals_start = start + header_size
+        flags_start = totals_start + total_count * 8
+
+        with memoryview(data) as view, \
+                view[totals_start:flags_start].cast(totals_typecode) as total_view:
+            totals = total_view.tolist()
+
+        integer_flags = data[flags_start:flags_start + total_count]
+
+    if header["byteorder"] != sys.byteorder:
+        swapped = array(totals_typecode, totals)
+        swapped.byteswap()
+        totals = swapped.tolist()
+
+    account_summaries = {}
+    values = iter(zip(totals, integer_flags))
+
+    for account_number in account_numbers:
+        summary = {"account_number": account_number}
+        for field in SUMMARY_TOTALS:
+            total, is_integer = next(values)
+            summary[field] = int(total) if is_integer else total
+        account_summaries[account_number] = summary
+
+    return {
+        "account_summaries": account_summaries,
+        "transaction_statistics": {
+            TRANSACTION_TYPES.get(transaction_type, transaction_type): statistics
+            for transaction_type, statistics
+            in header["transaction_statistics"].items()},
+        "amount_distributions": groups_from_dict(
+            header.get("amount_distributions"), AmountDistribution),
+        "unique_accounts": groups_from_dict(
+            header.get("unique_accounts"), HyperLogLog),
+        "rollups": None if header.get("rollups") is None
+        else TimeRollups.from_dict(header["rollups"]),
+        "currency_balances": header.get("currency_balances"),
+        "reporting_balances": header.get("reporting_balances"),
+        "transfer_graph": None if header.get("transfer_graph") is None
+        else TransferGraph.from_dict(header["transfer_graph"]),
+        "high_water_mark": header["high_water_mark"],
+        "money_mode": header.get("money_mode")
+    }
+
+
+def groups_to_dict(groups: dict) -> dict:
+    """
+    Get the state of groups of accumulators, e.g. the amount distributions
+    by transaction_type and by currency, as JSON-serializable values.
+
+    Args:
+        groups: Dictionary of accumulator dictionaries by group, or None
+
+    Returns:
+        Dictionary of the to_dict() states, or None
+    """
+    if groups is None:
+        return None
+
+    return {group: {key: accumulator.to_dict()
+                    for key, accumulator in accumulators.items()}
+            for group, accumulators in groups.items()}
+
+
+def groups_from_dict(state: dict, accumulator_class) -> dict:
+    """
+    Rebuild groups of accumulators saved in a snapshot header.
+
+    Args:
+        state: Dictionary from groups_to_dict, or None
+        accumulator_class: Class with a from_dict method
+
+    Returns:
+        Dictionary of accumulator dictionaries by group, or None if the
+        snapshot has none
+    """
+    if state is None:
+        return None
+
+    groups = {group: {key: accumulator_class.from_dict(accumulator)
+                      for key, accumulator in accumulators.items()}
+              for group, accumulators in state.items()}
+
+    if "transaction_type" in groups:
+        groups["transaction_type"] = {
+            TRANSACTION_TYPES.get(transaction_type, transaction_type): accumulator
+            for transaction_type, accumulator
+            in groups["transaction_type"].items()}
+    return groups
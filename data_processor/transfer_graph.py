@@ -0,0 +1,368 @@
+"""
+Transfer Graph Module
+
+This module provides a directed graph of the transfers between accounts.
+Each account keeps an adjacency dictionary of the accounts it sent money
+to and received money from, with the count and total of the transfers on
+each edge, and a timeline of its transfers sorted by time. Cycles are found
+with Tarjan's strongly connected components in O(accounts + edges), and
+the fan-in and fan-out of an account in a time window are found by binary
+search over its timeline.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+from bisect import bisect_left, bisect_right
+from data_processor.velocity import parse_timestamp
+
+
+class TransferGraph:
+    """
+    Directed graph of transfers, from source account to destination account.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty graph.
+        """
+        self.__out_edges = {}
+        self.__in_edges = {}
+        self.__out_timelines = {}
+        self.__in_timelines = {}
+        self.__transfer_count = 0
+
+    @property
+    def transfer_count(self) -> int:
+        """
+        Get the number of transfers added.
+
+        Returns:
+            Number of transfers
+        """
+        return self.__transfer_count
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Get the number of distinct (source, destination) pairs.
+
+        Returns:
+            Number of edges
+        """
+        return sum(len(edges) for edges in self.__out_edges.values())
+
+    @property
+    def accounts(self) -> list:
+        """
+        Get the accounts that sent or received a transfer.
+
+        Returns:
+            List of account numbers in order of their first transfer
+        """
+        return list(dict.fromkeys([*self.__out_edges, *self.__in_edges]))
+
+    def add(self, source: str, destination: str, amount, date=None) -> None:
+        """
+        Add a transfer.
+
+        Args:
+            source: Account the money leaves
+            destination: Account the money goes to
+            amount: Amount of the transfer
+            date: Date of the transfer. Transfers without a valid date are
+                on the edges but not in the timelines.
+        """
+        destinations = self.__out_edges.get(source)
+        if destinations is None:
+            destinations = self.__out_edges[source] = {}
+
+        edge = destinations.get(destination)
+        if edge is None:
+            edge = destinations[destination] = [0, 0]
+            self.__in_edges.setdefault(destination, {})[source] = edge
+
+        edge[0] += 1
+        edge[1] += amount
+        self.__transfer_count += 1
+
+        timestamp = parse_timestamp(date)
+        if timestamp is not None:
+            self.__add_to_timeline(self.__out_timelines, source, timestamp, destination)
+            self.__add_to_timeline(self.__in_timelines, destination, timestamp, source)
+
+    def destinations(self, account_number: str) -> dict:
+        """
+        Get the accounts an account sent transfers to.
+
+        Args:
+            account_number: Account number
+
+        Returns:
+            Dictionary of (transfer count, total amount) by destination account
+        """
+        return {destination: tuple(edge) for destination, edge
+                in self.__out_edges.get(account_number, {}).items()}
+
+    def sources(self, account_number: str) -> dict:
+        """
+        Get the accounts an account received transfers from.
+
+        Args:
+            account_number: Account number
+
+        Returns:
+            Dictionary of (transfer count, total amount) by source account
+        """
+        return {source: tuple(edge) for source, edge
+                in self.__in_edges.get(account_number, {}).items()}
+
+    def fan_out(self, account_number: str, start=None, end=None) -> int:
+        """
+        Count the distinct accounts an account sent transfers to in a time
+        window.
+
+        Args:
+            account_number: Account number
+            start: First Date of the window (default: no limit)
+            end: Last Date of the window, a day meaning up to the end of
+                that day (default: no limit)
+
+        Returns:
+            Number of distinct destination accounts
+        """
+        if start is None and end is None:
+            return len(self.__out_edges.get(account_number, ()))
+        return self.__count_distinct(self.__out_timelines, account_number, start, end)
+
+    def fan_in(self, account_number: str, start=None, end=None) -> int:
+        """
+        Count the distinct accounts an account received transfers from in a
+        time window.
+
+        Args:
+            account_number: Account number
+            start: First Date of the window (default: no limit)
+            end: Last Date of the window, a day meaning up to the end of
+                that day (default: no limit)
+
+        Returns:
+            Number of distinct source accounts
+        """
+        if start is None and end is None:
+            return len(self.__in_edges.get(account_number, ()))
+        return self.__count_distinct(self.__in_timelines, account_number, start, end)
+
+    def find_cycles(self) -> list:
+        """
+        Find the groups of accounts that transfers go around in circles,
+        i.e. the strongly connected components with a cycle, using an
+        iterative version of Tarjan's algorithm.
+
+        Returns:
+            List of lists of account numbers. Every account of a group can
+            reach every other one through transfers, and an account that
+            transferred to itself is a group on its own.
+        """
+        out_edges = self.__out_edges
+        indexes = {}
+        low_links = {}
+        stack = []
+        on_stack = set()
+        cycles = []
+
+        for root in out_edges:
+            if root in indexes:
+                continue
+
+            indexes[root] = low_links[root] = len(indexes)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(out_edges.get(root, ())))]
+
+            while work:
+                account_number, successors = work[-1]
+                for successor in successors:
+                    if successor not in indexes:
+                        indexes[successor] = low_links[successor] = len(indexes)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append((successor, iter(out_edges.get(successor, ()))))
+                        break
+                    if successor in on_stack:
+                        low_links[account_number] = min(low_links[account_number],
+                                                        indexes[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_links[parent] = min(low_links[parent],
+                                                low_links[account_number])
+
+                    if low_links[account_number] == indexes[account_number]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == account_number:
+                                break
+                        if len(component) > 1 \
+                                or account_number in out_edges.get(account_number, ()):
+                            component.reverse()
+                            cycles.append(component)
+
+        return cycles
+
+    def merge(self, other: "TransferGraph") -> "TransferGraph":
+        """
+        Merge two graphs, adding up the edges they share.
+
+        Args:
+            other: Graph to merge with this one
+
+        Returns:
+            New graph of the transfers of both
+        """
+        merged = TransferGraph()
+
+        for graph in (self, other):
+            for source, destinations in graph.__out_edges.items():
+                for destination, (count, amount) in destinations.items():
+                    merged.__add_edge(source, destination, count, amount)
+
+        for timelines, merged_timelines in (
+                (self.__out_timelines, merged.__out_timelines),
+                (self.__in_timelines, merged.__in_timelines)):
+            merged_timelines.update((account_number, (list(timestamps), list(counterparts)))
+                                    for account_number, (timestamps, counterparts)
+                                    in timelines.items())
+        for timelines, merged_timelines in (
+                (other.__out_timelines, merged.__out_timelines),
+                (other.__in_timelines, merged.__in_timelines)):
+            for account_number, (timestamps, counterparts) in timelines.items():
+                if account_number not in merged_timelines:
+                    merged_timelines[account_number] = (list(timestamps), list(counterparts))
+                    continue
+                # Sort the two timelines together once instead of
+                # inserting one transfer at a time.
+                pairs = sorted([*zip(*merged_timelines[account_number]),
+                                *zip(timestamps, counterparts)],
+                               key=lambda pair: pair[0])
+                merged_timelines[account_number] = ([pair[0] for pair in pairs],
+                                                    [pair[1] for pair in pairs])
+
+        merged.__transfer_count = self.__transfer_count + other.__transfer_count
+        return merged
+
+    def to_dict(self) -> dict:
+        """
+        Get the state of the graph as JSON-serializable values.
+
+        Returns:
+            Dictionary the graph can be rebuilt from with from_dict
+        """
+        return {
+            "edges": [[source, destination, count, amount]
+                      for source, destinations in self.__out_edges.items()
+                      for destination, (count, amount) in destinations.items()],
+            "timelines": [[source, timestamps, destinations] for source, (timestamps, destinations)
+                          in self.__out_timelines.items()],
+            "transfer_count": self.__transfer_count
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "TransferGraph":
+        """
+        Rebuild a graph from the state returned by to_dict.
+
+        Args:
+            state: Dictionary from to_dict
+
+        Returns:
+            The rebuilt graph
+        """
+        graph = cls()
+
+        for source, destination, count, amount in state["edges"]:
+            graph.__add_edge(source, destination, count, amount)
+        for source, timestamps, destinations in state["timelines"]:
+            for timestamp, destination in zip(timestamps, destinations):
+                graph.__add_to_timeline(graph.__out_timelines, source, timestamp, destination)
+                graph.__add_to_timeline(graph.__in_timelines, destination, timestamp, source)
+
+        graph.__transfer_count = state["transfer_count"]
+        return graph
+
+    def __add_edge(self, source: str, destination: str, count: int, amount) -> None:
+        """
+        Add count transfers totalling amount to an edge.
+        """
+        destinations = self.__out_edges.setdefault(source, {})
+        edge = destinations.get(destination)
+
+        if edge is None:
+            edge = destinations[destination] = [0, 0]
+            self.__in_edges.setdefault(destination, {})[source] = edge
+
+        edge[0] += count
+        edge[1] += amount
+
+    @staticmethod
+    def __add_to_timeline(timelines: dict, account_number: str, timestamp: float,
+                          counterpart: str) -> None:
+        """
+        Add a transfer to the timeline of an account, keeping it sorted.
+        Transfers mostly arrive in date order, so this is usually an append.
+        """
+        timeline = timelines.get(account_number)
+        if timeline is None:
+            timeline = timelines[account_number] = ([], [])
+
+        timestamps, counterparts = timeline
+        if not timestamps or timestamps[-1] <= timestamp:
+            timestamps.append(timestamp)
+            counterparts.append(counterpart)
+        else:
+            index = bisect_right(timestamps, timestamp)
+            timestamps.insert(index, timestamp)
+            counterparts.insert(index, counterpart)
+
+    @staticmethod
+    def __count_distinct(timelines: dict, account_number: str, start, end) -> int:
+        """
+        Count the distinct counterparts in the timeline of an account from
+        start to end.
+        """
+        timeline = timelines.get(account_number)
+        if timeline is None:
+            return 0
+
+        timestamps, counterparts = timeline
+        low = 0 if start is None else bisect_left(timestamps, to_timestamp(start))
+        high = len(timestamps) if end is None \
+            else bisect_right(timestamps, to_timestamp(end, end_of_day=True))
+        return len(set(counterparts[low:high]))
+
+
+def to_timestamp(date, end_of_day: bool = False) -> float:
+    """
+    Convert a window bound to seconds since EPOCH.
+
+    Args:
+        date: Date value, e.g. 2023-03-15 or 2023-03-15 10:00
+        end_of_day: True to take a date without a time as the end of that day
+
+    Returns:
+        Seconds since EPOCH
+
+    Raises:
+        ValueError: If date is not a valid date
+    """
+    timestamp = parse_timestamp(date)
+
+    if timestamp is None:
+        raise ValueError(f"Date: {date} is not a valid date.")
+    if end_of_day and len(date) == 10:
+        timestamp += 86400 - 1e-6
+    return timestamp
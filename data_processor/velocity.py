@@ -0,0 +1,192 @@
+"""
+Transaction Velocity Detection Module
+
+This module provides a sliding-window detector for rules such as "more
+than N withdrawals, or more than X in total, within T hours for one
+account", which catch amounts split over many smaller transactions.
+
+Each account keeps only the transactions inside its window with a running
+count and total, so each transaction costs amortized O(1). Accounts with
+no transaction inside the window are dropped, and at most max_accounts
+accounts are kept, so memory stays bounded however many accounts there are.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+from collections import OrderedDict, deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterable
+
+EPOCH = datetime(1970, 1, 1)
+"""
+Time the timestamps are counted from.
+"""
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(date: str) -> float:
+    """
+    Convert a Date value to seconds since EPOCH.
+
+    The same dates repeat across many transactions, so the results are
+    cached.
+
+    Args:
+        date: ISO 8601 date or date and time, e.g. 2023-03-01
+
+    Returns:
+        Seconds since EPOCH, or None if the date is missing or not valid
+    """
+    try:
+        return (datetime.fromisoformat(date) - EPOCH).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+class AccountWindow:
+    """
+    Transactions of one account inside the window, with running totals.
+    """
+
+    __slots__ = ("entries", "total_amount")
+
+    def __init__(self):
+        self.entries = deque()
+        self.total_amount = 0
+
+
+class VelocityDetector:
+    """
+    Sliding-window velocity detector.
+
+    Transactions should arrive roughly in Date order, since the window of
+    an account is counted back from its newest transaction.
+    """
+
+    def __init__(self, name: str, window_hours: float,
+                 max_count: int = None, max_amount: float = None,
+                 transaction_types: Iterable = ("withdrawal",),
+                 max_accounts: int = 100000):
+        """
+        Initialize the detector.
+
+        Args:
+            name: Rule name recorded for the transactions it flags
+            window_hours: Length of the window in hours
+            max_count: Transactions in the window above which the account
+                is flagged, or None for no count limit
+            max_amount: Total amount in the window above which the account
+                is flagged, or None for no amount limit
+            transaction_types: Transaction types counted, or None for all
+            max_accounts: Most accounts kept; the least recently active
+                account is dropped when there are more
+
+        Raises:
+            ValueError: If neither max_count nor max_amount is given,
+                window_hours is not positive or max_count is less than 1
+        """
+        if max_count is None and max_amount is None:
+            raise ValueError(f"Velocity rule: {name} needs max_count or max_amount.")
+        if not window_hours > 0:
+            raise ValueError(f"Velocity rule: {name} window hours: {window_hours} "
+                             f"is not a positive number.")
+        if max_count is not None and max_count < 1:
+            raise ValueError(f"Velocity rule: {name} max count: {max_count} is less than 1.")
+
+        self.__name = name
+        self.__window_seconds = window_hours * 3600
+        self.__max_count = max_count
+        self.__max_amount = max_amount
+        self.__transaction_types = None if transaction_types is None \
+            else frozenset(transaction_types)
+        self.__max_accounts = max_accounts
+        self.__accounts = OrderedDict()
+        self.__clock = float("-inf")
+
+    @property
+    def name(self) -> str:
+        """
+        Get the rule name of the detector.
+
+        Returns:
+            Rule name recorded for flagged transactions
+        """
+        return self.__name
+
+    @property
+    def account_count(self) -> int:
+        """
+        Get the number of accounts with transactions in their window.
+
+        Returns:
+            Number of accounts kept
+        """
+        return len(self.__accounts)
+
+    def observe(self, transaction) -> bool:
+        """
+        Add a transaction to its account's window.
+
+        Args:
+            transaction: Transaction record
+
+        Returns:
+            True if the account's window is over a limit with this
+            transaction in it
+        """
+        if self.__transaction_types is not None \
+                and transaction.transaction_type not in self.__transaction_types:
+            return False
+
+        timestamp = parse_timestamp(transaction.date)
+        if timestamp is None:
+            return False
+
+        if timestamp > self.__clock:
+            self.__clock = timestamp
+            self.__drop_idle_accounts()
+
+        window = self.__get_window(transaction.account_number)
+        entries = window.entries
+        entries.append((timestamp, transaction.amount))
+        window.total_amount += transaction.amount
+
+        cutoff = timestamp - self.__window_seconds
+        while entries and entries[0][0] <= cutoff:
+            window.total_amount -= entries.popleft()[1]
+
+        return (self.__max_count is not None
+                and len(entries) > self.__max_count) \
+            or (self.__max_amount is not None
+                and window.total_amount > self.__max_amount)
+
+    def __get_window(self, account_number: str) -> AccountWindow:
+        """
+        Get an account's window, making it the most recently active and
+        dropping the least recently active account if there are too many.
+        """
+        window = self.__accounts.get(account_number)
+
+        if window is not None:
+            self.__accounts.move_to_end(account_number)
+            return window
+
+        window = self.__accounts[account_number] = AccountWindow()
+        if len(self.__accounts) > self.__max_accounts:
+            self.__accounts.popitem(last=False)
+        return window
+
+    def __drop_idle_accounts(self) -> None:
+        """
+        Drop the least recently active accounts whose newest transaction is
+        outside the window.
+        """
+        cutoff = self.__clock - self.__window_seconds
+
+        while self.__accounts:
+            window = next(iter(self.__accounts.values()))
+            if window.entries[-1][0] > cutoff:
+                return
+            self.__accounts.popitem(last=False)
@@ -0,0 +1,93 @@
+"""This module is for building Transactions straight from the value lists of
+csv.reader. The header is turned into column indexes once, so no dictionary
+is made for each row the way csv.DictReader does, and the rows are validated
+in batches a column at a time.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+from input_handler.validation import (get_reason, rejection_reason, to_floats,
+                                      to_transaction_types)
+from transaction.transaction import Transaction
+
+
+def compile_batch_parser(header: list, parse_row):
+    """Makes a function that validates a batch of csv rows and builds a
+    Transaction from each valid one.
+
+    The amounts and transaction types of the batch are converted a column
+    at a time, which is faster than checking each row on its own.
+
+    Args:
+        header (list): The field names from the header row.
+        parse_row: The function used for rows that do not have one value for
+            each field, e.g. InputHandler.parse_transaction. It is given the
+            row as a dictionary the same way csv.DictReader makes it.
+
+    Returns:
+        parse_batch: a function taking a list of the value lists of rows and
+        returning a list with the Transaction of each valid row and the
+        reason code (a str) of each row that is not valid. None is returned
+        instead of a function if the header is missing a column or has the
+        same column twice.
+    """
+    if len(set(header)) != len(header) \
+            or any(column not in header for column in Transaction.COLUMNS):
+        return None
+
+    width = len(header)
+    id_index, account_index, date_index, type_index, amount_index, \
+        currency_index, description_index = \
+        (header.index(column) for column in Transaction.COLUMNS)
+    destination_index = header.index("Destination account") \
+        if "Destination account" in header else None
+
+    def parse_batch(batch: list) -> list:
+        if not all(map(width.__eq__, map(len, batch))):
+            return [parse_values(values) for values in batch]
+
+        raw_amounts = [values[amount_index] for values in batch]
+        amounts = to_floats(raw_amounts)
+        transaction_types = to_transaction_types(
+            [values[type_index] for values in batch])
+
+        return [Transaction(values[id_index], values[account_index],
+                            values[date_index], transaction_type, amount,
+                            values[currency_index], values[description_index],
+                            raw_amount,
+                            None if destination_index is None
+                            else values[destination_index])
+                if transaction_type is not None and amount is not None
+                and amount > 0 else get_reason(amount, transaction_type)
+                for values, transaction_type, amount, raw_amount
+                in zip(batch, transaction_types, amounts, raw_amounts)]
+
+    def parse_values(values: list):
+        if len(values) == width:
+            return parse_batch([values])[0]
+        row = to_row(header, values)
+        return parse_row(row) or rejection_reason(row)
+
+    return parse_batch
+
+
+def to_row(header: list, values: list) -> dict:
+    """Makes a row dictionary the same way csv.DictReader does.
+
+    Args:
+        header (list): The field names.
+        values (list): The values of the row.
+
+    Returns:
+        row: the row dictionary.
+    """
+    row = dict(zip(header, values))
+
+    if len(values) > len(header):
+        row[None] = values[len(header):]
+    else:
+        for field_name in header[len(values):]:
+            row[field_name] = None
+
+    return row
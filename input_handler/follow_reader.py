@@ -0,0 +1,220 @@
+"""This module is for reading only the rows that were added to an append-only
+csv file since the last run. The byte offset and row count reached are kept
+in a checkpoint file, and a truncated or rotated file is read from the start.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import time
+from os import path
+from input_handler.csv_row_parser import to_row
+
+ENCODING = "utf-8"
+"""The encoding of the csv files."""
+
+READ_SIZE = 1024 * 1024
+"""The number of bytes read at a time."""
+
+HEAD_SIZE = 4096
+"""The number of bytes at the start of the file that are hashed to tell if
+the file was replaced by a new one."""
+
+
+def load_checkpoint(checkpoint_path: str) -> dict:
+    """Loads a checkpoint file.
+
+    Args:
+        checkpoint_path (str): The path of the checkpoint file.
+
+    Returns:
+        checkpoint: the checkpoint dictionary, or None if there is no
+        checkpoint file yet.
+    """
+    if not path.isfile(checkpoint_path):
+        return None
+
+    with open(checkpoint_path, "r") as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def save_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+    """Saves a checkpoint file, replacing the old one in a single step so a
+    crash never leaves half a checkpoint.
+
+    Args:
+        checkpoint_path (str): The path of the checkpoint file.
+        checkpoint (dict): The checkpoint to save.
+    """
+    directory = path.dirname(path.abspath(checkpoint_path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory,
+                                                       suffix=".tmp")
+
+    with os.fdopen(file_descriptor, "w") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+
+    os.replace(temporary_path, checkpoint_path)
+
+
+def hash_head(input_file, length: int) -> str:
+    """Hashes the first bytes of a file.
+
+    Args:
+        input_file: The file opened in binary mode.
+        length (int): The number of bytes to hash.
+
+    Returns:
+        digest: the hex digest of the bytes.
+    """
+    input_file.seek(0)
+    return hashlib.blake2b(input_file.read(length), digest_size=16).hexdigest()
+
+
+def is_same_file(input_file, checkpoint: dict) -> bool:
+    """Checks that the file is the one the checkpoint was saved for and that
+    it has only been appended to since.
+
+    Args:
+        input_file: The file opened in binary mode.
+        checkpoint (dict): The checkpoint.
+
+    Returns:
+        bool: False if the file was truncated or replaced.
+    """
+    stat = os.fstat(input_file.fileno())
+
+    if stat.st_ino != checkpoint["inode"] or stat.st_size < checkpoint["offset"]:
+        return False
+
+    return hash_head(input_file, checkpoint["head_size"]) == checkpoint["head_hash"]
+
+
+def new_checkpoint(input_file) -> dict:
+    """Makes the checkpoint for a file that is read from the start.
+
+    Args:
+        input_file: The file opened in binary mode.
+
+    Returns:
+        checkpoint: the checkpoint dictionary.
+    """
+    return {"inode": os.fstat(input_file.fileno()).st_ino,
+            "offset": 0,
+            "row_count": 0,
+            "header": None,
+            "head_size": 0,
+            "head_hash": hash_head(input_file, 0)}
+
+
+def iter_new_rows(file_path: str, checkpoint_path: str, follow: bool = False,
+                  poll_interval: float = 1.0):
+    """Yields the rows added to a csv file since the checkpoint was saved.
+
+    Only rows that end with a newline are read, so a row that is still
+    being written is left for the next run. The checkpoint is saved each
+    time the end of the file is reached and when the generator is closed,
+    and it only covers the rows that were yielded. The rows must not
+    contain quoted newlines.
+
+    Args:
+        file_path (str): The path of the csv file.
+        checkpoint_path (str): The path of the checkpoint file.
+        follow (bool): True to keep waiting for new rows at the end of the
+            file instead of stopping.
+        poll_interval (float): The seconds to wait before checking for new
+            rows when following.
+
+    Yields:
+        row: a dictionary of the next new row.
+    """
+    if not path.isfile(file_path):
+        raise FileNotFoundError(f"File: {file_path} does not exist.")
+
+    checkpoint = load_checkpoint(checkpoint_path)
+
+    with open(file_path, "rb") as input_file:
+        if checkpoint is None or not is_same_file(input_file, checkpoint):
+            checkpoint = new_checkpoint(input_file)
+
+        try:
+            while True:
+                for row in iter_complete_rows(input_file, checkpoint):
+                    yield row
+
+                save_checkpoint(checkpoint_path, checkpoint)
+
+                if not follow:
+                    return
+                time.sleep(poll_interval)
+
+                if not path.exists(file_path):
+                    # The file was moved away and the new one is not there
+                    # yet, so keep reading the old one.
+                    continue
+
+                if os.stat(file_path).st_ino != checkpoint["inode"]:
+                    # The file was rotated. Rows may have been added to the
+                    # old file since the last poll, so read it to the end
+                    # before starting again on the new one.
+                    if is_same_file(input_file, checkpoint):
+                        for row in iter_complete_rows(input_file, checkpoint):
+                            yield row
+                elif is_same_file(input_file, checkpoint):
+                    continue
+
+                # The file was rotated or truncated, so start again on the
+                # new one.
+                input_file.close()
+                input_file = open(file_path, "rb")
+                checkpoint = new_checkpoint(input_file)
+        finally:
+            input_file.close()
+            save_checkpoint(checkpoint_path, checkpoint)
+
+
+def iter_complete_rows(input_file, checkpoint: dict):
+    """Yields the rows from the checkpoint's offset to the last newline of
+    the file, moving the checkpoint forward after each row.
+
+    Args:
+        input_file: The file opened in binary mode.
+        checkpoint (dict): The checkpoint, which is updated in place.
+
+    Yields:
+        row: a dictionary of the next row.
+    """
+    input_file.seek(checkpoint["offset"])
+    leftover = b""
+
+    while True:
+        data = input_file.read(READ_SIZE)
+        if not data:
+            return
+
+        data = leftover + data
+        data_offset = checkpoint["offset"]
+        end = data.rfind(b"\n") + 1
+        leftover = data[end:]
+        lines = [line + b"\n" for line in data[:end].split(b"\n")[:-1]]
+
+        for line, values in zip(lines, csv.reader(line.decode(ENCODING)
+                                                  for line in lines)):
+            checkpoint["offset"] += len(line)
+
+            if data_offset == 0 and checkpoint["head_size"] < HEAD_SIZE:
+                # Hash the rows at the start of the file as they are read,
+                # so a new file with the same header is still told apart.
+                checkpoint["head_size"] = min(checkpoint["offset"], HEAD_SIZE)
+                checkpoint["head_hash"] = hashlib.blake2b(
+                    data[:checkpoint["head_size"]], digest_size=16).hexdigest()
+
+            if checkpoint["header"] is None:
+                checkpoint["header"] = values
+            elif values:
+                checkpoint["row_count"] += 1
+                yield to_row(checkpoint["header"], values)
@@ -5,18 +5,63 @@ a csv or a json and put it into a dictionary.
 __author__ = "Thomas Littleton"
 __version__ = "1.0."
 
+import bz2
 import csv
-import json
+import gzip
+import lzma
+from contextlib import nullcontext
+from itertools import islice
 from os import path
+from typing import Optional
+from input_handler.csv_row_parser import compile_batch_parser, to_row
+from input_handler.follow_reader import iter_new_rows
+from input_handler.json_stream import iter_json_array
+from input_handler.parallel_reader import (iter_csv_parallel,
+                                            iter_json_lines,
+                                            iter_ndjson_parallel)
+from input_handler.parse_cache import ParseCache
+from input_handler.validation import QuarantineWriter, rejection_reason
+from transaction.transaction import Transaction, TRANSACTION_TYPES
 
 class InputHandler:
     """This class is for validation for the input of the files which is the input.
     """
 
-    def __init__(self, file_path: str):
+    VALID_TRANSACTION_TYPES = frozenset(TRANSACTION_TYPES)
+    """The transaction types that a valid transaction can have."""
+
+    JSON_LINES_FORMATS = ("ndjson", "jsonl")
+    """The file extensions of newline delimited json files."""
+
+    COMPRESSION_OPENERS = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+    """The functions that open each kind of compressed file."""
+
+    VALIDATION_BATCH_SIZE = 1024
+    """The number of csv rows validated together."""
+
+    def __init__(self, file_path: str, cache_directory: str = "",
+                 cache_max_bytes: int = ParseCache.DEFAULT_MAX_BYTES,
+                 quarantine_path: str = ""):
         """Initializes a new instance of the InputHandler class.
+
+        Args:
+            file_path (str): The path of the input file.
+            cache_directory (str): The directory to keep a binary copy of
+                the validated transactions in, so the next run reading the
+                same file does not parse it again. Empty for no cache. The
+                cache is not used with a quarantine_path, so the rejected
+                rows are written on every read.
+            cache_max_bytes (int): The most bytes the cache can use.
+            quarantine_path (str): The csv file the rows that are not valid
+                are written to, with the reason each was rejected. Empty to
+                not write them.
         """
         self.__file_path = file_path
+        self.__parse_cache = ParseCache(cache_directory, cache_max_bytes) \
+            if cache_directory else None
+        self.__quarantine_path = quarantine_path
+        self.__rejected_count = 0
+        self.__rejection_counts = {}
 
     @property
     def file_path(self) -> str:
@@ -27,13 +72,64 @@ class InputHandler:
         """
         return self.__file_path
 
+    @property
+    def rejected_count(self) -> int:
+        """Gets the number of rows iter_transactions has rejected as not
+        valid. Rows loaded from the parse cache were already validated, so
+        they are not counted; set a quarantine_path to always count them.
+
+        Returns:
+            __rejected_count: The number of rejected rows.
+        """
+        return self.__rejected_count
+
+    @property
+    def rejection_counts(self) -> dict:
+        """Gets the number of rows iter_transactions has rejected for each
+        reason code, e.g. NON_NUMERIC_AMOUNT.
+
+        Returns:
+            __rejection_counts: The dictionary of counts by reason code.
+        """
+        return self.__rejection_counts
+
     def get_file_format(self) -> str:
         """Gets the file path of the InputHandler.
 
+        A compression extension is skipped, so the format of
+        "input_data.csv.gz" is "csv".
+
         Returns:
             __file_path.split: The file path formatted of the InputHandler.
         """
-        return self.__file_path.split(".")[-1]
+        extensions = self.__file_path.split(".")
+
+        if self.get_compression() and len(extensions) > 2:
+            return extensions[-2]
+        return extensions[-1]
+
+    def get_compression(self) -> str:
+        """Gets the compression extension of the file path.
+
+        Returns:
+            compression: "gz", "bz2" or "xz", or an empty string if the file
+            is not compressed.
+        """
+        extension = self.__file_path.split(".")[-1]
+        return extension if extension in self.COMPRESSION_OPENERS else ""
+
+    def open_input_file(self):
+        """Opens the file for reading as text, decompressing it while it is
+        read if it is compressed.
+
+        Returns:
+            input_file: the open file.
+        """
+        compression = self.get_compression()
+
+        if compression:
+            return self.COMPRESSION_OPENERS[compression](self.__file_path, "rt")
+        return open(self.__file_path, "r")
 
     def read_input_data(self) -> list:
         """Reads the file and put it into a variable.
@@ -51,27 +147,160 @@ class InputHandler:
             transactions =  self.read_csv_data()
         elif file_format == "json":
             transactions = self.read_json_data()
+        elif file_format in self.JSON_LINES_FORMATS:
+            transactions = self.read_ndjson_data()
         
         transactions = self.data_validation(transactions)
         return transactions
 
+    def iter_transactions(self):
+        """Reads, validates and yields the transactions one at a time.
+
+        Unlike read_input_data the whole file is never held in memory, so
+        the memory used does not grow with the size of the file. Each row
+        is turned into a Transaction so its amount is only parsed once.
+
+        Yields:
+            transaction: the next valid Transaction in the file.
+        """
+        if self.__parse_cache is None or self.__quarantine_path:
+            # The cache only keeps the valid transactions, so a read with a
+            # quarantine file parses the file to write the rejected rows.
+            yield from self.__parse_transactions()
+            return
+
+        key = self.__parse_cache.fingerprint(self.__file_path)
+        cached_transactions = self.__parse_cache.load(key)
+
+        if cached_transactions is not None:
+            yield from cached_transactions
+        else:
+            yield from self.__parse_cache.store(key, self.__parse_transactions())
+
+    def iter_transactions_parallel(self, workers: int = 0):
+        """Reads, validates and yields the transactions using several worker
+        processes.
+
+        A csv or json lines file is memory-mapped and split into chunks
+        that are parsed at the same time. The transactions are yielded in
+        file order and are the same as the ones from iter_transactions.
+        Compressed files, other formats and reads with a quarantine file
+        are done by iter_transactions.
+
+        Args:
+            workers (int): The number of worker processes. 0 uses one per CPU.
+
+        Yields:
+            transaction: the next valid Transaction in the file.
+        """
+        file_format = self.get_file_format()
+
+        if self.get_compression() or self.__quarantine_path:
+            # A compressed file cannot be split without decompressing it,
+            # and the workers do not write to the quarantine file.
+            iter_parallel = None
+        elif file_format == "csv":
+            iter_parallel = iter_csv_parallel
+        elif file_format in self.JSON_LINES_FORMATS:
+            iter_parallel = iter_ndjson_parallel
+        else:
+            iter_parallel = None
+
+        if iter_parallel is None:
+            yield from self.iter_transactions()
+            return
+
+        if not path.isfile(self.__file_path):
+            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+
+        yield from iter_parallel(self.__file_path, workers)
+
+    def iter_new_transactions(self, checkpoint_path: str, follow: bool = False,
+                              poll_interval: float = 1.0):
+        """Reads, validates and yields only the transactions added to an
+        append-only csv file since the last call.
+
+        The byte offset and row count reached are saved in a checkpoint
+        file. If the file was truncated or replaced by a new one it is read
+        from the start.
+
+        Args:
+            checkpoint_path (str): The path of the checkpoint file.
+            follow (bool): True to keep waiting for new rows at the end of
+                the file instead of stopping.
+            poll_interval (float): The seconds to wait before checking for
+                new rows when following.
+
+        Yields:
+            transaction: the next new valid Transaction in the file.
+        """
+        if self.get_file_format() != "csv" or self.get_compression():
+            raise ValueError(f"File: {self.__file_path} is not an uncompressed csv file.")
+
+        rows = iter_new_rows(self.__file_path, checkpoint_path, follow,
+                             poll_interval)
+        yield from self.__validate_rows(rows)
+
+    def iter_transaction_batches(self, batch_size: int = 1000):
+        """Reads, validates and yields the transactions in batches.
+
+        Args:
+            batch_size (int): The most transactions to put in one batch.
+
+        Yields:
+            batch: a list of at most batch_size valid transactions.
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+
+        batch = []
+
+        for transaction in self.iter_transactions():
+            batch.append(transaction)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def iter_input_rows(self):
+        """Yields the rows of the file one at a time without validating them.
+
+        Yields:
+            row: the next row in the file, or nothing if the file is not
+            a csv, json or json lines file.
+        """
+        file_format = self.get_file_format()
+
+        if file_format == "csv":
+            yield from self.iter_csv_data()
+        elif file_format == "json":
+            yield from self.iter_json_data()
+        elif file_format in self.JSON_LINES_FORMATS:
+            yield from self.iter_ndjson_data()
+
     def read_csv_data(self) -> list:
         """Reads the file and put it into a variable.
         
         Returns:
             transactions: the variable that holds the file.
         """
+        return list(self.iter_csv_data())
+
+    def iter_csv_data(self):
+        """Yields the rows of the csv file one at a time.
+
+        Yields:
+            row: a dictionary of the next row in the file.
+        """
         if not path.isfile(self.__file_path):
             raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
 
-        transactions = []
-
-        with open(self.__file_path, "r") as input_file:
+        with self.open_input_file() as input_file:
             reader = csv.DictReader(input_file)
             for row in reader:
-                transactions.append(row)
-            
-        return transactions
+                yield row
             
     def read_json_data(self) -> list:
         """Reads the file and put it into a variable.
@@ -79,16 +308,41 @@ class InputHandler:
         Returns:
             transactions: the variable that holds the file.
         """
-        # Research the json.load function so that you 
-        # understand the format of the data once it is
-        # placed into input_data
+        return list(self.iter_json_data())
+
+    def iter_json_data(self):
+        """Yields the objects of the json file one at a time as they are
+        parsed, so the whole file is never held in memory.
+
+        Yields:
+            row: a dictionary of the next object in the file's array.
+        """
         if not path.isfile(self.__file_path):
             raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
 
-        with open(self.__file_path, "r") as input_file:
-            transactions = json.load(input_file)
+        with self.open_input_file() as input_file:
+            yield from iter_json_array(input_file)
 
-        return transactions
+    def read_ndjson_data(self) -> list:
+        """Reads the json lines file and put it into a variable.
+
+        Returns:
+            transactions: the variable that holds the file.
+        """
+        return list(self.iter_ndjson_data())
+
+    def iter_ndjson_data(self):
+        """Yields the objects of the json lines file one at a time. Each line
+        of the file is one json object and blank lines are skipped.
+
+        Yields:
+            row: a dictionary of the next line in the file.
+        """
+        if not path.isfile(self.__file_path):
+            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+
+        with self.open_input_file() as input_file:
+            yield from iter_json_lines(input_file)
 
     def data_validation(self, file_transaction) -> list:
         """checks to see if the amount or the transaction type
@@ -102,23 +356,108 @@ class InputHandler:
         Returns:
             valid_transaction: A list of all valid transactions.
         """
-        transaction = file_transaction
-        valid_transaction = []
-
-        for transactions in transaction:
-            amount = transactions["Amount"]
-            is_a_digit = False
-            try:
-                amount = float(transactions["Amount"])
-                is_a_digit = True
-            except ValueError:
-                is_a_digit = False
-                
-            if is_a_digit:
-                if amount > 0: 
-                    transaction_type = ["deposit", "withdrawal", "transfer"]
-                    if transactions["Transaction type"] in transaction_type:
-                        valid_transaction.append(transactions)
-                        
-        return valid_transaction
-    
\ No newline at end of file
+        return [transaction for transaction in file_transaction
+                if self.is_valid_transaction(transaction)]
+
+    def is_valid_transaction(self, transaction: dict) -> bool:
+        """checks to see if the amount of one transaction is a number
+        greater than 0 and its transaction type is a valid value. The
+        checks are the ones parse_transaction does.
+
+        Args:
+            transaction (dict): The transaction to check.
+
+        Returns:
+            bool: True if the transaction is valid.
+        """
+        return self.parse_transaction(transaction) is not None
+
+    def parse_transaction(self, row: dict) -> Optional[Transaction]:
+        """Validates one row and builds a Transaction from it, parsing the
+        amount only once.
+
+        Args:
+            row (dict): The row to check.
+
+        Returns:
+            transaction: the Transaction, or None if the row is not valid.
+        """
+        try:
+            amount = float(row["Amount"])
+        except (TypeError, ValueError):
+            return None
+
+        # Written as not > 0 so a "nan" amount is not valid either.
+        if not amount > 0 or row["Transaction type"] not in self.VALID_TRANSACTION_TYPES:
+            return None
+
+        return Transaction.from_row(row, amount)
+
+    def __parse_transactions(self):
+        """Yields a Transaction for each valid row of the file."""
+        if self.get_file_format() == "csv":
+            yield from self.__parse_csv_transactions()
+        else:
+            yield from self.__validate_rows(self.iter_input_rows())
+
+    def __validate_rows(self, rows):
+        """Yields a Transaction for each valid row, rejecting the others."""
+        with self.__open_quarantine() as quarantine:
+            for row in rows:
+                transaction = self.parse_transaction(row)
+                if transaction is not None:
+                    yield transaction
+                else:
+                    self.__reject(rejection_reason(row), quarantine, row)
+
+    def __parse_csv_transactions(self):
+        """Yields a Transaction for each valid row of the csv file, building
+        them from the values of csv.reader with the column indexes worked
+        out once from the header and validating the rows in batches.
+        """
+        if not path.isfile(self.__file_path):
+            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+
+        with self.open_input_file() as input_file, \
+                self.__open_quarantine() as quarantine:
+            reader = csv.reader(input_file)
+            header = next(reader, None)
+            if header is None:
+                return
+
+            parse_batch = compile_batch_parser(header, self.parse_transaction) \
+                or (lambda batch: [self.__parse_or_reason(to_row(header, values))
+                                   for values in batch])
+            rows = (values for values in reader if values)
+            batches = iter(lambda: list(islice(rows, self.VALIDATION_BATCH_SIZE)), [])
+
+            for batch in batches:
+                for values, result in zip(batch, parse_batch(batch)):
+                    if type(result) is not str:
+                        yield result
+                    elif quarantine is None:
+                        self.__reject(result, None, None)
+                    else:
+                        self.__reject(result, quarantine, to_row(header, values))
+
+    def __open_quarantine(self):
+        """Opens the quarantine file for writing rejected rows.
+
+        Returns:
+            quarantine: a QuarantineWriter, or a context giving None if there
+            is no quarantine file.
+        """
+        if not self.__quarantine_path:
+            return nullcontext(None)
+        return QuarantineWriter(self.__quarantine_path)
+
+    def __reject(self, reason: str, quarantine: QuarantineWriter, row: dict) -> None:
+        """Counts a rejected row and writes it to the quarantine file."""
+        self.__rejected_count += 1
+        self.__rejection_counts[reason] = self.__rejection_counts.get(reason, 0) + 1
+        if quarantine is not None:
+            quarantine.write(row, reason)
+
+    def __parse_or_reason(self, row: dict):
+        """Gets the Transaction of a row, or its reason code if not valid."""
+        return self.parse_transaction(row) or rejection_reason(row)
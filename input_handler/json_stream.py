@@ -0,0 +1,175 @@
+"""This module is for reading the objects of a top-level json array one at a
+time so a json file does not need to be loaded into memory all at once.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""The number of characters read from the file at a time."""
+
+WHITESPACE = " \t\n\r"
+"""The characters json allows between values."""
+
+NUMBER_CHARACTERS = "0123456789+-.eE"
+"""The characters a json number can continue with."""
+
+MAX_CUT_OFF_LENGTH = 16
+"""The most characters of a literal, number or string escape that can be
+left at the end of the buffer when the rest of it is in the next chunk. A
+decode error further from the end than this is in the value itself."""
+
+
+def iter_json_array(input_file, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yields the values of the top-level json array in a file as they are
+    parsed.
+
+    Only the value being parsed and one chunk of the file are held in
+    memory. When a value does not fit in what has been read so far the
+    amount read is doubled, so a large value is still parsed in linear time.
+
+    Args:
+        input_file: A file opened in text mode.
+        chunk_size (int): The number of characters to read at a time.
+
+    Yields:
+        value: the next value of the array.
+
+    Raises:
+        json.JSONDecodeError: If the file is not a json array, or there is
+            anything other than whitespace after the array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    index = 0
+    read_size = chunk_size
+    at_end_of_file = False
+    started = False
+    expecting_value = True
+    value_count = 0
+
+    while True:
+        while index < len(buffer) and buffer[index] in WHITESPACE:
+            index += 1
+
+        if index == len(buffer):
+            if at_end_of_file:
+                raise json.JSONDecodeError("Expecting value", buffer, index)
+            chunk = input_file.read(read_size)
+            if not chunk:
+                at_end_of_file = True
+                if not started:
+                    raise json.JSONDecodeError("Expecting value", buffer, index)
+                continue
+            buffer = chunk
+            index = 0
+            continue
+
+        character = buffer[index]
+
+        if not started:
+            if character != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, index)
+            started = True
+            index += 1
+            continue
+
+        if character == "]" and (value_count == 0 or not expecting_value):
+            check_end_of_array(input_file, buffer, index + 1, chunk_size)
+            return
+
+        if not expecting_value:
+            if character != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter",
+                                           buffer, index)
+            expecting_value = True
+            index += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, index)
+            # A number or literal ending the buffer may continue in the
+            # next chunk, so it is only complete once more has been read.
+            is_complete = at_end_of_file or (
+                end < len(buffer) and not is_cut_off_number(value, buffer, end))
+        except json.JSONDecodeError as error:
+            # Only an error at the end of the buffer can be fixed by
+            # reading more, so a bad value is not read to the end of file.
+            if at_end_of_file or not is_cut_off_error(error, buffer):
+                raise
+            is_complete = False
+
+        if not is_complete:
+            chunk = input_file.read(read_size)
+            if not chunk:
+                at_end_of_file = True
+            buffer = buffer[index:] + chunk
+            index = 0
+            read_size = max(read_size, len(buffer))
+            continue
+
+        yield value
+        value_count += 1
+        expecting_value = False
+        index = end
+        read_size = chunk_size
+
+
+def is_cut_off_number(value, buffer: str, end: int) -> bool:
+    """Checks if a decoded number may continue past the end of the buffer,
+    e.g. "12" decoded from "12." when the next chunk starts with "5".
+
+    Args:
+        value: The decoded value.
+        buffer (str): The text it was decoded from.
+        end (int): The index in buffer just after the value.
+
+    Returns:
+        bool: True if value is a number and only characters a number can
+        continue with are left in the buffer.
+    """
+    return (type(value) in (int, float)
+            and not buffer[end:].strip(NUMBER_CHARACTERS))
+
+
+def is_cut_off_error(error: json.JSONDecodeError, buffer: str) -> bool:
+    """Checks if a decode error may only be because the value continues in
+    the next chunk.
+
+    Args:
+        error (json.JSONDecodeError): The error raw_decode raised.
+        buffer (str): The text being decoded.
+
+    Returns:
+        bool: True if the error is an unterminated string or is close
+        enough to the end of the buffer to be a cut off literal, number
+        or escape.
+    """
+    return (error.msg.startswith("Unterminated string")
+            or len(buffer) - error.pos <= MAX_CUT_OFF_LENGTH)
+
+
+def check_end_of_array(input_file, buffer: str, index: int,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """Checks there is only whitespace left after the end of the array, as
+    json.load does.
+
+    Args:
+        input_file: A file opened in text mode.
+        buffer (str): The text read from the file but not parsed yet.
+        index (int): The index in buffer just after the closing ']'.
+        chunk_size (int): The number of characters to read at a time.
+
+    Raises:
+        json.JSONDecodeError: If there is anything other than whitespace
+            after the array.
+    """
+    while buffer:
+        extra_data = buffer[index:].lstrip(WHITESPACE)
+        if extra_data:
+            raise json.JSONDecodeError("Extra data", buffer,
+                                       len(buffer) - len(extra_data))
+        buffer = input_file.read(chunk_size)
+        index = 0
@@ -0,0 +1,217 @@
+"""This module is for reading many input files at once, e.g. one file per
+branch per day. The files are read by several threads and their
+transactions are put together into one stream, merged by date if asked.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import glob
+import heapq
+import queue
+import threading
+import time
+from input_handler.input_handler import InputHandler
+
+END_OF_FILE = object()
+"""Put on a file's queue after its last batch."""
+
+
+def date_sort_key(transaction) -> tuple:
+    """Gets the key transactions are merged by date with. Transactions
+    without a Date sort after every dated one, so they are never compared
+    with a date string.
+
+    Args:
+        transaction: The Transaction to get the key of.
+
+    Returns:
+        key: a tuple of whether the Date is missing and the Date.
+    """
+    date = transaction.date
+    return (not date, date or "")
+
+
+class MultiInputHandler:
+    """This class is for reading the transactions of many input files as one
+    stream of transactions.
+    """
+
+    BATCH_SIZE = 1000
+    """The number of transactions a reader thread hands over at a time."""
+
+    QUEUE_SIZE = 4
+    """The most batches waiting on each file's queue."""
+
+    def __init__(self, file_paths, workers: int = 4,
+                 merge_by_date: bool = False, cache_directory: str = ""):
+        """Initializes a new instance of the MultiInputHandler class.
+
+        Args:
+            file_paths: A glob pattern, or a list of paths and glob patterns.
+            workers (int): The most files read at the same time. When
+                merge_by_date is True every file is read at the same time,
+                because the merge needs the next transaction of each file.
+            merge_by_date (bool): True to merge the files into one stream
+                ordered by Date. Each file must already be in Date order.
+            cache_directory (str): The parse cache directory passed to each
+                InputHandler. Empty for no cache.
+        """
+        self.__file_paths = self.expand_file_paths(file_paths)
+        self.__workers = max(1, workers)
+        self.__merge_by_date = merge_by_date
+        self.__cache_directory = cache_directory
+        self.__file_reports = []
+
+    @property
+    def file_paths(self) -> list:
+        """Gets the paths of the files that are read.
+
+        Returns:
+            __file_paths: The list of file paths in the order they are read.
+        """
+        return self.__file_paths
+
+    @property
+    def file_reports(self) -> list:
+        """Gets a report for each file read by the last call of
+        iter_transactions.
+
+        Each report is a dictionary with the keys file_path, transactions,
+        rejected, seconds and transactions_per_second. seconds is the time
+        from opening the file to reading its last row.
+
+        Returns:
+            __file_reports: The list of reports in the order of file_paths.
+        """
+        return self.__file_reports
+
+    @staticmethod
+    def expand_file_paths(file_paths) -> list:
+        """Expands glob patterns into the paths they match.
+
+        Args:
+            file_paths: A glob pattern, or a list of paths and glob patterns.
+
+        Returns:
+            paths: the sorted matches of each pattern. A pattern that matches
+            nothing is kept as it is, so reading it raises FileNotFoundError.
+        """
+        if isinstance(file_paths, str):
+            file_paths = [file_paths]
+
+        paths = []
+
+        for file_path in file_paths:
+            paths.extend(sorted(glob.glob(file_path)) or [file_path])
+
+        return paths
+
+    def iter_transactions(self):
+        """Reads, validates and yields the transactions of every file.
+
+        Without merge_by_date the files are yielded one after the other in
+        the order of file_paths.
+
+        Yields:
+            transaction: the next valid Transaction.
+        """
+        self.__file_reports = [{"file_path": file_path,
+                                "transactions": 0,
+                                "rejected": 0,
+                                "seconds": 0.0,
+                                "transactions_per_second": 0.0}
+                               for file_path in self.__file_paths]
+        queues = [queue.Queue(self.QUEUE_SIZE) for _ in self.__file_paths]
+        stop = threading.Event()
+        workers = len(self.__file_paths) if self.__merge_by_date \
+            else self.__workers
+        threads = [threading.Thread(target=self.__read_files,
+                                    args=(queues, index, workers, stop),
+                                    daemon=True)
+                   for index in range(min(workers, len(self.__file_paths)))]
+
+        for thread in threads:
+            thread.start()
+
+        streams = [self.__iter_queue(file_queue) for file_queue in queues]
+
+        try:
+            if self.__merge_by_date:
+                yield from heapq.merge(*streams, key=date_sort_key)
+            else:
+                for stream in streams:
+                    yield from stream
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def __read_files(self, queues: list, first: int, step: int,
+                     stop: threading.Event) -> None:
+        """Reads every step-th file starting at first, putting its
+        transactions on its queue in batches. This runs in a reader thread.
+        """
+        for index in range(first, len(self.__file_paths), step):
+            if not self.__read_file(index, queues[index], stop):
+                return
+
+    def __read_file(self, index: int, file_queue: queue.Queue,
+                    stop: threading.Event) -> bool:
+        """Reads one file onto its queue and fills in its report.
+
+        Returns:
+            bool: False if the reading was stopped.
+        """
+        report = self.__file_reports[index]
+        input_handler = InputHandler(report["file_path"], self.__cache_directory)
+        started = time.perf_counter()
+        batch = []
+
+        try:
+            for transaction in input_handler.iter_transactions():
+                batch.append(transaction)
+                if len(batch) == self.BATCH_SIZE:
+                    if not self.__put(file_queue, batch, stop):
+                        return False
+                    report["transactions"] += len(batch)
+                    batch = []
+        except Exception as error:
+            return self.__put(file_queue, error, stop)
+
+        report["transactions"] += len(batch)
+        report["rejected"] = input_handler.rejected_count
+        report["seconds"] = time.perf_counter() - started
+        if report["seconds"] > 0:
+            report["transactions_per_second"] = \
+                report["transactions"] / report["seconds"]
+
+        if batch and not self.__put(file_queue, batch, stop):
+            return False
+        return self.__put(file_queue, END_OF_FILE, stop)
+
+    @staticmethod
+    def __put(file_queue: queue.Queue, item, stop: threading.Event) -> bool:
+        """Puts an item on a queue, waiting while it is full.
+
+        Returns:
+            bool: False if stop was set while waiting.
+        """
+        while not stop.is_set():
+            try:
+                file_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    @staticmethod
+    def __iter_queue(file_queue: queue.Queue):
+        """Yields the transactions put on a file's queue until its end."""
+        while True:
+            item = file_queue.get()
+            if item is END_OF_FILE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
@@ -0,0 +1,274 @@
+"""This module is for reading a large csv or json lines file with several
+processes. The file is memory-mapped and split into byte ranges that end on
+a newline outside any quoted field, and each range is parsed and validated
+in its own worker process.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import csv
+import io
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from input_handler.csv_row_parser import compile_batch_parser, to_row
+
+MIN_CHUNK_SIZE = 1024 * 1024
+"""The smallest byte range given to a worker, so small files are not split
+into more chunks than is worth sending to another process."""
+
+CHUNKS_PER_WORKER = 4
+"""How many byte ranges each worker gets, so a slow chunk does not leave the
+other workers idle at the end."""
+
+ENCODING = "utf-8"
+"""The encoding of the csv files."""
+
+QUOTE = b'"'
+"""The quote character of the csv files."""
+
+
+def split_byte_ranges(mapped_file, start: int, chunk_count: int,
+                      quote: bytes = None) -> list:
+    """Splits the bytes from start to the end of the file into ranges that
+    each end just after a newline.
+
+    Args:
+        mapped_file (mmap.mmap): The memory-mapped file.
+        start (int): The offset of the first byte to split.
+        chunk_count (int): The number of ranges wanted.
+        quote (bytes): The quote character of a csv file, so no range ends
+            on a newline inside a quoted field, or None to split on any
+            newline.
+
+    Returns:
+        byte_ranges: a list of (start, end) tuples in file order.
+    """
+    size = len(mapped_file)
+    chunk_size = max(1, (size - start) // max(1, chunk_count))
+    byte_ranges = []
+    # An escaped quote is two quotes, so a newline is outside any quoted
+    # field when the number of quotes before it is even.
+    counted = start
+    quoted = False
+
+    while start < size:
+        newline = mapped_file.find(b"\n", min(start + chunk_size, size) - 1)
+        if quote is not None:
+            while newline != -1:
+                quoted ^= count_bytes(mapped_file, quote, counted, newline) % 2 == 1
+                counted = newline
+                if not quoted:
+                    break
+                newline = mapped_file.find(b"\n", newline + 1)
+        end = size if newline == -1 else newline + 1
+        byte_ranges.append((start, end))
+        start = end
+
+    return byte_ranges
+
+
+def count_bytes(mapped_file, value: bytes, start: int, end: int) -> int:
+    """Counts a byte in a part of a memory-mapped file, copying at most
+    MIN_CHUNK_SIZE bytes at a time.
+
+    Args:
+        mapped_file (mmap.mmap): The memory-mapped file.
+        value (bytes): The byte to count.
+        start (int): The offset of the first byte to look at.
+        end (int): The offset just after the last byte to look at.
+
+    Returns:
+        count: the number of times value is in the part.
+    """
+    count = 0
+    for piece_start in range(start, end, MIN_CHUNK_SIZE):
+        count += mapped_file[piece_start:min(end, piece_start + MIN_CHUNK_SIZE)].count(value)
+    return count
+
+
+def read_header(mapped_file) -> tuple:
+    """Reads the header row of a memory-mapped csv file.
+
+    Args:
+        mapped_file (mmap.mmap): The memory-mapped file.
+
+    Returns:
+        (header, start): the list of field names and the offset of the
+        first byte after the header row.
+    """
+    newline = mapped_file.find(b"\n")
+    start = len(mapped_file) if newline == -1 else newline + 1
+    line = mapped_file[:start].decode(ENCODING)
+    header = next(csv.reader([line]), [])
+    return header, start
+
+
+def read_byte_range(file_path: str, start: int, end: int) -> str:
+    """Reads and decodes one byte range of a file through a memory map.
+
+    Args:
+        file_path (str): The path of the file.
+        start (int): The offset of the first byte of the range.
+        end (int): The offset just after the last byte of the range.
+
+    Returns:
+        text: the decoded text of the range.
+    """
+    with open(file_path, "rb") as input_file:
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            return mapped_file[start:end].decode(ENCODING)
+
+
+def parse_rows(file_path: str, rows) -> list:
+    """Validates rows and turns the valid ones into Transactions.
+
+    Args:
+        file_path (str): The path of the file the rows are from.
+        rows: An iterable of row dictionaries.
+
+    Returns:
+        transactions: a list of the valid Transactions.
+    """
+    # Imported here so the module does not import InputHandler at load time.
+    from input_handler.input_handler import InputHandler
+
+    transactions = map(InputHandler(file_path).parse_transaction, rows)
+    return [transaction for transaction in transactions
+            if transaction is not None]
+
+
+def parse_csv_chunk(file_path: str, start: int, end: int, header: list) -> list:
+    """Parses and validates the rows in one byte range of a csv file. This
+    function runs in a worker process.
+
+    Args:
+        file_path (str): The path of the csv file.
+        start (int): The offset of the first byte of the range.
+        end (int): The offset just after the last byte of the range.
+        header (list): The field names from the header row.
+
+    Returns:
+        transactions: a list of the valid Transactions in the range.
+    """
+    # Imported here so the module does not import InputHandler at load time.
+    from input_handler.input_handler import InputHandler
+
+    text = read_byte_range(file_path, start, end)
+    parse_transaction = InputHandler(file_path).parse_transaction
+    parse_batch = compile_batch_parser(header, parse_transaction) \
+        or (lambda batch: [parse_transaction(to_row(header, values))
+                           for values in batch])
+    results = parse_batch([values for values in csv.reader(io.StringIO(text))
+                           if values])
+
+    # Rows that are not valid are None or their reason code.
+    return [result for result in results
+            if result is not None and type(result) is not str]
+
+
+def parse_ndjson_chunk(file_path: str, start: int, end: int) -> list:
+    """Parses and validates the lines in one byte range of a newline
+    delimited json file. This function runs in a worker process.
+
+    Args:
+        file_path (str): The path of the json lines file.
+        start (int): The offset of the first byte of the range.
+        end (int): The offset just after the last byte of the range.
+
+    Returns:
+        transactions: a list of the valid Transactions in the range.
+    """
+    text = read_byte_range(file_path, start, end)
+    return parse_rows(file_path, iter_json_lines(text.splitlines()))
+
+
+def iter_json_lines(lines):
+    """Yields the json value on each line, skipping blank lines.
+
+    Args:
+        lines: An iterable of lines of text.
+
+    Yields:
+        value: the value parsed from the next line that is not blank.
+    """
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_csv_parallel(file_path: str, workers: int = 0):
+    """Yields the valid transactions of a csv file in file order, parsing the
+    file with a pool of worker processes.
+
+    Rows may contain quoted newlines, as the file is only split on
+    newlines outside quoted fields.
+
+    Args:
+        file_path (str): The path of the csv file.
+        workers (int): The number of worker processes. 0 uses one per CPU.
+
+    Yields:
+        transaction: the next valid Transaction in the file.
+    """
+    yield from iter_chunks_parallel(file_path, workers, parse_csv_chunk,
+                                    has_header=True, quote=QUOTE)
+
+
+def iter_ndjson_parallel(file_path: str, workers: int = 0):
+    """Yields the valid transactions of a newline delimited json file in file
+    order, parsing the file with a pool of worker processes.
+
+    Args:
+        file_path (str): The path of the json lines file.
+        workers (int): The number of worker processes. 0 uses one per CPU.
+
+    Yields:
+        transaction: the next valid Transaction in the file.
+    """
+    yield from iter_chunks_parallel(file_path, workers, parse_ndjson_chunk,
+                                    has_header=False)
+
+
+def iter_chunks_parallel(file_path: str, workers: int, parse_chunk,
+                         has_header: bool, quote: bytes = None):
+    """Splits a file into byte ranges and yields the Transactions that
+    parse_chunk returns for each one, in file order.
+
+    Args:
+        file_path (str): The path of the file.
+        workers (int): The number of worker processes. 0 uses one per CPU.
+        parse_chunk: A module level function taking the file path, the start
+            and end of a range and, if has_header, the header.
+        has_header (bool): True if the first line is a csv header row.
+        quote (bytes): The quote character passed to split_byte_ranges.
+
+    Yields:
+        transaction: the next valid Transaction in the file.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with open(file_path, "rb") as input_file:
+        if os.fstat(input_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            header, start = read_header(mapped_file) if has_header else (None, 0)
+            chunk_count = min(workers * CHUNKS_PER_WORKER,
+                              max(1, (len(mapped_file) - start) // MIN_CHUNK_SIZE))
+            byte_ranges = split_byte_ranges(mapped_file, start, chunk_count, quote)
+
+    arguments = (header,) if has_header else ()
+
+    if len(byte_ranges) <= 1 or workers == 1:
+        for range_start, range_end in byte_ranges:
+            yield from parse_chunk(file_path, range_start, range_end, *arguments)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_chunk, file_path, range_start,
+                                   range_end, *arguments)
+                   for range_start, range_end in byte_ranges]
+        for future in futures:
+            yield from future.result()
@@ -0,0 +1,201 @@
+"""This module is for keeping a binary copy of the validated transactions of
+an input file, so the next run that reads the same file can load them
+instead of parsing and validating the file again.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import hashlib
+import os
+import pickle
+import tempfile
+from os import path
+from transaction.transaction import Transaction
+
+CACHE_FORMAT_VERSION = 2
+"""Changing this makes every cache file written before it a miss."""
+
+MAGIC = b"FDPCACHE"
+"""The bytes every cache file starts with."""
+
+BATCH_SIZE = 10000
+"""The number of transactions pickled together."""
+
+HASH_BLOCK_SIZE = 1024 * 1024
+"""The number of bytes hashed at a time."""
+
+
+class ParseCache:
+    """A directory of binary cache files of validated transactions.
+
+    Each file is named after a fingerprint of the input file's path, size,
+    modification time and contents. When the directory grows past
+    max_bytes the least recently used files are deleted.
+    """
+
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+    """The default size limit of the cache directory."""
+
+    def __init__(self, cache_directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initializes a new instance of the ParseCache class.
+
+        Args:
+            cache_directory (str): The directory the cache files are kept in.
+                It is created if it does not exist.
+            max_bytes (int): The most bytes the cache files can use.
+        """
+        self.__cache_directory = cache_directory
+        self.__max_bytes = max_bytes
+        os.makedirs(cache_directory, exist_ok=True)
+
+    @property
+    def cache_directory(self) -> str:
+        """Gets the directory the cache files are kept in."""
+        return self.__cache_directory
+
+    @property
+    def max_bytes(self) -> int:
+        """Gets the most bytes the cache files can use."""
+        return self.__max_bytes
+
+    def fingerprint(self, file_path: str, *options) -> str:
+        """Gets the cache key of an input file.
+
+        The key is made of a hash of the absolute path followed by a hash of
+        the size, modification time, contents and the options, so every
+        version of one file shares the same prefix.
+
+        Args:
+            file_path (str): The input file.
+            *options: Anything else that changes how the file is parsed.
+
+        Returns:
+            key: the cache key.
+        """
+        absolute_path = path.abspath(file_path)
+        stat = os.stat(absolute_path)
+        content_hash = hashlib.blake2b(digest_size=16)
+
+        with open(absolute_path, "rb") as input_file:
+            for block in iter(lambda: input_file.read(HASH_BLOCK_SIZE), b""):
+                content_hash.update(block)
+
+        version_hash = hashlib.blake2b(digest_size=16)
+        version_hash.update(repr((CACHE_FORMAT_VERSION, stat.st_size,
+                                  stat.st_mtime_ns, options)).encode())
+        version_hash.update(content_hash.digest())
+        path_hash = hashlib.blake2b(absolute_path.encode(), digest_size=8)
+
+        return f"{path_hash.hexdigest()}-{version_hash.hexdigest()}"
+
+    def load(self, key: str):
+        """Gets the cached transactions for a key.
+
+        Args:
+            key (str): The cache key from fingerprint.
+
+        Returns:
+            transactions: a generator of the cached Transactions, or None if
+            the key is not in the cache.
+        """
+        cache_path = self.__cache_path(key)
+
+        try:
+            cache_file = open(cache_path, "rb")
+        except FileNotFoundError:
+            return None
+
+        if cache_file.read(len(MAGIC)) != MAGIC:
+            cache_file.close()
+            os.remove(cache_path)
+            return None
+
+        # Mark the file as recently used for the eviction order.
+        os.utime(cache_path)
+        return self.__iter_cache_file(cache_file)
+
+    def store(self, key: str, transactions):
+        """Yields the transactions while writing them to the cache.
+
+        The cache file is only kept if every transaction is consumed, and
+        older versions of the same input file are deleted.
+
+        Args:
+            key (str): The cache key from fingerprint.
+            transactions: An iterable of Transactions.
+
+        Yields:
+            transaction: each Transaction from transactions.
+        """
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.__cache_directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as cache_file:
+                cache_file.write(MAGIC)
+                batch = []
+                for transaction in transactions:
+                    batch.append(transaction.to_tuple())
+                    if len(batch) == BATCH_SIZE:
+                        pickle.dump(batch, cache_file, pickle.HIGHEST_PROTOCOL)
+                        batch = []
+                    yield transaction
+                if batch:
+                    pickle.dump(batch, cache_file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(None, cache_file, pickle.HIGHEST_PROTOCOL)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        self.remove_versions(key)
+        os.replace(temporary_path, self.__cache_path(key))
+        self.evict()
+
+    def remove_versions(self, key: str) -> None:
+        """Deletes the cache files of every version of the key's input file.
+
+        Args:
+            key (str): A cache key from fingerprint.
+        """
+        prefix = key.split("-")[0] + "-"
+
+        for file_name in os.listdir(self.__cache_directory):
+            if file_name.startswith(prefix) and file_name.endswith(".cache"):
+                os.remove(path.join(self.__cache_directory, file_name))
+
+    def evict(self) -> None:
+        """Deletes the least recently used cache files until the cache is no
+        bigger than max_bytes.
+        """
+        entries = []
+
+        for file_name in os.listdir(self.__cache_directory):
+            if file_name.endswith(".cache"):
+                stat = os.stat(path.join(self.__cache_directory, file_name))
+                entries.append((stat.st_mtime_ns, stat.st_size, file_name))
+
+        total_bytes = sum(size for _, size, _ in entries)
+
+        for _, size, file_name in sorted(entries):
+            if total_bytes <= self.__max_bytes:
+                break
+            os.remove(path.join(self.__cache_directory, file_name))
+            total_bytes -= size
+
+    def __cache_path(self, key: str) -> str:
+        """Gets the path of the cache file for a key."""
+        return path.join(self.__cache_directory, f"{key}.cache")
+
+    def __iter_cache_file(self, cache_file):
+        """Yields the Transactions in an open cache file, then closes it."""
+        with cache_file:
+            while True:
+                try:
+                    batch = pickle.load(cache_file)
+                except EOFError:
+                    raise ValueError(f"Cache file: {cache_file.name} is incomplete.") from None
+                if batch is None:
+                    return
+                for fields in batch:
+                    yield Transaction(*fields)
@@ -0,0 +1,163 @@
+"""This module is for validating transactions a column at a time and for
+writing the rows that are not valid to a quarantine file with the reason
+they were rejected.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import csv
+from transaction.transaction import Transaction, TRANSACTION_TYPES
+
+NON_NUMERIC_AMOUNT = "NON_NUMERIC_AMOUNT"
+"""The reason code of a row whose amount is not a number."""
+
+NON_POSITIVE_AMOUNT = "NON_POSITIVE_AMOUNT"
+"""The reason code of a row whose amount is 0 or less."""
+
+INVALID_TRANSACTION_TYPE = "INVALID_TRANSACTION_TYPE"
+"""The reason code of a row whose transaction type is not valid."""
+
+
+def to_float(value):
+    """Converts one value to a float.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        amount: the float, or None if the value is not a number.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_floats(values: list) -> list:
+    """Converts a column of values to floats in one pass. Only when the column
+    has a value that is not a number is each value converted on its own.
+
+    Args:
+        values (list): The values to convert.
+
+    Returns:
+        amounts: a list of the floats, with None for values that are not
+        numbers.
+    """
+    try:
+        return list(map(float, values))
+    except (TypeError, ValueError):
+        pass
+
+    amounts = []
+    append = amounts.append
+
+    for value in values:
+        try:
+            append(float(value))
+        except (TypeError, ValueError):
+            append(None)
+
+    return amounts
+
+
+def to_transaction_types(values: list) -> list:
+    """Looks up a column of transaction type strings in one pass.
+
+    Args:
+        values (list): The transaction type strings.
+
+    Returns:
+        transaction_types: a list of the TransactionType members, with None
+        for values that are not valid types.
+    """
+    get_type = TRANSACTION_TYPES.get
+    return [get_type(value) if isinstance(value, str) else None
+            for value in values]
+
+
+def rejection_reason(row: dict) -> str:
+    """Gets the reason a row is not a valid transaction.
+
+    Args:
+        row (dict): The row with the column names as keys.
+
+    Returns:
+        reason: the reason code, or an empty string if the row is valid.
+    """
+    transaction_types = to_transaction_types([row.get("Transaction type")])
+    return get_reason(to_float(row.get("Amount")), transaction_types[0])
+
+
+def get_reason(amount, transaction_type) -> str:
+    """Gets the reason a row with a converted amount and transaction type is
+    not a valid transaction.
+
+    Args:
+        amount: The amount from to_floats.
+        transaction_type: The transaction type from to_transaction_types.
+
+    Returns:
+        reason: the reason code, or an empty string if the row is valid.
+    """
+    if amount is None or amount != amount:
+        return NON_NUMERIC_AMOUNT
+    if amount <= 0:
+        return NON_POSITIVE_AMOUNT
+    if transaction_type is None:
+        return INVALID_TRANSACTION_TYPE
+    return ""
+
+
+class QuarantineWriter:
+    """This class writes rejected rows to a csv file as they are found, with a
+    column for the reason each row was rejected.
+    """
+
+    REASON_COLUMN = "Rejection reason"
+    """The name of the column the reason code is written to."""
+
+    def __init__(self, file_path: str):
+        """Initializes a new instance of the QuarantineWriter class and opens
+        the quarantine file.
+
+        Args:
+            file_path (str): The path of the quarantine file.
+        """
+        self.__output_file = open(file_path, "w", newline="")
+        self.__writer = csv.writer(self.__output_file)
+        self.__writer.writerow(list(Transaction.COLUMNS) + [self.REASON_COLUMN])
+        self.__reason_counts = {}
+
+    @property
+    def reason_counts(self) -> dict:
+        """Gets the number of rows written for each reason code.
+
+        Returns:
+            __reason_counts: The dictionary of counts by reason code.
+        """
+        return self.__reason_counts
+
+    def write(self, row: dict, reason: str = "") -> None:
+        """Writes one rejected row.
+
+        Args:
+            row (dict): The row with the column names as keys.
+            reason (str): The reason code. It is worked out from the row if
+                it is not given.
+        """
+        reason = reason or rejection_reason(row)
+        self.__reason_counts[reason] = self.__reason_counts.get(reason, 0) + 1
+        self.__writer.writerow([row.get(column) for column in Transaction.COLUMNS]
+                               + [reason])
+
+    def close(self) -> None:
+        """Closes the quarantine file."""
+        self.__output_file.close()
+
+    def __enter__(self) -> "QuarantineWriter":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
@@ -8,21 +8,69 @@ Key Functions:
 - Processes financial records for analysis
 - Generates detailed reports and statistics
 - Logs processing activities and important events
+
+The optional trackers each add work for every transaction, so they are off
+unless turned on with their command line flag, e.g.
+python main.py input/input_data.csv --distributions --rollups
 """
 
 __author__ = "Thomas Littleton, Karmjeet Kaur, Sandeep Kaur"
 __version__ = "1.0."
 
+import argparse
+import logging
+import sys
 from os import path
-from input_handler.input_handler import InputHandler
+from input_handler.multi_input_handler import MultiInputHandler
 from data_processor.data_processor import DataProcessor
+from data_processor.fx_rates import FxRateTable
 from output_handler.output_handler import OutputHandler
 
-def main() -> None:
+def parse_arguments(arguments: list) -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Args:
+        arguments: The command line arguments after the program name.
+
+    Returns:
+        The input file paths and the trackers to turn on.
+    """
+    parser = argparse.ArgumentParser(description="Process financial transactions.")
+    parser.add_argument("input_file_paths", nargs="*",
+                        help="paths or glob patterns of the input files")
+    parser.add_argument("--distributions", action="store_true",
+                        help="write amount distributions and currency statistics")
+    parser.add_argument("--unique-accounts", action="store_true",
+                        help="count unique accounts and write the daily counts")
+    parser.add_argument("--rollups", action="store_true",
+                        help="write monthly rollups of each account")
+    parser.add_argument("--currency-balances", action="store_true",
+                        help="write the balances of each account in each currency, "
+                             "converted with input/fx_rates.csv when it exists")
+    parser.add_argument("--transfer-graph", action="store_true",
+                        help="write the transfers of each account")
+    return parser.parse_args(arguments)
+
+
+def main(input_file_paths: list = None, track_distributions: bool = False,
+         track_unique_accounts: bool = False, track_rollups: bool = False,
+         track_currency_balances: bool = False,
+         track_transfer_graph: bool = False) -> None:
     """Main function to read input data, process it, and write the 
     results to output files.
 
-    - Reads input data from a CSV file using InputHandler.
+    Args:
+        input_file_paths: Paths or glob patterns of the input files
+            (default: input/input_data.csv).
+        track_distributions: True to write the amount distributions and
+            the currency statistics.
+        track_unique_accounts: True to count unique accounts and write the
+            daily unique accounts.
+        track_rollups: True to write the monthly account rollups.
+        track_currency_balances: True to write the currency balances.
+        track_transfer_graph: True to write the transfer graph.
+
+    - Reads input data from CSV files using MultiInputHandler.
     - Processes the data using DataProcessor.
     - Writes the processed data to CSV and JSON files using 
     OutputHandler.
@@ -35,30 +83,60 @@ def main() -> None:
 
     # Joins the current directory, the relative path to the input folder 
     # and the filename to create a complete path to the file.
-    input_file_path = path.join(current_directory, "input/input_data.csv")
+    if not input_file_paths:
+        input_file_paths = [path.join(current_directory, "input/input_data.csv")]
 
-    input_handler = InputHandler(input_file_path)
-    transactions = input_handler.read_input_data()
+    input_handler = MultiInputHandler(input_file_paths)
+    # Stream the transactions so the whole file is never held in memory.
+    transactions = input_handler.iter_transactions()
 
     # Create log file path
     log_file_path = path.join(current_directory, "output/fdp_team_1.log")  # Replace 1 with your team number
 
+    # Convert balances to CAD when a local FX rate file is there.
+    fx_rates_path = path.join(current_directory, "input/fx_rates.csv")
+    fx_rates = FxRateTable.from_csv(fx_rates_path, "CAD") \
+        if track_currency_balances and path.exists(fx_rates_path) else None
+
     # Initialize DataProcessor with logging configuration
 
     data_processor = DataProcessor(transactions,
     logging_level="INFO",
         logging_format="%(asctime)s - %(levelname)s - %(message)s",
-        log_file=log_file_path
+        log_file=log_file_path,
+        track_distributions=track_distributions,
+        unique_account_error=0.01 if track_unique_accounts else None,
+        track_rollups=track_rollups,
+        track_currency_balances=track_currency_balances,
+        fx_rates=fx_rates,
+        track_transfer_graph=track_transfer_graph
     )
     processed_data = data_processor.process_data()
 
+    if data_processor.unresolved_transfer_count:
+        logging.info("%d transfers have no Destination account",
+                     data_processor.unresolved_transfer_count)
+
+    for report in input_handler.file_reports:
+        logging.info("Read %s: %d transactions, %d rejected, %.0f per second",
+                     report["file_path"], report["transactions"],
+                     report["rejected"], report["transactions_per_second"])
 
     account_summaries = processed_data["account_summaries"]
     suspicious_transactions = processed_data["suspicious_transactions"]
     transaction_statistics = processed_data["transaction_statistics"]
     output_handler = OutputHandler(account_summaries, 
                                    suspicious_transactions, 
-                                   transaction_statistics)
+                                   transaction_statistics,
+                                   data_processor.suspicious_rule_names,
+                                   amount_distributions=data_processor.amount_distributions,
+                                   unique_accounts=data_processor.unique_accounts,
+                                   rollups=data_processor.rollups,
+                                   currency_balances=data_processor.currency_balances,
+                                   reporting_balances=data_processor.reporting_balances,
+                                   reporting_currency=fx_rates.reporting_currency
+                                   if fx_rates is not None else None,
+                                   transfer_graph=data_processor.transfer_graph)
 
     # Joins the current directory, the relative path to the output 
     # folder and the filename to create a complete path to each of the 
@@ -67,7 +145,12 @@ def main() -> None:
     filenames = [
         "account_summaries", 
         "suspicious_transactions", 
-        "transaction_statistics"
+        "transaction_statistics",
+        "currency_statistics",
+        "daily_unique_accounts",
+        "monthly_account_rollups",
+        "currency_balances",
+        "transfer_graph"
     ]
 
     file_path = {}
@@ -79,6 +162,16 @@ def main() -> None:
     output_handler.write_account_summaries_to_csv(file_path["account_summaries"])
     output_handler.write_suspicious_transactions_to_csv(file_path["suspicious_transactions"])
     output_handler.write_transaction_statistics_to_csv(file_path["transaction_statistics"])
+    if track_distributions:
+        output_handler.write_currency_statistics_to_csv(file_path["currency_statistics"])
+    if track_unique_accounts:
+        output_handler.write_daily_unique_accounts_to_csv(file_path["daily_unique_accounts"])
+    if track_rollups:
+        output_handler.write_account_rollups_to_csv(file_path["monthly_account_rollups"])
+    if track_currency_balances:
+        output_handler.write_currency_balances_to_csv(file_path["currency_balances"])
+    if track_transfer_graph:
+        output_handler.write_transfer_graph_to_csv(file_path["transfer_graph"])
 
 # Add filtering functionality here
     filtered_filename = "fdp_filter_team_1.csv"  # Replace 1 with your team number
@@ -95,4 +188,10 @@ def main() -> None:
     )
 
 if __name__ == "__main__":
-    main()
+    arguments = parse_arguments(sys.argv[1:])
+    main(arguments.input_file_paths,
+         track_distributions=arguments.distributions,
+         track_unique_accounts=arguments.unique_accounts,
+         track_rollups=arguments.rollups,
+         track_currency_balances=arguments.currency_balances,
+         track_transfer_graph=arguments.transfer_graph)
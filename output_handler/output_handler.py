@@ -7,6 +7,8 @@ __author__ = "Karmjeet Kaur"
 __version__ = "1.0"
 
 import csv
+from data_processor.account_store import AccountSummaryStore
+from transaction.money import format_minor_units
 
 class OutputHandler:
     """A class responsible for writting of processed financial data to CSV files.
@@ -17,18 +19,56 @@ class OutputHandler:
 
     """
 
+    DISTRIBUTION_COLUMNS = ["Std dev", "Min", "Max", "P50", "P95", "P99"]
+    """The columns written for an amount distribution."""
+
     def __init__(self, account_summaries: dict, 
                        suspicious_transactions: list, 
-                       transaction_statistics: dict):
+                       transaction_statistics: dict,
+                       suspicious_rule_names: list = None,
+                       minor_unit_scale: int = None,
+                       amount_distributions: dict = None,
+                       unique_accounts: dict = None,
+                       rollups=None,
+                       currency_balances: dict = None,
+                       reporting_balances: dict = None,
+                       reporting_currency: str = None,
+                       transfer_graph=None):
         """Initialize  the OutputHandler with processed financial data.
         Args:
            account_summaries: Dictionary of account financial summaries
            suspicious_trnsactions: List of flagged transactions
            transaction_statistics: Dictionary of transaction type statistics
+           suspicious_rule_names: List of the rule that flagged each
+               suspicious transaction, or None to leave out the Rule column
+           minor_unit_scale: Decimal places of the minor units the balances
+               and totals are in (e.g. 2 for DataProcessor's minor_units
+               money mode), or None if they are plain numbers
+           amount_distributions: DataProcessor.amount_distributions, or None
+               to leave out the distribution columns
+           unique_accounts: DataProcessor.unique_accounts, or None to leave
+               out the Unique accounts column
+           rollups: DataProcessor.rollups, or None if they are not tracked
+           currency_balances: DataProcessor.currency_balances, or None if
+               they are not tracked
+           reporting_balances: DataProcessor.reporting_balances, or None to
+               leave out the reporting currency column
+           reporting_currency: Currency of the reporting_balances
+           transfer_graph: DataProcessor.transfer_graph, or None if it is
+               not tracked
         """
         self.__account_summaries = account_summaries
         self.__suspicious_transactions = suspicious_transactions
         self.__transaction_statistics = transaction_statistics
+        self.__suspicious_rule_names = suspicious_rule_names
+        self.__minor_unit_scale = minor_unit_scale
+        self.__amount_distributions = amount_distributions
+        self.__unique_accounts = unique_accounts
+        self.__rollups = rollups
+        self.__currency_balances = currency_balances
+        self.__reporting_balances = reporting_balances
+        self.__reporting_currency = reporting_currency
+        self.__transfer_graph = transfer_graph
     
     @property
     def account_summaries(self) -> dict:
@@ -75,12 +115,20 @@ class OutputHandler:
                 "Total Withdrawals"
             ])
 
-            for account_number, summary in self.__account_summaries.items():
+            if isinstance(self.__account_summaries, AccountSummaryStore):
+                # Read the totals straight from the store's arrays.
+                rows = self.__account_summaries.rows()
+            else:
+                rows = ((account_number, summary["balance"],
+                         summary["total_deposits"], summary["total_withdrawals"])
+                        for account_number, summary in self.__account_summaries.items())
+
+            for account_number, balance, total_deposits, total_withdrawals in rows:
                 writer.writerow([
                     account_number,
-                    summary["balance"],
-                    summary["total_deposits"],
-                    summary["total_withdrawals"]
+                    self.__format_amount(balance),
+                    self.__format_amount(total_deposits),
+                    self.__format_amount(total_withdrawals)
                 ])
 
     def write_suspicious_transactions_to_csv(self, file_path: str) -> None:
@@ -94,10 +142,13 @@ class OutputHandler:
         - Amount
         - Currency
         - Description
+        - Rule (only when suspicious_rule_names were given)
 
         Args:
             file_path: Location where CSV file will be created
         """
+        rule_names = self.__suspicious_rule_names
+
         with open(file_path, "w", newline="") as output_file:
             writer = csv.writer(output_file)
             writer.writerow([
@@ -108,9 +159,9 @@ class OutputHandler:
                 "Amount", 
                 "Currency", 
                 "Description"
-            ])
+            ] + (["Rule"] if rule_names is not None else []))
 
-            for transaction in self.__suspicious_transactions:
+            for index, transaction in enumerate(self.__suspicious_transactions):
                 writer.writerow([
                     transaction["Transaction ID"],
                     transaction["Account number"],
@@ -119,7 +170,7 @@ class OutputHandler:
                     transaction["Amount"],
                     transaction["Currency"],
                     transaction["Description"]
-                ])
+                ] + ([rule_names[index]] if rule_names is not None else []))
 
     def write_transaction_statistics_to_csv(self, file_path: str) -> None:
         """ Write transaction statistics to a CSV file.
@@ -128,23 +179,220 @@ class OutputHandler:
         - Transaction type
         - Total amount
         - Transaction count
+        - Std dev, Min, Max, P50, P95, P99 (only when amount_distributions
+          were given)
+        - Unique accounts (only when unique_accounts were given)
 
         Args:
             file_path: Location where CSV file will be created
         """        
+        distributions = None if self.__amount_distributions is None \
+            else self.__amount_distributions["transaction_type"]
+        sketches = None if self.__unique_accounts is None \
+            else self.__unique_accounts["transaction_type"]
+
         with open(file_path, "w", newline="") as output_file:
             writer = csv.writer(output_file)
             writer.writerow([
                 "Transaction type", 
                 "Total amount", 
                 "Transaction count"
-            ])
+            ] + (self.DISTRIBUTION_COLUMNS if distributions is not None else [])
+              + (["Unique accounts"] if sketches is not None else []))
 
             for transaction_type, statistic in self.__transaction_statistics.items():
                 writer.writerow([
                     transaction_type,
-                    statistic["total_amount"],
+                    self.__format_amount(statistic["total_amount"]),
                     statistic["transaction_count"]
+                ] + (self.__distribution_values(distributions.get(transaction_type))
+                     if distributions is not None else [])
+                  + ([self.__unique_account_count(sketches.get(transaction_type))]
+                     if sketches is not None else []))
+
+    def write_currency_statistics_to_csv(self, file_path: str) -> None:
+        """Write the amount distribution of each currency to a CSV file.
+
+        Creates a CSV with columns:
+        - Currency
+        - Transaction count
+        - Mean
+        - Std dev, Min, Max, P50, P95, P99
+        - Unique accounts (only when unique_accounts were given)
+
+        Args:
+            file_path: Location where CSV file will be created
+
+        Raises:
+            ValueError: If no amount_distributions were given
+        """
+        if self.__amount_distributions is None:
+            raise ValueError("Currency statistics need amount_distributions.")
+
+        sketches = None if self.__unique_accounts is None \
+            else self.__unique_accounts["currency"]
+
+        with open(file_path, "w", newline="") as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(["Currency", "Transaction count", "Mean"]
+                            + self.DISTRIBUTION_COLUMNS
+                            + (["Unique accounts"] if sketches is not None else []))
+
+            for currency, distribution in self.__amount_distributions["currency"].items():
+                writer.writerow([currency, distribution.count, distribution.mean]
+                                + self.__distribution_values(distribution)
+                                + ([self.__unique_account_count(sketches.get(currency))]
+                                   if sketches is not None else []))
+
+    def write_daily_unique_accounts_to_csv(self, file_path: str) -> None:
+        """Write the estimated number of unique accounts of each day to a
+        CSV file.
+
+        Creates a CSV with columns:
+        - Date
+        - Unique accounts
+
+        Args:
+            file_path: Location where CSV file will be created
+
+        Raises:
+            ValueError: If no unique_accounts were given
+        """
+        if self.__unique_accounts is None:
+            raise ValueError("Daily unique accounts need unique_accounts.")
+
+        with open(file_path, "w", newline="") as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(["Date", "Unique accounts"])
+
+            for date, sketch in self.__unique_accounts["date"].items():
+                writer.writerow([date, self.__unique_account_count(sketch)])
+
+    def write_account_rollups_to_csv(self, file_path: str, granularity: str = "month") -> None:
+        """Write the daily or monthly totals of each account to a CSV file.
+
+        Creates a CSV with columns:
+        - Account number
+        - Period
+        - Balance change
+        - Total Deposits
+        - Total Withdrawals
+        - Transaction count
+        - Balance (at the end of the period)
+
+        Args:
+            file_path: Location where CSV file will be created
+            granularity: "day" or "month"
+
+        Raises:
+            ValueError: If no rollups were given
+        """
+        if self.__rollups is None:
+            raise ValueError("Account rollups need rollups.")
+
+        with open(file_path, "w", newline="") as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow([
+                "Account number",
+                "Period",
+                "Balance change",
+                "Total Deposits",
+                "Total Withdrawals",
+                "Transaction count",
+                "Balance"
+            ])
+
+            for account_number in self.__account_summaries:
+                balance = 0
+                for period, bucket in self.__rollups.account_rollups(account_number, granularity):
+                    balance += bucket["balance_change"]
+                    writer.writerow([
+                        account_number,
+                        period,
+                        self.__format_amount(bucket["balance_change"]),
+                        self.__format_amount(bucket["total_deposits"]),
+                        self.__format_amount(bucket["total_withdrawals"]),
+                        bucket["transaction_count"],
+                        self.__format_amount(balance)
+                    ])
+
+    def write_currency_balances_to_csv(self, file_path: str) -> None:
+        """Write the balance of each account in each currency to a CSV file.
+
+        Creates a CSV with columns:
+        - Account number
+        - One column for each currency, in alphabetical order
+        - Total (<reporting currency>) (only when reporting_balances were
+          given)
+
+        Args:
+            file_path: Location where CSV file will be created
+
+        Raises:
+            ValueError: If no currency_balances were given
+        """
+        if self.__currency_balances is None:
+            raise ValueError("Currency balances need currency_balances.")
+
+        currencies = sorted({currency for balances in self.__currency_balances.values()
+                             for currency in balances})
+        reporting = self.__reporting_balances is not None
+
+        with open(file_path, "w", newline="") as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(["Account number"] + currencies
+                            + ([f"Total ({self.__reporting_currency})"] if reporting else []))
+
+            for account_number, balances in self.__currency_balances.items():
+                writer.writerow(
+                    [account_number]
+                    + [self.__format_amount(balances[currency]) if currency in balances else ""
+                       for currency in currencies]
+                    + ([self.__format_amount(self.__reporting_balances.get(account_number, 0))]
+                       if reporting else []))
+
+    def write_transfer_graph_to_csv(self, file_path: str) -> None:
+        """Write the transfers of each account to a CSV file.
+
+        Creates a CSV with columns:
+        - Account number
+        - Transfers out, Amount out
+        - Transfers in, Amount in
+        - Fan-out (distinct destination accounts)
+        - Fan-in (distinct source accounts)
+        - Cycle (number of the group of accounts the account's transfers
+          go around in, empty if none)
+
+        Args:
+            file_path: Location where CSV file will be created
+
+        Raises:
+            ValueError: If no transfer_graph was given
+        """
+        if self.__transfer_graph is None:
+            raise ValueError("Transfer graph needs transfer_graph.")
+
+        cycle_numbers = {account_number: number for number, cycle
+                         in enumerate(self.__transfer_graph.find_cycles(), 1)
+                         for account_number in cycle}
+
+        with open(file_path, "w", newline="") as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(["Account number", "Transfers out", "Amount out",
+                             "Transfers in", "Amount in", "Fan-out", "Fan-in", "Cycle"])
+
+            for account_number in self.__transfer_graph.accounts:
+                destinations = self.__transfer_graph.destinations(account_number)
+                sources = self.__transfer_graph.sources(account_number)
+                writer.writerow([
+                    account_number,
+                    sum(count for count, _ in destinations.values()),
+                    self.__format_amount(sum(amount for _, amount in destinations.values())),
+                    sum(count for count, _ in sources.values()),
+                    self.__format_amount(sum(amount for _, amount in sources.values())),
+                    len(destinations),
+                    len(sources),
+                    cycle_numbers.get(account_number, "")
                 ])
 
     def filter_account_summaries(self, filter_field: str, filter_value: int, filter_mode: bool) -> list:
@@ -193,7 +441,46 @@ class OutputHandler:
             for summary in filtered_data:
                 writer.writerow([
                     summary["account_number"],
-                    summary["balance"],
-                    summary["total_deposits"],
-                    summary["total_withdrawals"]
-                ])
\ No newline at end of file
+                    self.__format_amount(summary["balance"]),
+                    self.__format_amount(summary["total_deposits"]),
+                    self.__format_amount(summary["total_withdrawals"])
+                ])
+
+    def __format_amount(self, amount):
+        """Format a balance or total for output.
+        Args:
+            amount: The amount, in minor units if minor_unit_scale was given
+        Returns:
+            The decimal string of minor units, or the amount as it is
+        """
+        if self.__minor_unit_scale is None:
+            return amount
+        return format_minor_units(amount, self.__minor_unit_scale)
+
+    @staticmethod
+    def __distribution_values(distribution) -> list:
+        """Get the values of the distribution columns.
+        Args:
+            distribution: The AmountDistribution, or None
+        Returns:
+            The values in the order of DISTRIBUTION_COLUMNS, empty strings
+            if there is no distribution
+        """
+        if distribution is None:
+            return [""] * len(OutputHandler.DISTRIBUTION_COLUMNS)
+
+        summary = distribution.summary()
+        return [summary[key] for key in ("std", "min", "max", "p50", "p95", "p99")]
+
+    @staticmethod
+    def __unique_account_count(sketch):
+        """Get the value of the Unique accounts column.
+        Args:
+            sketch: The HyperLogLog of the accounts, or None
+        Returns:
+            The estimate rounded to a whole number, an empty string if there
+            is no sketch
+        """
+        if sketch is None:
+            return ""
+        return round(sketch.estimate())
@@ -0,0 +1,167 @@
+"""
+Test suite for the array-backed account summary store.
+
+Validates the totals and their types, the mapping view the rest of the
+code reads, bulk iteration and changing the store through the mapping.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import pickle
+from unittest import TestCase
+from data_processor.account_store import AccountSummaryStore
+from data_processor.data_processor import DataProcessor
+
+
+class TestAccountSummaryStore(TestCase):
+    """Defines the unit tests for the AccountSummaryStore class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.store = AccountSummaryStore()
+        self.store.add("1001", "deposit", 100.5)
+        self.store.add("1002", "withdrawal", 20.25)
+        self.store.add("1001", "withdrawal", 0.5)
+        self.store.add("1003", "transfer", 5.0)
+
+    def test_totals_and_types(self):
+        # Act and Assert
+        self.assertEqual({"account_number": "1002", "balance": -20.25,
+                          "total_deposits": 0, "total_withdrawals": 20.25},
+                         self.store["1002"])
+        self.assertIs(int, type(self.store["1002"]["total_deposits"]))
+        self.assertIs(float, type(self.store["1002"]["balance"]))
+        self.assertEqual(100.0, self.store["1001"]["balance"])
+        self.assertEqual(0, self.store["1003"]["balance"])
+
+    def test_mapping_view(self):
+        # Act and Assert
+        self.assertEqual(["1001", "1002", "1003"], list(self.store))
+        self.assertEqual(3, len(self.store))
+        self.assertIn("1003", self.store)
+        self.assertNotIn("9999", self.store)
+        with self.assertRaises(KeyError):
+            self.store["9999"]
+        self.assertEqual({"1001": {"account_number": "1001", "balance": 100.0,
+                                   "total_deposits": 100.5, "total_withdrawals": 0.5},
+                          "1002": {"account_number": "1002", "balance": -20.25,
+                                   "total_deposits": 0, "total_withdrawals": 20.25},
+                          "1003": {"account_number": "1003", "balance": 0,
+                                   "total_deposits": 0, "total_withdrawals": 0}},
+                         self.store)
+
+    def test_account_ids_dense(self):
+        # Act and Assert
+        self.assertEqual([0, 1, 2, 3], [self.store.account_id(account_number)
+                                        for account_number in ("1001", "1002", "1003", "1004")])
+
+    def test_rows(self):
+        # Act
+        rows = list(self.store.rows())
+
+        # Assert
+        self.assertEqual([("1001", 100.0, 100.5, 0.5), ("1002", -20.25, 0, 20.25),
+                          ("1003", 0, 0, 0)], rows)
+        self.assertIs(int, type(rows[2][1]))
+
+    def test_set_and_delete(self):
+        # Act
+        summary = self.store["1001"].copy()
+        self.store["1001"]["balance"] = 7
+        self.store["1004"] = {"balance": 1.5, "total_deposits": 1.5, "total_withdrawals": 0}
+        del self.store["1002"]
+
+        # Assert
+        self.assertIsInstance(summary, dict)
+        self.assertEqual(100.0, summary["balance"])
+        self.assertIs(int, type(self.store["1001"]["balance"]))
+        self.assertEqual(["1001", "1003", "1004"], list(self.store))
+        self.assertEqual(("1004", 1.5, 1.5, 0), list(self.store.rows())[2])
+        with self.assertRaises(KeyError):
+            self.store["1001"]["overdraft"] = 1
+
+    def test_matches_dict_baseline(self):
+        # Arrange
+        operations = [("1003", "deposit", 5), ("1001", "withdrawal", 2.5),
+                      ("1002", "transfer", 1.0), ("1003", "withdrawal", 1.25),
+                      ("1004", "deposit", 7.0), ("1001", "deposit", 3)]
+        store = AccountSummaryStore()
+        baseline = {}
+
+        # Act
+        for account_number, transaction_type, amount in operations:
+            store.add(account_number, transaction_type, amount)
+            if account_number not in baseline:
+                baseline[account_number] = {"account_number": account_number,
+                                            "balance": 0, "total_deposits": 0,
+                                            "total_withdrawals": 0}
+            if transaction_type == "deposit":
+                baseline[account_number]["balance"] += amount
+                baseline[account_number]["total_deposits"] += amount
+            elif transaction_type == "withdrawal":
+                baseline[account_number]["balance"] -= amount
+                baseline[account_number]["total_withdrawals"] += amount
+        for summaries in (store, baseline):
+            del summaries["1003"]
+            summaries["1003"] = {"account_number": "1003", "balance": 1,
+                                 "total_deposits": 1, "total_withdrawals": 0}
+            summaries["1001"] = {"account_number": "1001", "balance": 0.5,
+                                 "total_deposits": 3, "total_withdrawals": 2.5}
+
+        # Assert
+        self.assertEqual(list(baseline), list(store))
+        self.assertEqual(list(baseline), [row[0] for row in store.rows()])
+        self.assertEqual(baseline, store.to_dict())
+        self.assertEqual(list(baseline.items()), list(store.to_dict().items()))
+        self.assertEqual({account_number: [type(value) for value in summary.values()]
+                          for account_number, summary in baseline.items()},
+                         {account_number: [type(value) for value in summary.values()]
+                          for account_number, summary in store.to_dict().items()})
+        self.assertEqual(baseline, {account_number: dict(summary)
+                                    for account_number, summary in store.items()})
+
+    def test_clear(self):
+        # Act
+        self.store.clear()
+
+        # Assert
+        self.assertEqual({}, self.store)
+        self.assertEqual(0, self.store.account_id("1005"))
+
+    def test_pickle(self):
+        # Act
+        unpickled = pickle.loads(pickle.dumps(self.store))
+
+        # Assert
+        self.assertEqual(self.store, unpickled)
+
+    def test_minor_units(self):
+        # Arrange
+        store = AccountSummaryStore("q")
+
+        # Act
+        store.add("1001", "deposit", 10 ** 15 + 1)
+        store.add("1001", "deposit", 2)
+
+        # Assert
+        self.assertEqual(10 ** 15 + 3, store["1001"]["balance"])
+        self.assertIs(int, type(store["1001"]["balance"]))
+
+    def test_data_processor_store(self):
+        # Arrange
+        processor = DataProcessor([
+            {"Transaction ID": "1", "Account number": "1001", "Transaction type": "deposit",
+             "Amount": "50.00", "Currency": "CAD"},
+            {"Transaction ID": "2", "Account number": "1001", "Transaction type": "withdrawal",
+             "Amount": "20.00", "Currency": "CAD"}], money_mode="minor_units")
+
+        # Act
+        result = processor.process_data()
+
+        # Assert
+        self.assertIsInstance(result["account_summaries"], AccountSummaryStore)
+        self.assertEqual("q", result["account_summaries"].typecode)
+        self.assertEqual([("1001", 3000, 5000, 2000)],
+                         list(result["account_summaries"].rows()))
@@ -0,0 +1,161 @@
+"""
+Test suite for the HyperLogLog distinct count sketch.
+
+Validates the accuracy of the estimates, merging, saving the sketch and the
+unique account counts DataProcessor keeps.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import os
+import tempfile
+from unittest import TestCase
+from data_processor.cardinality import HyperLogLog, precision_for_error
+from data_processor.data_processor import DataProcessor
+from data_processor.sharded_processor import ShardedDataProcessor
+
+
+class TestHyperLogLog(TestCase):
+    """Defines the unit tests for the HyperLogLog class."""
+
+    def make_sketch(self, values, error: float = 0.01) -> HyperLogLog:
+        """Makes a sketch of the values."""
+        sketch = HyperLogLog(error)
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def test_estimate_within_error(self):
+        for count in (10, 1000, 100000):
+            with self.subTest(count=count):
+                # Act
+                sketch = self.make_sketch(f"ACC{index}" for index in range(count))
+
+                # Assert
+                self.assertLessEqual(abs(sketch.estimate() - count),
+                                     3 * sketch.error * count)
+
+    def test_repeated_values_counted_once(self):
+        # Act
+        sketch = self.make_sketch(str(index % 50) for index in range(10000))
+
+        # Assert
+        self.assertEqual(50, round(sketch.estimate()))
+
+    def test_empty_estimate(self):
+        # Act and Assert
+        self.assertEqual(0, HyperLogLog().estimate())
+
+    def test_precision_for_error(self):
+        # Act and Assert
+        self.assertEqual(14, precision_for_error(0.01))
+        self.assertEqual(4, precision_for_error(0.9))
+        self.assertEqual(18, precision_for_error(0.0001))
+        self.assertLessEqual(HyperLogLog(0.01).error, 0.01)
+
+    def test_merge_matches_union(self):
+        # Arrange
+        left = self.make_sketch(str(index) for index in range(0, 6000))
+        right = self.make_sketch(str(index) for index in range(4000, 10000))
+        union = self.make_sketch(str(index) for index in range(10000))
+
+        # Act
+        merged = left.merge(right)
+
+        # Assert
+        self.assertEqual(union.to_dict(), merged.to_dict())
+
+    def test_merge_different_precisions(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+    def test_to_dict_round_trip(self):
+        # Arrange
+        sketch = self.make_sketch(str(index) for index in range(5000))
+
+        # Act
+        rebuilt = HyperLogLog.from_dict(sketch.to_dict())
+
+        # Assert
+        self.assertEqual(sketch.precision, rebuilt.precision)
+        self.assertEqual(sketch.estimate(), rebuilt.estimate())
+
+
+class TestUniqueAccounts(TestCase):
+    """Defines the unit tests for the unique account counts of the processors."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.transactions = [{"Transaction ID": str(index),
+                              "Account number": str(1000 + index % 40),
+                              "Date": f"2023-03-0{1 + index % 3} 10:00",
+                              "Transaction type": "deposit" if index % 2 else "withdrawal",
+                              "Amount": "10.00",
+                              "Currency": "CAD" if index % 4 else "USD"}
+                             for index in range(400)]
+
+    def test_data_processor_unique_accounts(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, unique_account_error=0.01)
+
+        # Act
+        processor.process_data()
+
+        # Assert
+        unique_accounts = processor.unique_accounts
+        self.assertEqual({"withdrawal": 20, "deposit": 20},
+                         {key: round(sketch.estimate()) for key, sketch
+                          in unique_accounts["transaction_type"].items()})
+        self.assertEqual({"USD": 10, "CAD": 30},
+                         {key: round(sketch.estimate()) for key, sketch
+                          in unique_accounts["currency"].items()})
+        self.assertEqual(["2023-03-01", "2023-03-02", "2023-03-03"],
+                         list(unique_accounts["date"]))
+        self.assertEqual(40, round(unique_accounts["date"]["2023-03-01"].estimate()))
+
+    def test_sharded_processor_unique_accounts(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, unique_account_error=0.01)
+        sharded = ShardedDataProcessor(self.transactions, workers=3,
+                                       unique_account_error=0.01)
+
+        # Act
+        processor.process_data()
+        sharded.process_data()
+
+        # Assert
+        for group, sketches in processor.unique_accounts.items():
+            self.assertEqual(list(sketches), list(sharded.unique_accounts[group]))
+            for key, sketch in sketches.items():
+                self.assertEqual(sketch.to_dict(),
+                                 sharded.unique_accounts[group][key].to_dict())
+
+    def test_snapshot_keeps_unique_accounts(self):
+        # Arrange
+        first = DataProcessor(self.transactions[:200], unique_account_error=0.01)
+        first.process_data()
+        expected = DataProcessor(self.transactions, unique_account_error=0.01)
+        expected.process_data()
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "state.snap")
+            first.save_snapshot(snapshot_path)
+            resumed = DataProcessor(self.transactions, unique_account_error=0.01)
+
+            # Act
+            resumed.load_snapshot(snapshot_path)
+            resumed.process_data()
+
+        # Assert
+        self.assertEqual(expected.unique_accounts["transaction_type"]["deposit"].to_dict(),
+                         resumed.unique_accounts["transaction_type"]["deposit"].to_dict())
+
+    def test_no_unique_accounts_by_default(self):
+        # Act
+        processor = DataProcessor([])
+
+        # Assert
+        self.assertIsNone(processor.unique_accounts)
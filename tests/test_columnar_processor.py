@@ -0,0 +1,127 @@
+"""
+Test suite for the columnar transaction processor.
+
+Validates that ColumnarDataProcessor returns exactly the same results as
+DataProcessor. The tests are skipped when NumPy is not installed.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+from data_processor.data_processor import DataProcessor
+from data_processor import columnar_processor
+from data_processor.columnar_processor import ColumnarDataProcessor
+from input_handler.input_handler import InputHandler
+from transaction.transaction import Transaction
+
+@unittest.skipIf(columnar_processor.np is None, "NumPy is not installed")
+class TestColumnarDataProcessor(TestCase):
+    """Defines the unit tests for the ColumnarDataProcessor class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.transactions = [
+            {"Transaction ID": "1", "Account number": "1001",
+             "Transaction type": "deposit", "Amount": "1000.1",
+             "Currency": "CAD"},
+            {"Transaction ID": "2", "Account number": "1002",
+             "Transaction type": "transfer", "Amount": "15000",
+             "Currency": "CAD"},
+            {"Transaction ID": "3", "Account number": "1001",
+             "Transaction type": "withdrawal", "Amount": "0.2",
+             "Currency": "XRP"},
+            {"Transaction ID": "4", "Account number": "1003",
+             "Transaction type": "withdrawal", "Amount": "300.3",
+             "Currency": "CAD"},
+            {"Transaction ID": "5", "Account number": "1001",
+             "Transaction type": "deposit", "Amount": "0.7",
+             "Currency": "LTC"}
+        ]
+
+    def test_process_data_matches_data_processor(self):
+        """Test results, order and value types match the row-by-row path."""
+        expected = DataProcessor(self.transactions).process_data()
+
+        actual = ColumnarDataProcessor(self.transactions).process_data()
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(list(expected["account_summaries"]),
+                         list(actual["account_summaries"]))
+        for account_number, summary in expected["account_summaries"].items():
+            for field, value in summary.items():
+                self.assertIs(type(value),
+                              type(actual["account_summaries"][account_number][field]))
+        self.assertEqual(["2", "3", "5"],
+                         [transaction["Transaction ID"]
+                          for transaction in actual["suspicious_transactions"]])
+
+    def test_process_data_input_file(self):
+        """Test the bundled input file gives the same results."""
+        transactions = list(InputHandler("input/input_data.csv").iter_transactions())
+
+        expected = DataProcessor(transactions).process_data()
+        actual = ColumnarDataProcessor(transactions).process_data()
+
+        self.assertEqual(expected, actual)
+
+    def test_suspicious_rule_names_match_data_processor(self):
+        """Test the rule names and the DataProcessor thresholds are used."""
+        with patch.object(DataProcessor, "LARGE_TRANSACTION_THRESHOLD", 900):
+            expected = DataProcessor(self.transactions)
+            expected.process_data()
+            actual = ColumnarDataProcessor(self.transactions)
+            actual.process_data()
+
+        self.assertEqual(expected.suspicious_transactions, actual.suspicious_transactions)
+        self.assertEqual(["large_transaction", "large_transaction",
+                          "uncommon_currency", "uncommon_currency"],
+                         actual.suspicious_rule_names)
+
+    def test_process_data_custom_rules(self):
+        """Test custom rules flag the same transactions as DataProcessor."""
+        rules = [{"name": "large_cad", "currencies": ["CAD"], "amount_above": 500}]
+        expected = DataProcessor(self.transactions, rules=rules)
+        expected.process_data()
+
+        actual = ColumnarDataProcessor(self.transactions, rules=rules)
+        actual.process_data()
+
+        self.assertEqual(expected.suspicious_transactions, actual.suspicious_transactions)
+        self.assertEqual(["large_cad", "large_cad"], actual.suspicious_rule_names)
+
+    def test_process_data_transfers_with_destination(self):
+        """Test transfers with a Destination account give the DataProcessor
+        results."""
+        transactions = [Transaction.coerce(transaction) for transaction in self.transactions]
+        transactions.append(Transaction("6", "1001", "2023-03-01", "transfer", 100.0,
+                                        "CAD", "Rent", None, "1004"))
+        expected = DataProcessor(transactions).process_data()
+
+        actual = ColumnarDataProcessor(transactions).process_data()
+
+        self.assertEqual(expected, actual)
+        self.assertEqual(100.0, actual["account_summaries"]["1004"]["balance"])
+
+    def test_process_data_twice(self):
+        """Test a second call does not count the transactions twice."""
+        processor = ColumnarDataProcessor(self.transactions)
+        expected = {key: value.copy() for key, value in processor.process_data().items()}
+
+        actual = processor.process_data()
+
+        self.assertEqual(expected, actual)
+
+    def test_process_data_no_transactions(self):
+        """Test an empty input gives empty results."""
+        actual = ColumnarDataProcessor([]).process_data()
+
+        self.assertEqual({"account_summaries": {},
+                          "suspicious_transactions": [],
+                          "transaction_statistics": {}}, actual)
+
+if __name__ == "__main__":
+    unittest.main()
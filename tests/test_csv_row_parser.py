@@ -0,0 +1,83 @@
+"""This module is for making and running tests to test the csv_row_parser
+module. To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_csv_row_parser.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import csv
+import io
+import unittest
+from unittest import TestCase
+from input_handler.csv_row_parser import compile_batch_parser
+from input_handler.input_handler import InputHandler
+
+class CsvRowParserTests(TestCase):
+    """Defines the unit tests for the compile_batch_parser function."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function.
+        """
+        self.FILE_CONTENTS = \
+            ("Transaction ID,Date,Account number,Transaction type,"
+            + "Amount,Currency,Description\n"
+            + "1,2023-03-01,1001,deposit,1000,CAD,Salary\n"
+            + "2,2023-03-01,1002,deposit,-1500,CAD,Salary\n"
+            + "\n"
+            + "3,2023-03-02,1001,withdrawal,200,CAD\n"
+            + "4,2023-03-02,1003,a,200,CAD,Groceries\n"
+            + "5,2023-03-03,1002,transfer,abc,CAD,Savings\n"
+            + "6,2023-03-04,1004,deposit,12000,XRP,Crypto,extra\n")
+        self.parse_transaction = InputHandler("file.csv").parse_transaction
+
+    def test_parser_matches_dict_reader(self):
+        """Returns the same transactions as parsing csv.DictReader rows,
+        including for short, long and blank rows."""
+        # Arrange
+        dict_rows = csv.DictReader(io.StringIO(self.FILE_CONTENTS))
+        expected = [transaction for transaction
+                    in map(self.parse_transaction, dict_rows)
+                    if transaction is not None]
+        reader = csv.reader(io.StringIO(self.FILE_CONTENTS))
+        parse_batch = compile_batch_parser(next(reader), self.parse_transaction)
+
+        # Act
+        actual = [transaction for transaction
+                  in parse_batch([values for values in reader if values])
+                  if type(transaction) is not str]
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(["1", "3", "6"],
+                         [transaction.transaction_id for transaction in actual])
+        self.assertIsNone(actual[1].description)
+
+    def test_parser_header_missing_column(self):
+        """Returns None when the header does not have every column."""
+        # Act
+        actual = compile_batch_parser(["Transaction ID", "Amount"],
+                                    self.parse_transaction)
+
+        # Assert
+        self.assertIsNone(actual)
+
+    def test_parser_batch_of_full_rows(self):
+        """Returns the reason code in the place of each row that is not
+        valid."""
+        # Arrange
+        reader = csv.reader(io.StringIO(self.FILE_CONTENTS))
+        parse_batch = compile_batch_parser(next(reader), self.parse_transaction)
+        batch = [values for values in reader if len(values) == 7]
+
+        # Act
+        actual = [result if type(result) is str else result.transaction_id
+                  for result in parse_batch(batch)]
+
+        # Assert
+        self.assertEqual(["1", "NON_POSITIVE_AMOUNT", "INVALID_TRANSACTION_TYPE",
+                          "NON_NUMERIC_AMOUNT"], actual)
+
+if __name__ == "__main__":
+    unittest.main()
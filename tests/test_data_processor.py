@@ -15,6 +15,7 @@ import unittest
 from unittest import TestCase
 import logging
 from data_processor.data_processor import DataProcessor
+from transaction.transaction import Transaction
 
 class TestDataProcessor(TestCase):
     """Defines the unit tests for the DataProcessor class."""
@@ -51,6 +52,52 @@ class TestDataProcessor(TestCase):
             }
         ]
 
+    def test_process_data_typed_transactions(self):
+        """Test processing transactions that are Transaction records."""
+        transactions = [Transaction.from_row(transaction)
+                        for transaction in self.transactions]
+        processor = DataProcessor(transactions)
+
+        result = processor.process_data()
+
+        self.assertEqual(result["account_summaries"]["1001"]["balance"], 1000)
+        self.assertEqual(result["transaction_statistics"]["deposit"],
+                         {"total_amount": 2500, "transaction_count": 2})
+        self.assertEqual(result["suspicious_transactions"], [])
+
+    def test_process_data_twice_does_not_double_count(self):
+        """Test calling process_data again returns the same totals."""
+        processor = DataProcessor(self.transactions)
+
+        processor.process_data()
+        result = processor.process_data()
+
+        self.assertEqual(result["account_summaries"]["1001"]["balance"], 1000)
+        self.assertEqual(result["transaction_statistics"]["deposit"]["transaction_count"], 2)
+
+    def test_ingest_batches(self):
+        """Test ingesting batches folds them into the running results."""
+        processor = DataProcessor([])
+        withdrawal = dict(self.transactions[0], **{"Transaction ID": "3",
+                                                   "Transaction type": "withdrawal",
+                                                   "Amount": 400})
+
+        processor.ingest(self.transactions)
+        processor.ingest([withdrawal])
+        result = processor.process_data()
+
+        self.assertEqual(result["account_summaries"]["1001"]["balance"], 600)
+        self.assertEqual(result["account_summaries"]["1002"]["balance"], 1500)
+        self.assertEqual(processor.get_average_transaction_amount("deposit"), 1250)
+
+    def test_get_average_transaction_amount_unknown_type(self):
+        """Test the average of a type with no transactions is 0."""
+        processor = DataProcessor(self.transactions)
+
+        processor.process_data()
+
+        self.assertEqual(processor.get_average_transaction_amount("transfer"), 0)
+
 def test_update_account_summary_deposit(self):
         """Test account summary updates for deposit transactions."""
         processor = DataProcessor([])
@@ -0,0 +1,316 @@
+"""
+Test suite for the duplicate transaction filter.
+
+Validates the Bloom filter, the exact Transaction ID store, the filter in
+both modes across runs and the duplicates the processors drop.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import os
+import tempfile
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.deduplication import (BloomFilter, DuplicateFilter,
+                                          TransactionIdStore)
+from data_processor.sharded_processor import ShardedDataProcessor
+
+
+class TestBloomFilter(TestCase):
+    """Defines the unit tests for the BloomFilter class."""
+
+    def test_no_false_negatives(self):
+        # Arrange
+        bloom_filter = BloomFilter(10000, 0.01)
+
+        # Act
+        first_adds = [bloom_filter.add(str(index)) for index in range(10000)]
+
+        # Assert
+        self.assertTrue(all(str(index) in bloom_filter for index in range(10000)))
+        self.assertTrue(all(bloom_filter.add(str(index)) for index in range(10000)))
+        self.assertLess(sum(first_adds), 200)
+
+    def test_false_positive_rate(self):
+        # Arrange
+        bloom_filter = BloomFilter(20000, 0.01)
+        for index in range(20000):
+            bloom_filter.add(f"ID{index}")
+
+        # Act
+        false_positives = sum(f"OTHER{index}" in bloom_filter for index in range(20000))
+
+        # Assert
+        self.assertLess(false_positives / 20000, 0.02)
+
+    def test_max_bytes(self):
+        # Act
+        bloom_filter = BloomFilter(100000000, 0.001, max_bytes=1024)
+
+        # Assert
+        self.assertEqual(1024, bloom_filter.size_bytes)
+
+    def test_save_and_load(self):
+        # Arrange
+        bloom_filter = BloomFilter(1000, 0.01)
+        for index in range(500):
+            bloom_filter.add(str(index))
+
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "ids.bloom")
+
+            # Act
+            bloom_filter.save(file_path)
+            loaded = BloomFilter.load(file_path)
+
+        # Assert
+        self.assertEqual(bloom_filter.count, loaded.count)
+        self.assertEqual(bloom_filter.size_bytes, loaded.size_bytes)
+        self.assertTrue(all(str(index) in loaded for index in range(500)))
+
+    def test_load_not_a_filter(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            file_path = os.path.join(directory, "ids.bloom")
+            with open(file_path, "wb") as filter_file:
+                filter_file.write(b"not a filter")
+
+            # Act and Assert
+            with self.assertRaises(ValueError):
+                BloomFilter.load(file_path)
+
+    def test_not_valid(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(1000, 1.5)
+
+
+class TestDuplicateFilter(TestCase):
+    """Defines the unit tests for the TransactionIdStore and DuplicateFilter classes."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.transactions = [{"Transaction ID": str(index),
+                              "Account number": "1001",
+                              "Date": "2023-03-01",
+                              "Transaction type": "deposit",
+                              "Amount": "10.00",
+                              "Currency": "CAD"}
+                             for index in (1, 2, 3, 2, 4, 1)]
+
+    def tearDown(self):
+        """This function is invoked after executing a unit test
+        function."""
+        self.directory.cleanup()
+
+    def test_store_add_new(self):
+        # Arrange
+        store = TransactionIdStore(":memory:")
+        store.add_new(["1", "2"])
+
+        # Act
+        new_flags = store.add_new(["2", "3", "3", "4"])
+
+        # Assert
+        self.assertEqual([False, True, False, True], new_flags)
+        self.assertEqual(4, store.count)
+        store.close()
+
+    def test_filter_across_runs(self):
+        for mode in DuplicateFilter.MODES:
+            with self.subTest(mode=mode):
+                # Arrange
+                file_path = os.path.join(self.directory.name, f"ids.{mode}")
+                with DuplicateFilter(file_path, mode, max_bytes=1024 * 1024) as first_run:
+                    first_ids = [transaction.transaction_id for transaction
+                                 in first_run.filter(self.transactions)]
+                    first_run.commit()
+
+                # Act
+                with DuplicateFilter(file_path, mode) as second_run:
+                    second_ids = [transaction.transaction_id for transaction
+                                  in second_run.filter(self.transactions[:3] + [
+                                      dict(self.transactions[0], **{"Transaction ID": "5"})])]
+
+                # Assert
+                self.assertEqual(["1", "2", "3", "4"], first_ids)
+                self.assertEqual(2, first_run.duplicate_count)
+                self.assertEqual(["5"], second_ids)
+                self.assertEqual(3, second_run.duplicate_count)
+
+    def test_store_ids_not_committed_are_dropped(self):
+        # Arrange
+        file_path = os.path.join(self.directory.name, "ids.sqlite")
+        store = TransactionIdStore(file_path)
+        store.add_new(["1", "2"])
+        store.commit()
+        store.add_new(["3"])
+
+        # Act
+        store.close()
+        reopened = TransactionIdStore(file_path)
+
+        # Assert
+        self.assertEqual(["1", "2"], sorted(reopened.iter_ids()))
+        reopened.close()
+
+    def test_store_stale_maybe_seen(self):
+        """An ID wrongly said to be unseen is still found in the store."""
+        # Arrange
+        store = TransactionIdStore(":memory:")
+        store.add_new(["1", "2"])
+
+        # Act
+        new_flags = store.add_new(["2", "3"], maybe_seen=[False, False])
+
+        # Assert
+        self.assertEqual([False, True], new_flags)
+        self.assertEqual(3, store.count)
+        store.close()
+
+    def test_bloom_false_positives_are_kept(self):
+        # Arrange
+        transactions = [dict(self.transactions[0], **{"Transaction ID": str(index)})
+                        for index in range(2000)]
+
+        # Act
+        with DuplicateFilter(":memory:", "bloom", max_bytes=8) as duplicate_filter:
+            kept = sum(1 for _ in duplicate_filter.filter(transactions))
+
+        # Assert
+        self.assertEqual(2000, kept)
+        self.assertEqual(0, duplicate_filter.duplicate_count)
+
+    def test_bloom_filter_built_from_store(self):
+        # Arrange
+        file_path = os.path.join(self.directory.name, "ids.sqlite")
+        with DuplicateFilter(file_path) as first_run:
+            list(first_run.filter(self.transactions))
+            first_run.commit()
+
+        # Act
+        with DuplicateFilter(file_path, "bloom") as second_run:
+            kept = list(second_run.filter(self.transactions))
+
+        # Assert
+        self.assertEqual([], kept)
+        self.assertTrue(os.path.exists(file_path + ".bloom"))
+
+    def test_interrupted_run_keeps_unused_batch(self):
+        # Arrange
+        file_path = os.path.join(self.directory.name, "ids.sqlite")
+        with DuplicateFilter(file_path) as first_run:
+            transactions = first_run.filter(self.transactions, commit=True)
+            next(transactions)
+            transactions.close()
+
+        # Act
+        with DuplicateFilter(file_path) as second_run:
+            kept = [transaction.transaction_id
+                    for transaction in second_run.filter(self.transactions)]
+
+        # Assert
+        self.assertEqual(["1", "2", "3", "4"], kept)
+
+    def test_transactions_without_id_are_kept(self):
+        # Arrange
+        transactions = [dict(self.transactions[0], **{"Transaction ID": ""})
+                        for _ in range(3)] + self.transactions
+
+        # Act
+        with DuplicateFilter(":memory:") as duplicate_filter:
+            kept = [transaction.transaction_id
+                    for transaction in duplicate_filter.filter(transactions)]
+
+        # Assert
+        self.assertEqual(["", "", "", "1", "2", "3", "4"], kept)
+        self.assertEqual(2, duplicate_filter.duplicate_count)
+
+    def test_exact_filter_batches(self):
+        # Arrange
+        transactions = [dict(self.transactions[0], **{"Transaction ID": str(index % 5000)})
+                        for index in range(10000)]
+
+        # Act
+        with DuplicateFilter(":memory:") as duplicate_filter:
+            kept = sum(1 for _ in duplicate_filter.filter(transactions))
+
+        # Assert
+        self.assertEqual(5000, kept)
+        self.assertEqual(5000, duplicate_filter.duplicate_count)
+
+    def test_mode_not_valid(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            DuplicateFilter(":memory:", "hash")
+
+    def test_replayed_file_not_counted_again(self):
+        # Arrange
+        file_path = os.path.join(self.directory.name, "ids.sqlite")
+
+        # Act
+        for _ in range(2):
+            with DuplicateFilter(file_path) as duplicate_filter:
+                processor = DataProcessor(self.transactions,
+                                          duplicate_filter=duplicate_filter)
+                processor.process_data()
+                processor.commit_transaction_ids()
+
+        # Assert
+        self.assertEqual({}, processor.account_summaries)
+        self.assertEqual(6, processor.duplicate_count)
+
+    def test_stopped_run_keeps_transactions_on_rerun(self):
+        # Arrange
+        file_path = os.path.join(self.directory.name, "ids.sqlite")
+        snapshot_path = os.path.join(self.directory.name, "snapshot.bin")
+        transactions = [dict(self.transactions[0], **{"Transaction ID": str(index)})
+                        for index in range(10)]
+
+        def stop_after_seven():
+            yield from transactions[:7]
+            raise OSError("input went away")
+
+        with DuplicateFilter(file_path) as duplicate_filter:
+            duplicate_filter.BATCH_SIZE = 2
+            with self.assertRaises(OSError):
+                DataProcessor(stop_after_seven(),
+                              duplicate_filter=duplicate_filter).process_data()
+
+        # Act
+        with DuplicateFilter(file_path) as duplicate_filter:
+            rerun = DataProcessor(transactions, duplicate_filter=duplicate_filter)
+            rerun.process_data()
+            rerun.save_snapshot(snapshot_path)
+        with DuplicateFilter(file_path) as duplicate_filter:
+            replay = DataProcessor(transactions, duplicate_filter=duplicate_filter)
+            replay.process_data()
+
+        # Assert
+        self.assertEqual(100.0, rerun.account_summaries["1001"]["balance"])
+        self.assertEqual(0, rerun.duplicate_count)
+        self.assertEqual({}, replay.account_summaries)
+        self.assertEqual(10, replay.duplicate_count)
+
+    def test_processors_drop_duplicates(self):
+        # Arrange
+        with DuplicateFilter(":memory:") as duplicate_filter:
+            processor = DataProcessor(self.transactions, duplicate_filter=duplicate_filter)
+            # Act
+            processor.process_data()
+        with DuplicateFilter(":memory:") as duplicate_filter:
+            sharded = ShardedDataProcessor(self.transactions, workers=2,
+                                           duplicate_filter=duplicate_filter)
+            sharded.process_data()
+
+        # Assert
+        self.assertEqual(40.0, processor.account_summaries["1001"]["balance"])
+        self.assertEqual(2, processor.duplicate_count)
+        self.assertEqual(processor.account_summaries, sharded.account_summaries)
+        self.assertEqual(2, sharded.duplicate_count)
+        self.assertEqual(0, DataProcessor([]).duplicate_count)
@@ -0,0 +1,157 @@
+"""
+Test suite for the amount distribution accumulators.
+
+Validates the one-pass moments, min and max, the accuracy of the quantile
+sketch, merging and the distributions DataProcessor keeps.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import math
+import random
+import statistics
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.distribution import AmountDistribution, QuantileSketch
+from data_processor.sharded_processor import ShardedDataProcessor
+
+
+class TestAmountDistribution(TestCase):
+    """Defines the unit tests for the AmountDistribution class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        generator = random.Random(7)
+        self.amounts = [round(generator.lognormvariate(6, 1.5), 2)
+                        for _ in range(5000)]
+
+    def make_distribution(self, amounts: list) -> AmountDistribution:
+        """Makes a distribution of the amounts."""
+        distribution = AmountDistribution()
+        for amount in amounts:
+            distribution.add(amount)
+        return distribution
+
+    def test_moments_min_max(self):
+        # Act
+        distribution = self.make_distribution(self.amounts)
+
+        # Assert
+        self.assertEqual(len(self.amounts), distribution.count)
+        self.assertAlmostEqual(statistics.fmean(self.amounts), distribution.mean,
+                               places=6)
+        self.assertTrue(math.isclose(statistics.pstdev(self.amounts),
+                                     distribution.standard_deviation,
+                                     rel_tol=1e-9))
+        self.assertEqual(min(self.amounts), distribution.minimum)
+        self.assertEqual(max(self.amounts), distribution.maximum)
+
+    def test_percentiles_within_relative_accuracy(self):
+        # Arrange
+        ordered = sorted(self.amounts)
+
+        # Act
+        distribution = self.make_distribution(self.amounts)
+
+        # Assert
+        for percentile in (50, 95, 99):
+            expected = ordered[int(percentile / 100 * (len(ordered) - 1))]
+            self.assertTrue(math.isclose(expected,
+                                         distribution.percentile(percentile),
+                                         rel_tol=0.01),
+                            f"p{percentile}")
+
+    def test_merge_matches_single_pass(self):
+        # Arrange
+        expected = self.make_distribution(self.amounts)
+
+        # Act
+        merged = self.make_distribution(self.amounts[:1234]).merge(
+            self.make_distribution(self.amounts[1234:]))
+
+        # Assert
+        self.assertEqual(expected.count, merged.count)
+        self.assertTrue(math.isclose(expected.mean, merged.mean, rel_tol=1e-12))
+        self.assertTrue(math.isclose(expected.standard_deviation,
+                                     merged.standard_deviation, rel_tol=1e-9))
+        self.assertEqual(expected.summary()["p95"], merged.summary()["p95"])
+        self.assertEqual(expected.minimum, merged.minimum)
+
+    def test_merge_with_empty(self):
+        # Arrange
+        distribution = self.make_distribution([5.0, 7.0])
+
+        # Act
+        merged = AmountDistribution().merge(distribution)
+
+        # Assert
+        self.assertEqual(distribution.summary(), merged.summary())
+
+    def test_to_dict_round_trip(self):
+        # Arrange
+        distribution = self.make_distribution(self.amounts)
+
+        # Act
+        rebuilt = AmountDistribution.from_dict(distribution.to_dict())
+
+        # Assert
+        self.assertEqual(distribution.summary(), rebuilt.summary())
+
+    def test_empty_summary(self):
+        # Act
+        summary = AmountDistribution().summary()
+
+        # Assert
+        self.assertEqual(0, summary["count"])
+        self.assertIsNone(summary["p50"])
+        self.assertIsNone(summary["min"])
+
+    def test_sketch_bucket_limit(self):
+        # Arrange
+        sketch = QuantileSketch(max_buckets=10)
+
+        # Act
+        for exponent in range(100):
+            sketch.add(2.0 ** exponent)
+
+        # Assert
+        self.assertEqual(100, sketch.count)
+        self.assertEqual(10, len(sketch.to_dict()["buckets"]))
+        self.assertTrue(math.isclose(2.0 ** 99, sketch.quantile(1), rel_tol=0.01))
+
+    def test_data_processor_distributions(self):
+        # Arrange
+        transactions = [{"Transaction ID": str(index),
+                         "Account number": str(1000 + index % 5),
+                         "Transaction type": "deposit" if index % 2 else "withdrawal",
+                         "Amount": str(amount),
+                         "Currency": "CAD" if index % 3 else "USD"}
+                        for index, amount in enumerate(self.amounts[:500])]
+        processor = DataProcessor(transactions, track_distributions=True)
+
+        # Act
+        processor.process_data()
+        sharded = ShardedDataProcessor(transactions, workers=2,
+                                       track_distributions=True)
+        sharded.process_data()
+
+        # Assert
+        distributions = processor.amount_distributions
+        self.assertEqual(["withdrawal", "deposit"],
+                         list(distributions["transaction_type"]))
+        self.assertEqual(["USD", "CAD"], list(distributions["currency"]))
+        self.assertEqual(500, sum(distribution.count for distribution
+                                  in distributions["currency"].values()))
+        self.assertEqual(list(distributions["currency"]),
+                         list(sharded.amount_distributions["currency"]))
+        self.assertEqual(distributions["currency"]["USD"].summary()["p99"],
+                         sharded.amount_distributions["currency"]["USD"].summary()["p99"])
+
+    def test_data_processor_no_distributions_by_default(self):
+        # Act
+        processor = DataProcessor([])
+
+        # Assert
+        self.assertIsNone(processor.amount_distributions)
@@ -0,0 +1,148 @@
+"""This module is for making and running tests to test the follow_reader
+module. To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_follow_reader.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+from input_handler.input_handler import InputHandler
+
+class FollowReaderTests(TestCase):
+    """Defines the unit tests for reading new rows with a checkpoint."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function. It writes a csv file to a temporary directory.
+        """
+        self.HEADER = ("Transaction ID,Account number,Date,Transaction type,"
+                       + "Amount,Currency,Description\n")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, "transactions.csv")
+        self.checkpoint_path = os.path.join(directory.name, "checkpoint.json")
+        self.write(self.HEADER
+                   + "1,1001,2023-03-01,deposit,1000,CAD,Salary\n"
+                   + "2,1002,2023-03-01,deposit,1500,CAD,Salary\n", "w")
+
+    def write(self, file_contents: str, mode: str = "a") -> None:
+        """Writes to the csv file."""
+        with open(self.file_path, mode) as output_file:
+            output_file.write(file_contents)
+
+    def read_new_ids(self) -> list:
+        """Reads the new transactions and returns their ids."""
+        input = InputHandler(self.file_path)
+        return [transaction.transaction_id for transaction
+                in input.iter_new_transactions(self.checkpoint_path)]
+
+    def test_only_new_rows_are_read(self):
+        """Yields only the rows appended since the last read."""
+        # Arrange
+        first = self.read_new_ids()
+        self.write("3,1001,2023-03-02,withdrawal,200,CAD,Groceries\n")
+
+        # Act
+        second = self.read_new_ids()
+        third = self.read_new_ids()
+
+        # Assert
+        self.assertEqual(["1", "2"], first)
+        self.assertEqual(["3"], second)
+        self.assertEqual([], third)
+        with open(self.checkpoint_path) as checkpoint_file:
+            self.assertEqual(3, json.load(checkpoint_file)["row_count"])
+
+    def test_partly_written_row_is_left_for_next_read(self):
+        """Does not read a row until its newline has been written."""
+        # Arrange
+        self.read_new_ids()
+        self.write("3,1001,2023-03-02,with")
+
+        # Act
+        first = self.read_new_ids()
+        self.write("drawal,200,CAD,Groceries\n")
+        second = self.read_new_ids()
+
+        # Assert
+        self.assertEqual([], first)
+        self.assertEqual(["3"], second)
+
+    def test_truncated_file_is_read_from_start(self):
+        """Reads the file from the start when it was truncated."""
+        # Arrange
+        self.read_new_ids()
+        self.write(self.HEADER + "9,1009,2023-03-09,deposit,10,CAD,New\n", "w")
+
+        # Act
+        actual = self.read_new_ids()
+
+        # Assert
+        self.assertEqual(["9"], actual)
+
+    def test_replaced_file_is_read_from_start(self):
+        """Reads the file from the start when it was replaced by a new file
+        that has grown past the old offset."""
+        # Arrange
+        self.read_new_ids()
+        os.remove(self.file_path)
+        self.write(self.HEADER
+                   + "7,1007,2023-03-07,deposit,10,CAD,New\n"
+                   + "8,1008,2023-03-08,deposit,10,CAD,New\n"
+                   + "9,1009,2023-03-09,deposit,10,CAD,New\n", "w")
+
+        # Act
+        actual = self.read_new_ids()
+
+        # Assert
+        self.assertEqual(["7", "8", "9"], actual)
+
+    def test_stopping_early_keeps_unread_rows(self):
+        """Saves the checkpoint after the last row that was yielded."""
+        # Arrange
+        input = InputHandler(self.file_path)
+        transactions = input.iter_new_transactions(self.checkpoint_path)
+
+        # Act
+        next(transactions)
+        transactions.close()
+        actual = self.read_new_ids()
+
+        # Assert
+        self.assertEqual(["2"], actual)
+
+    def test_rows_added_before_rotation_are_read(self):
+        """Reads the rows appended to the old file between two polls before
+        starting on the new file it was rotated to."""
+        # Arrange
+        input = InputHandler(self.file_path)
+        polls = []
+
+        def rotate_then_stop(poll_interval):
+            polls.append(poll_interval)
+            if len(polls) > 1:
+                raise InterruptedError
+            self.write("3,1001,2023-03-02,withdrawal,200,CAD,Groceries\n")
+            os.rename(self.file_path, self.file_path + ".1")
+            self.write(self.HEADER + "4,1004,2023-03-03,deposit,10,CAD,New\n", "w")
+
+        actual = []
+
+        # Act
+        with patch("input_handler.follow_reader.time.sleep", rotate_then_stop), \
+                self.assertRaises(InterruptedError):
+            for transaction in input.iter_new_transactions(self.checkpoint_path,
+                                                           follow=True):
+                actual.append(transaction.transaction_id)
+
+        # Assert
+        self.assertEqual(["1", "2", "3", "4"], actual)
+
+if __name__ == "__main__":
+    unittest.main()
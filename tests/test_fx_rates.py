@@ -0,0 +1,194 @@
+"""
+Test suite for the exchange rate table and the currency balances.
+
+Validates the rate lookup by date, loading rates from a file, and the
+per-currency and reporting currency balances of the processors.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import os
+import tempfile
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.fx_rates import FxRateTable
+from data_processor.sharded_processor import ShardedDataProcessor
+
+
+class TestFxRateTable(TestCase):
+    """Defines the unit tests for the FxRateTable class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.fx_rates = FxRateTable("CAD")
+        self.fx_rates.add_rate("USD", "2023-03-10", 1.40)
+        self.fx_rates.add_rate("USD", "2023-03-01", 1.35)
+        self.fx_rates.add_rate("USD", "2023-03-20", "1.30")
+
+    def test_rate_in_effect_on_date(self):
+        # Act and Assert
+        self.assertEqual(1.35, self.fx_rates.rate("USD", "2023-03-01"))
+        self.assertEqual(1.35, self.fx_rates.rate("USD", "2023-03-09 23:59"))
+        self.assertEqual(1.40, self.fx_rates.rate("USD", "2023-03-10"))
+        self.assertEqual(1.30, self.fx_rates.rate("USD", "2024-01-01"))
+        self.assertEqual(1.0, self.fx_rates.rate("CAD", "2023-03-01"))
+
+    def test_replaced_rate(self):
+        # Arrange
+        self.fx_rates.rate("USD", "2023-03-12")
+
+        # Act
+        self.fx_rates.add_rate("USD", "2023-03-10", 1.45)
+
+        # Assert
+        self.assertEqual(1.45, self.fx_rates.rate("USD", "2023-03-12"))
+        self.assertEqual(29.0, self.fx_rates.convert(20, "USD", "2023-03-12"))
+
+    def test_no_rate(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            self.fx_rates.rate("USD", "2023-02-28")
+        with self.assertRaises(ValueError):
+            self.fx_rates.rate("EUR", "2023-03-15")
+        with self.assertRaises(ValueError):
+            self.fx_rates.rate("USD", "")
+
+    def test_rate_not_valid(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            self.fx_rates.add_rate("USD", "2023-03-01", 0)
+        with self.assertRaises(ValueError):
+            self.fx_rates.add_rate("USD", "March", 1.2)
+
+    def test_from_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            file_path = os.path.join(directory, "fx_rates.csv")
+            with open(file_path, "w", newline="") as rates_file:
+                rates_file.write("Currency,Date,Rate\nEUR,2023-03-01,1.45\nXRP,2023-03-01,0.5\n")
+
+            # Act
+            fx_rates = FxRateTable.from_csv(file_path, "CAD")
+
+        # Assert
+        self.assertEqual("CAD", fx_rates.reporting_currency)
+        self.assertEqual(0.5, fx_rates.rate("XRP", "2023-03-31"))
+
+
+class TestCurrencyBalances(TestCase):
+    """Defines the unit tests for the currency balances of the processors."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.transactions = [
+            {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01",
+             "Transaction type": "deposit", "Amount": "100.00", "Currency": "CAD"},
+            {"Transaction ID": "2", "Account number": "1001", "Date": "2023-03-02",
+             "Transaction type": "deposit", "Amount": "10.00", "Currency": "USD"},
+            {"Transaction ID": "3", "Account number": "1002", "Date": "2023-03-15",
+             "Transaction type": "withdrawal", "Amount": "4.00", "Currency": "USD"},
+            {"Transaction ID": "4", "Account number": "1001", "Date": "2023-03-20",
+             "Transaction type": "withdrawal", "Amount": "5.00", "Currency": "USD"},
+            {"Transaction ID": "5", "Account number": "1002", "Date": "2023-03-21",
+             "Transaction type": "transfer", "Amount": "1.00", "Currency": "USD"}
+        ]
+        self.fx_rates = FxRateTable("CAD")
+        self.fx_rates.add_rate("USD", "2023-03-01", 1.25)
+        self.fx_rates.add_rate("USD", "2023-03-15", 1.50)
+
+    def test_currency_balances(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, track_currency_balances=True)
+
+        # Act
+        processor.process_data()
+
+        # Assert
+        self.assertEqual({"1001": {"CAD": 100.0, "USD": 5.0}, "1002": {"USD": -4.0}},
+                         processor.currency_balances)
+        self.assertIsNone(processor.reporting_balances)
+
+    def test_reporting_balances_at_transaction_dates(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, fx_rates=self.fx_rates)
+
+        # Act
+        processor.process_data()
+
+        # Assert
+        self.assertEqual({"1001": 105.0, "1002": -6.0}, processor.reporting_balances)
+
+    def test_reporting_balances_minor_units(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, fx_rates=self.fx_rates,
+                                  money_mode="minor_units")
+
+        # Act
+        processor.process_data()
+
+        # Assert
+        self.assertEqual({"1001": {"CAD": 10000, "USD": 500}, "1002": {"USD": -400}},
+                         processor.currency_balances)
+        self.assertEqual({"1001": 10500, "1002": -600}, processor.reporting_balances)
+
+    def test_missing_rate(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, fx_rates=FxRateTable("CAD"))
+
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            processor.process_data()
+
+    def test_missing_rate_changes_nothing(self):
+        # Arrange
+        processor = DataProcessor([], fx_rates=FxRateTable("CAD"))
+        processor.update_account_summary(self.transactions[0])
+
+        # Act
+        with self.assertRaises(ValueError):
+            processor.update_account_summary(self.transactions[1])
+
+        # Assert
+        self.assertEqual({"account_number": "1001", "balance": 100.0,
+                          "total_deposits": 100.0, "total_withdrawals": 0},
+                         dict(processor.account_summaries["1001"]))
+        self.assertEqual({"1001": {"CAD": 100.0}}, processor.currency_balances)
+        self.assertEqual({"1001": 100.0}, processor.reporting_balances)
+
+    def test_sharded_processor_balances(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, fx_rates=self.fx_rates)
+        sharded = ShardedDataProcessor(self.transactions, workers=2,
+                                       fx_rates=self.fx_rates)
+
+        # Act
+        processor.process_data()
+        sharded.process_data()
+
+        # Assert
+        self.assertEqual(processor.currency_balances, sharded.currency_balances)
+        self.assertEqual(list(processor.currency_balances), list(sharded.currency_balances))
+        self.assertEqual(processor.reporting_balances, sharded.reporting_balances)
+
+    def test_snapshot_keeps_balances(self):
+        # Arrange
+        first = DataProcessor(self.transactions[:2], fx_rates=self.fx_rates)
+        first.process_data()
+        expected = DataProcessor(self.transactions, fx_rates=self.fx_rates)
+        expected.process_data()
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "state.snap")
+            first.save_snapshot(snapshot_path)
+            resumed = DataProcessor(self.transactions, fx_rates=self.fx_rates)
+
+            # Act
+            resumed.load_snapshot(snapshot_path)
+            resumed.process_data()
+
+        # Assert
+        self.assertEqual(expected.currency_balances, resumed.currency_balances)
+        self.assertEqual(expected.reporting_balances, resumed.reporting_balances)
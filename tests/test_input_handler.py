@@ -6,6 +6,12 @@ python3 -m unittest tests/test_input_handler.py
 __author__ = "Thomas Littleton"
 __version__ = "1.0."
 
+import bz2
+import gzip
+import json
+import lzma
+import os
+import tempfile
 import unittest
 from unittest import TestCase
 from input_handler.input_handler import InputHandler
@@ -68,6 +74,44 @@ class InputHandlerTests(TestCase):
         
         self.assertEqual = (expected, actual)
 
+    def test_get_file_format_skips_compression_extension(self):
+        """Returns the extension inside a compression extension."""
+        # Arrange
+        file_paths = {"input/input_data.csv.gz": ("csv", "gz"),
+                      "input/input_data.json.bz2": ("json", "bz2"),
+                      "input/input_data.ndjson.xz": ("ndjson", "xz"),
+                      "input/input_data.csv": ("csv", "")}
+
+        for file_path, expected in file_paths.items():
+            # Act
+            input = InputHandler(file_path)
+            actual = (input.get_file_format(), input.get_compression())
+
+            # Assert
+            self.assertEqual(expected, actual)
+
+    def test_read_input_data_decompresses_while_reading(self):
+        """Returns the same transactions from compressed files as from
+        the uncompressed file."""
+        # Arrange
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        openers = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+        for compression, opener in openers.items():
+            file_path = os.path.join(directory.name,
+                                     f"input_data.csv.{compression}")
+            with opener(file_path, "wt") as output_file:
+                output_file.write(self.FILE_CONTENTS)
+
+            # Act
+            input = InputHandler(file_path)
+            actual = input.read_input_data()
+
+            # Assert
+            expected = self.FILE_CONTENTS_FOR_TESTS
+            self.assertEqual(expected, actual)
+
     # tests for read csv data
     def test_read_csv_data_file_path_does_not_exist(self):
         """Raises a FileNotFoundError when the file path does not exist to a file."""
@@ -175,6 +219,70 @@ class InputHandlerTests(TestCase):
         self.assertEqual(expected, actual)
 
 
+    def test_read_input_data_list_of_transaction_from_ndjson(self):
+        """Returns a list containing the transaction data from a json lines file."""
+        # Arrange
+        file_contents = "\n".join(json.dumps(transaction)
+                                  for transaction in self.FILE_CONTENTS_FOR_TESTS)
+        file_contents += "\n\n"
+
+        for file_path in ("input/input_data.ndjson", "input/input_data.jsonl"):
+            # Act
+            with patch('builtins.open', mock_open(read_data=file_contents)), \
+                    patch('input_handler.input_handler.path.isfile',
+                          return_value=True):
+                input = InputHandler(file_path)
+                actual = input.read_input_data()
+
+            # Assert
+            expected = self.FILE_CONTENTS_FOR_TESTS
+            self.assertEqual(expected, actual)
+
+    # tests for iter transactions
+    def test_iter_transactions_yields_valid_transactions_from_csv(self):
+        """Yields the valid transactions of a csv file one at a time."""
+        # Arrange
+        file_contents = self.FILE_CONTENTS + "\n4,1002,2023-03-02,a,100,CAD,Bad"
+        file_path = "input/input_data.csv"
+
+        # Act
+        with patch('builtins.open', mock_open(read_data=file_contents)):
+            input = InputHandler(file_path)
+            transactions = input.iter_transactions()
+            first = next(transactions)
+            actual = [transaction.to_dict()
+                      for transaction in [first] + list(transactions)]
+
+        # Assert
+        expected = self.FILE_CONTENTS_FOR_TESTS
+        self.assertEqual(expected, actual)
+
+    def test_iter_transaction_batches_splits_into_batches(self):
+        """Yields the valid transactions in batches of the given size."""
+        # Arrange
+        file_contents = self.FILE_CONTENTS
+        file_path = "input/input_data.csv"
+
+        # Act
+        with patch('builtins.open', mock_open(read_data=file_contents)):
+            input = InputHandler(file_path)
+            actual = [[transaction.to_dict() for transaction in batch]
+                      for batch in input.iter_transaction_batches(2)]
+
+        # Assert
+        expected = [self.FILE_CONTENTS_FOR_TESTS[:2],
+                    self.FILE_CONTENTS_FOR_TESTS[2:]]
+        self.assertEqual(expected, actual)
+
+    def test_iter_transaction_batches_batch_size_less_than_one(self):
+        """Raises a ValueError when the batch size is less than 1."""
+        # Arrange
+        input = InputHandler("input/input_data.csv")
+
+        # Act
+        with self.assertRaises(ValueError):
+            list(input.iter_transaction_batches(0))
+
     # Tests for validating transactions
     def test_list_of_transactions_excludes_not_a_numeric_type(self):
         # Returns a list of transactions that excludes records
@@ -365,5 +473,19 @@ class InputHandlerTests(TestCase):
                 ]
         self.assertEqual(expected, actual)
 
+    def test_is_valid_transaction_not_a_number_amount(self):
+        """Test that an amount of "nan" is not valid, as in the baseline
+        amount > 0 check."""
+        # Arrange
+        input = InputHandler("input_data.csv")
+
+        # Act
+        actual = [input.is_valid_transaction({"Amount": amount,
+                                              "Transaction type": "deposit"})
+                  for amount in ("nan", "NaN", "10")]
+
+        # Assert
+        self.assertEqual([False, False, True], actual)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,145 @@
+"""This module is for making and running tests to test the json_stream module.
+To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_json_stream.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import io
+import json
+import unittest
+from unittest import TestCase
+from input_handler.json_stream import iter_json_array
+
+class CountingReader(io.StringIO):
+    """A text file that counts the characters read from it."""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.characters_read = 0
+
+    def read(self, size: int = -1) -> str:
+        chunk = super().read(size)
+        self.characters_read += len(chunk)
+        return chunk
+
+
+class JsonStreamTests(TestCase):
+    """Defines the unit tests for the iter_json_array function."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function.
+        """
+        self.TRANSACTIONS = [
+            {"Transaction ID": 1, "Account number": 1001,
+             "Transaction type": "deposit", "Amount": 1200.5,
+             "Currency": "CAD", "Description": "Salary, [bonus]"},
+            {"Transaction ID": 2, "Account number": 1002,
+             "Transaction type": "withdrawal", "Amount": 12345,
+             "Currency": "CAD", "Description": "Rent \"March\""}
+        ]
+
+    def test_iter_json_array_matches_json_load(self):
+        """Yields the same values as json.load for every chunk size."""
+        # Arrange
+        file_contents = json.dumps(self.TRANSACTIONS, indent=2)
+
+        for chunk_size in (1, 2, 7, 64, 4096):
+            # Act
+            actual = list(iter_json_array(io.StringIO(file_contents),
+                                          chunk_size))
+
+            # Assert
+            self.assertEqual(self.TRANSACTIONS, actual)
+
+    def test_iter_json_array_number_split_across_chunks(self):
+        """Does not cut a number in two when it ends a chunk."""
+        # Arrange
+        file_contents = "[1234567, 89]"
+
+        # Act
+        actual = list(iter_json_array(io.StringIO(file_contents), 3))
+
+        # Assert
+        self.assertEqual([1234567, 89], actual)
+
+    def test_iter_json_array_empty_array(self):
+        """Yields nothing for an empty array."""
+        # Act
+        actual = list(iter_json_array(io.StringIO(" [ ] ")))
+
+        # Assert
+        self.assertEqual([], actual)
+
+    def test_iter_json_array_not_an_array(self):
+        """Raises a JSONDecodeError when the file is not a json array."""
+        # Act
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('{"Amount": 1}')))
+
+    def test_iter_json_array_unterminated_array(self):
+        """Raises a JSONDecodeError when the array is never closed."""
+        # Act
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('[1, 2,'), 2))
+
+    def test_iter_json_array_trailing_comma(self):
+        """Raises a JSONDecodeError when the array has a trailing comma."""
+        # Act
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(io.StringIO('[1, 2, ]')))
+
+    def test_iter_json_array_number_ending_chunk(self):
+        """Does not split a number whose decimal point ends a chunk."""
+        # Act
+        actual = list(iter_json_array(io.StringIO("[123.5, 1e5]"), 1))
+
+        # Assert
+        self.assertEqual([123.5, 1e5], actual)
+
+    def test_iter_json_array_bad_value_stops_reading(self):
+        """Raises a JSONDecodeError for a bad value near the start without
+        reading the rest of the file.
+        """
+        # Arrange
+        for bad_value in ("x", '{"Amount": x}', '"bad \\q escape"'):
+            with self.subTest(bad_value=bad_value):
+                input_file = CountingReader(
+                    "[1, " + bad_value + ", " + ", ".join(
+                        json.dumps(self.TRANSACTIONS[0]) for _ in range(10000)) + "]")
+
+                # Act
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(input_file, 64))
+
+                # Assert
+                self.assertLessEqual(input_file.characters_read, 128)
+
+    def test_iter_json_array_extra_data(self):
+        """Raises a ValueError when there is more than whitespace after the
+        array, for every chunk size.
+        """
+        for chunk_size in (1, 2, 7, 4096):
+            for file_contents in ('[1, 2]\n[3]', '[1, 2] x', '[]  ,',
+                                  '[1, 2]' + " " * 10 + "}"):
+                with self.subTest(chunk_size=chunk_size,
+                                  file_contents=file_contents):
+                    # Act
+                    with self.assertRaises(ValueError):
+                        list(iter_json_array(io.StringIO(file_contents),
+                                             chunk_size))
+
+    def test_iter_json_array_trailing_whitespace(self):
+        """Yields the values when only whitespace follows the array."""
+        for chunk_size in (1, 2, 4096):
+            # Act
+            actual = list(iter_json_array(io.StringIO('[1, 2] \r\n\t \n'),
+                                          chunk_size))
+
+            # Assert
+            self.assertEqual([1, 2], actual)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""This module is for making and running tests to test the money module.
+To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_money.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import random
+import unittest
+from decimal import Decimal
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from input_handler.input_handler import InputHandler
+from transaction.money import format_minor_units, parse_minor_units
+
+class MoneyTests(TestCase):
+    """Defines the unit tests for the money functions."""
+
+    def test_parse_minor_units_plain_strings(self):
+        """Parses plain decimal strings without a float."""
+        # Arrange
+        amounts = {"12.34": 1234, "-12.34": -1234, ".05": 5, "+1.50": 150,
+                   "1": 100, "1.5": 150, " 7.10 ": 710, "0.1": 10}
+
+        # Act
+        actual = {amount: parse_minor_units(amount) for amount in amounts}
+
+        # Assert
+        self.assertEqual(amounts, actual)
+
+    def test_parse_minor_units_spaces_around_amount(self):
+        """Parses amounts with spaces around them the same as without."""
+        # Arrange
+        amounts = {"12.5 ": 1250, " 12.5": 1250, "12.50 ": 1250, "-3.25\t": -325,
+                   "1.5 \n": 150}
+
+        # Act
+        actual = {amount: parse_minor_units(amount) for amount in amounts}
+
+        # Assert
+        self.assertEqual(amounts, actual)
+
+    def test_parse_minor_units_rounds_half_to_even(self):
+        """Rounds extra decimal places and exponents through Decimal."""
+        # Act and Assert
+        self.assertEqual(12, parse_minor_units("0.125"))
+        self.assertEqual(14, parse_minor_units("0.135"))
+        self.assertEqual(100000, parse_minor_units("1e3"))
+
+    def test_parse_minor_units_numbers(self):
+        """Parses int and float amounts."""
+        # Act and Assert
+        self.assertEqual(1000, parse_minor_units(10))
+        self.assertEqual(110, parse_minor_units(1.1))
+
+    def test_parse_minor_units_parsed_float_matches_string(self):
+        """Gets the same minor units from the parsed float as the string."""
+        # Arrange
+        generator = random.Random(7)
+        amounts = [f"{generator.randint(-10 ** 12, 10 ** 12) / 100:.2f}"
+                   for _ in range(1000)] + ["0.125", "1e3", "99999999999999.99"]
+
+        # Act
+        actual = [parse_minor_units(amount, parsed=float(amount))
+                  for amount in amounts]
+
+        # Assert
+        self.assertEqual([parse_minor_units(amount) for amount in amounts], actual)
+
+    def test_parse_minor_units_not_a_number(self):
+        """Raises ValueError for amounts that are not finite numbers."""
+        for amount in ["abc", "", "nan", "1.-5", "1. 5", "1 .50", None]:
+            with self.subTest(amount=amount):
+                with self.assertRaises(ValueError):
+                    parse_minor_units(amount)
+
+    def test_format_minor_units(self):
+        """Formats minor units with exactly scale decimal places."""
+        # Act and Assert
+        self.assertEqual("1234.56", format_minor_units(123456))
+        self.assertEqual("-0.05", format_minor_units(-5))
+        self.assertEqual("0.00", format_minor_units(0))
+        self.assertEqual("12", format_minor_units(12, 0))
+
+    def test_data_processor_minor_units_exact(self):
+        """Adds up amounts exactly in the minor_units money mode."""
+        # Arrange
+        transactions = [{"Transaction ID": str(index),
+                         "Account number": "1001",
+                         "Transaction type": "deposit",
+                         "Amount": "0.10",
+                         "Currency": "CAD"}
+                        for index in range(1, 11)]
+
+        # Act
+        processor = DataProcessor(transactions, money_mode="minor_units")
+        result = processor.process_data()
+
+        # Assert
+        self.assertEqual(100, result["account_summaries"]["1001"]["balance"])
+        self.assertEqual(100, result["transaction_statistics"]["deposit"]["total_amount"])
+        self.assertEqual(Decimal("0.1"),
+                         Decimal(str(processor.get_average_transaction_amount("deposit"))))
+
+    def test_data_processor_minor_units_skips_infinite_amount(self):
+        """Skips a valid row whose amount has no minor units instead of
+        stopping part way through the input."""
+        # Arrange
+        transactions = InputHandler("input_data.csv").data_validation([
+            {"Transaction ID": str(index), "Account number": "1001",
+             "Transaction type": "deposit", "Amount": amount, "Currency": "CAD"}
+            for index, amount in enumerate(["1.00", "inf", "2.50", "-inf"], 1)])
+        processor = DataProcessor(transactions, money_mode="minor_units")
+
+        # Act
+        result = processor.process_data()
+
+        # Assert
+        self.assertEqual(3, len(transactions))
+        self.assertEqual(350, result["account_summaries"]["1001"]["balance"])
+        self.assertEqual(2, result["transaction_statistics"]["deposit"]["transaction_count"])
+        self.assertEqual(1, processor.skipped_amount_count)
+
+    def test_data_processor_money_mode_not_valid(self):
+        """Raises ValueError for an unknown money mode."""
+        with self.assertRaises(ValueError):
+            DataProcessor([], money_mode="decimal")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""This module is for making and running tests to test the multi_input_handler
+module. To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_multi_input_handler.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from input_handler.multi_input_handler import MultiInputHandler
+
+class MultiInputHandlerTests(TestCase):
+    """Defines the unit tests for the MultiInputHandler class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function. It writes one csv file per branch to a temporary
+        directory.
+        """
+        header = ("Transaction ID,Account number,Date,Transaction type,"
+                  + "Amount,Currency,Description\n")
+        self.FILES = {
+            "branch_1.csv": header
+                + "1,1001,2023-03-01,deposit,1000,CAD,Salary\n"
+                + "2,1001,2023-03-04,withdrawal,200,CAD,Groceries\n",
+            "branch_2.csv": header
+                + "3,1002,2023-03-02,deposit,1500,CAD,Salary\n"
+                + "4,1002,2023-03-03,deposit,abc,CAD,Bad\n"
+                + "5,1002,2023-03-05,withdrawal,300,CAD,Shopping\n",
+            "branch_3.csv": header
+                + "6,1003,2023-03-01,deposit,5000,CAD,Salary\n"
+        }
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        for file_name, file_contents in self.FILES.items():
+            with open(os.path.join(self.directory, file_name), "w") as output_file:
+                output_file.write(file_contents)
+
+    def test_expand_file_paths_glob(self):
+        """Returns the sorted paths a glob pattern matches."""
+        # Act
+        actual = MultiInputHandler.expand_file_paths(
+            os.path.join(self.directory, "branch_*.csv"))
+
+        # Assert
+        expected = [os.path.join(self.directory, file_name)
+                    for file_name in sorted(self.FILES)]
+        self.assertEqual(expected, actual)
+
+    def test_iter_transactions_in_file_order(self):
+        """Yields the transactions of each file one file after the other."""
+        # Arrange
+        input = MultiInputHandler(os.path.join(self.directory, "*.csv"),
+                                  workers=2)
+
+        # Act
+        actual = [transaction.transaction_id
+                  for transaction in input.iter_transactions()]
+
+        # Assert
+        self.assertEqual(["1", "2", "3", "5", "6"], actual)
+
+    def test_iter_transactions_merge_by_date(self):
+        """Yields the transactions of every file in date order."""
+        # Arrange
+        input = MultiInputHandler(os.path.join(self.directory, "*.csv"),
+                                  merge_by_date=True)
+
+        # Act
+        actual = [transaction.transaction_id
+                  for transaction in input.iter_transactions()]
+
+        # Assert
+        self.assertEqual(["1", "6", "3", "2", "5"], actual)
+
+    def test_iter_transactions_merge_by_date_missing_date(self):
+        """Yields a valid transaction without a Date after the dated ones
+        instead of failing to compare it."""
+        # Arrange
+        with open(os.path.join(self.directory, "branch_4.json"), "w") as output_file:
+            output_file.write('[{"Transaction ID": "7", "Account number": "1004", '
+                              '"Transaction type": "deposit", "Amount": "10", '
+                              '"Currency": "CAD"}, '
+                              '{"Transaction ID": "8", "Account number": "1004", '
+                              '"Date": "2023-03-02", "Transaction type": "deposit", '
+                              '"Amount": "20", "Currency": "CAD"}]')
+        input = MultiInputHandler(os.path.join(self.directory, "branch_*"),
+                                  merge_by_date=True)
+
+        # Act
+        actual = [transaction.transaction_id
+                  for transaction in input.iter_transactions()]
+
+        # Assert
+        self.assertEqual(["1", "6", "3", "2", "5", "7", "8"], actual)
+
+    def test_file_reports_count_transactions_and_rejected_rows(self):
+        """Reports the number of transactions and rejected rows per file."""
+        # Arrange
+        input = MultiInputHandler(os.path.join(self.directory, "*.csv"))
+
+        # Act
+        list(input.iter_transactions())
+
+        # Assert
+        actual = [(report["transactions"], report["rejected"])
+                  for report in input.file_reports]
+        self.assertEqual([(2, 0), (2, 1), (1, 0)], actual)
+
+    def test_iter_transactions_file_path_does_not_exist(self):
+        """Raises a FileNotFoundError when a file does not exist."""
+        # Arrange
+        input = MultiInputHandler([os.path.join(self.directory, "branch_1.csv"),
+                                   os.path.join(self.directory, "missing.csv")])
+
+        # Act
+        with self.assertRaises(FileNotFoundError):
+            list(input.iter_transactions())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,12 @@ __version__ = "1.0"
 
 from unittest import TestCase, main
 from unittest.mock import patch, mock_open
+from data_processor.account_store import AccountSummaryStore
+from data_processor.cardinality import HyperLogLog
+from data_processor.distribution import AmountDistribution
+from data_processor.rollups import TimeRollups
 from output_handler.output_handler import OutputHandler
+from transaction.transaction import Transaction
 
 class TestOutputHandler(TestCase):
     """Defines the unit tests for the OutputHandler class."""
@@ -132,6 +137,30 @@ class TestOutputHandler(TestCase):
         expected_calls = len(self.account_summaries) + 1
         self.assertEqual(mock_file().write.call_count, expected_calls)
 
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_account_summaries_to_csv_store(self, mock_file):
+        """Test writing account summaries from an AccountSummaryStore."""
+        # Arrange - Create handler with the summaries in a store
+        store = AccountSummaryStore()
+        for account_number, summary in self.account_summaries.items():
+            store[account_number] = summary
+        handler = OutputHandler(
+            store,
+            self.suspicious_transactions,
+            self.transaction_statistics
+        )
+
+        # Act - Write to CSV
+        handler.write_account_summaries_to_csv('test.csv')
+
+        # Assert - Verify the same rows as from the dictionary
+        written = [call.args[0].rstrip() for call in mock_file().write.call_args_list]
+        self.assertEqual(len(self.account_summaries) + 1, len(written))
+        self.assertEqual(f"1001,{self.account_summaries['1001']['balance']},"
+                         f"{self.account_summaries['1001']['total_deposits']},"
+                         f"{self.account_summaries['1001']['total_withdrawals']}",
+                         written[1])
+
     @patch('builtins.open', new_callable=mock_open)
     def test_write_suspicious_transactions_to_csv(self, mock_file):
         """Test writing suspicious transactions to CSV file."""
@@ -150,6 +179,171 @@ class TestOutputHandler(TestCase):
         expected_calls = len(self.suspicious_transactions) + 1
         self.assertEqual(mock_file().write.call_count, expected_calls)
 
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_suspicious_transactions_to_csv_rule_names(self, mock_file):
+        """Test the Rule column is written when rule names are given."""
+        # Arrange - Setup handler with a rule name for each transaction
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics,
+            ["large_transaction"] * len(self.suspicious_transactions)
+        )
+
+        # Act - Execute CSV write operation
+        handler.write_suspicious_transactions_to_csv('test.csv')
+
+        # Assert - Verify the header and rows end with the rule
+        written = [call.args[0] for call in mock_file().write.call_args_list]
+        self.assertTrue(written[0].rstrip().endswith("Description,Rule"))
+        self.assertTrue(written[1].rstrip().endswith(",large_transaction"))
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_account_summaries_to_csv_minor_units(self, mock_file):
+        """Test minor unit totals are written as decimal strings."""
+        # Arrange - Create handler with totals in cents
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics,
+            minor_unit_scale=2
+        )
+
+        # Act - Write to CSV
+        handler.write_account_summaries_to_csv('test.csv')
+
+        # Assert - Verify the cents are formatted
+        written = [call.args[0] for call in mock_file().write.call_args_list]
+        self.assertEqual("1001,0.50,1.00,0.50", written[1].rstrip())
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_transaction_statistics_to_csv_distributions(self, mock_file):
+        """Test the distribution columns are written when given."""
+        # Arrange - Create handler with a distribution for deposits only
+        distribution = AmountDistribution()
+        for amount in (100, 200):
+            distribution.add(amount)
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics,
+            amount_distributions={"transaction_type": {"deposit": distribution},
+                                  "currency": {"CAD": distribution}}
+        )
+
+        # Act - Write both statistics files
+        handler.write_transaction_statistics_to_csv('test.csv')
+        handler.write_currency_statistics_to_csv('currency.csv')
+
+        # Assert - Verify the columns and values
+        written = [call.args[0].rstrip() for call in mock_file().write.call_args_list]
+        self.assertTrue(written[0].endswith("Std dev,Min,Max,P50,P95,P99"))
+        self.assertTrue(written[1].startswith("deposit,300,2,50.0,100,200,"))
+        self.assertEqual("withdrawal,50,1,,,,,,", written[2])
+        self.assertTrue(written[4].startswith("CAD,2,150.0,50.0,100,200,"))
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_unique_accounts_to_csv(self, mock_file):
+        """Test the Unique accounts column and the daily unique accounts."""
+        # Arrange - Create handler with sketches of the deposit accounts
+        sketch = HyperLogLog()
+        for account_number in ("1001", "1002", "1001"):
+            sketch.add(account_number)
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics,
+            unique_accounts={"transaction_type": {"deposit": sketch},
+                             "currency": {"CAD": sketch},
+                             "date": {"2023-03-01": sketch}}
+        )
+
+        # Act - Write the statistics and daily files
+        handler.write_transaction_statistics_to_csv('test.csv')
+        handler.write_daily_unique_accounts_to_csv('daily.csv')
+
+        # Assert - Verify the estimates are written
+        written = [call.args[0].rstrip() for call in mock_file().write.call_args_list]
+        self.assertEqual("Transaction type,Total amount,Transaction count,Unique accounts",
+                         written[0])
+        self.assertEqual("deposit,300,2,2", written[1])
+        self.assertEqual("withdrawal,50,1,", written[2])
+        self.assertEqual(["Date,Unique accounts", "2023-03-01,2"], written[3:])
+
+    def test_write_daily_unique_accounts_to_csv_without_sketches(self):
+        """Test the daily unique accounts need the sketches."""
+        # Arrange - Create handler without sketches
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics
+        )
+
+        # Act and Assert - Verify the error
+        with self.assertRaises(ValueError):
+            handler.write_daily_unique_accounts_to_csv('daily.csv')
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_account_rollups_to_csv(self, mock_file):
+        """Test writing the monthly totals of each account."""
+        # Arrange - Create handler with rollups of two months of 1001
+        rollups = TimeRollups()
+        for transaction_id, date, transaction_type, amount in (
+                ("1", "2023-02-10", "deposit", 100),
+                ("2", "2023-03-01", "deposit", 50),
+                ("3", "2023-03-02", "withdrawal", 30)):
+            rollups.add(Transaction(transaction_id, "1001", date, transaction_type,
+                                    amount, "CAD", "Test"), amount)
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics,
+            rollups=rollups
+        )
+
+        # Act - Write the monthly rollups
+        handler.write_account_rollups_to_csv('rollups.csv')
+
+        # Assert - Verify the buckets and running balances
+        written = [call.args[0].rstrip() for call in mock_file().write.call_args_list]
+        self.assertEqual(["1001,2023-02,100,100,0,1,100",
+                          "1001,2023-03,20,50,30,2,120"], written[1:])
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_write_currency_balances_to_csv(self, mock_file):
+        """Test writing the balance of each account in each currency."""
+        # Arrange - Create handler with balances in two currencies
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics,
+            currency_balances={"1001": {"USD": 10, "CAD": 100}, "1002": {"CAD": -5}},
+            reporting_balances={"1001": 113, "1002": -5},
+            reporting_currency="CAD"
+        )
+
+        # Act - Write the currency balances
+        handler.write_currency_balances_to_csv('balances.csv')
+
+        # Assert - Verify a column for each currency and the total
+        written = [call.args[0].rstrip() for call in mock_file().write.call_args_list]
+        self.assertEqual(["Account number,CAD,USD,Total (CAD)",
+                          "1001,100,10,113",
+                          "1002,-5,,-5"], written)
+
+    def test_write_currency_statistics_to_csv_without_distributions(self):
+        """Test currency statistics need the distributions."""
+        # Arrange - Create handler without distributions
+        handler = OutputHandler(
+            self.account_summaries,
+            self.suspicious_transactions,
+            self.transaction_statistics
+        )
+
+        # Act and Assert - Verify the error
+        with self.assertRaises(ValueError):
+            handler.write_currency_statistics_to_csv('currency.csv')
+
     @patch('builtins.open', new_callable=mock_open)
     def test_write_transaction_statistics_to_csv(self, mock_file):
         """Test writing transaction statistics to CSV file."""
@@ -0,0 +1,130 @@
+"""This module is for making and running tests to test the parallel_reader
+module. To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_parallel_reader.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import json
+import mmap
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+from input_handler.input_handler import InputHandler
+from input_handler import parallel_reader
+
+class ParallelReaderTests(TestCase):
+    """Defines the unit tests for the parallel_reader module."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function. It writes a csv file to a temporary directory.
+        """
+        self.FILE_CONTENTS = \
+            ("Transaction ID,Account number,Date,Transaction type,"
+            + "Amount,Currency,Description\n"
+            + "1,1001,2023-03-01,deposit,1000,CAD,Salary\n"
+            + "2,1002,2023-03-01,deposit,-1500,CAD,Salary\n"
+            + "3,1001,2023-03-02,withdrawal,200,CAD,\"Groceries, milk\"\n"
+            + "4,1003,2023-03-02,a,200,CAD,Groceries\n"
+            + "5,1002,2023-03-03,transfer,abc,CAD,Savings\n"
+            + "6,1004,2023-03-04,deposit,12000,XRP,Crypto")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, "input_data.csv")
+        with open(self.file_path, "w") as output_file:
+            output_file.write(self.FILE_CONTENTS)
+
+    def test_split_byte_ranges_end_on_newlines(self):
+        """Returns ranges that cover the file and end just after newlines."""
+        # Arrange
+        with open(self.file_path, "rb") as input_file:
+            with mmap.mmap(input_file.fileno(), 0,
+                           access=mmap.ACCESS_READ) as mapped_file:
+                header, start = parallel_reader.read_header(mapped_file)
+
+                # Act
+                actual = parallel_reader.split_byte_ranges(mapped_file,
+                                                           start, 3)
+                contents = mapped_file[:]
+
+        # Assert
+        self.assertEqual(7, len(header))
+        self.assertEqual(start, actual[0][0])
+        self.assertEqual(len(contents), actual[-1][1])
+        for (_, end), (next_start, _) in zip(actual, actual[1:]):
+            self.assertEqual(end, next_start)
+            self.assertEqual(b"\n", contents[end - 1:end])
+
+    def test_iter_transactions_parallel_matches_serial_reader(self):
+        """Yields the same transactions in the same order as the serial
+        reader when the file is split between several workers."""
+        # Arrange
+        input = InputHandler(self.file_path)
+        expected = list(input.iter_transactions())
+
+        # Act
+        with patch.object(parallel_reader, "MIN_CHUNK_SIZE", 1):
+            actual = list(input.iter_transactions_parallel(workers=2))
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(["1", "3", "6"],
+                         [transaction.transaction_id for transaction in actual])
+
+    def test_iter_transactions_parallel_quoted_newlines(self):
+        """Yields the same transactions as the serial reader when quoted
+        fields contain newlines."""
+        # Arrange
+        with open(self.file_path, "w", newline="") as output_file:
+            output_file.write("Transaction ID,Account number,Date,Transaction type,"
+                              "Amount,Currency,Description\n")
+            for index in range(200):
+                description = "\"multi\nline \"\"quoted\"\"\"" if index % 3 == 0 \
+                    else "Salary"
+                output_file.write(f"{index},1001,2023-03-01,deposit,100,CAD,"
+                                  f"{description}\n")
+        input = InputHandler(self.file_path)
+        expected = list(input.iter_transactions())
+
+        # Act
+        with patch.object(parallel_reader, "MIN_CHUNK_SIZE", 16):
+            actual = list(input.iter_transactions_parallel(workers=4))
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual('multi\nline "quoted"', actual[3].description)
+
+    def test_iter_transactions_parallel_ndjson_matches_serial_reader(self):
+        """Yields the same transactions in the same order as the serial
+        reader for a json lines file split between several workers."""
+        # Arrange
+        rows = InputHandler(self.file_path).read_csv_data()
+        file_path = self.file_path.replace(".csv", ".ndjson")
+        with open(file_path, "w") as output_file:
+            output_file.write("\n".join(json.dumps(row) for row in rows))
+        input = InputHandler(file_path)
+        expected = list(input.iter_transactions())
+
+        # Act
+        with patch.object(parallel_reader, "MIN_CHUNK_SIZE", 1):
+            actual = list(input.iter_transactions_parallel(workers=2))
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(3, len(actual))
+
+    def test_iter_transactions_parallel_file_path_does_not_exist(self):
+        """Raises a FileNotFoundError when the file path does not exist."""
+        # Arrange
+        input = InputHandler("file_does_not_exist.csv")
+
+        # Act
+        with self.assertRaises(FileNotFoundError):
+            list(input.iter_transactions_parallel())
+
+if __name__ == "__main__":
+    unittest.main()
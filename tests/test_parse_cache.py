@@ -0,0 +1,129 @@
+"""This module is for making and running tests to test the parse_cache module.
+To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_parse_cache.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+from input_handler.input_handler import InputHandler
+from input_handler.parse_cache import ParseCache
+
+class ParseCacheTests(TestCase):
+    """Defines the unit tests for the ParseCache class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function. It writes a csv file and makes a cache directory in a
+        temporary directory.
+        """
+        self.FILE_CONTENTS = \
+            ("Transaction ID,Account number,Date,Transaction type,"
+            + "Amount,Currency,Description\n"
+            + "1,1001,2023-03-01,deposit,1000,CAD,Salary\n"
+            + "2,1002,2023-03-01,deposit,abc,CAD,Salary\n"
+            + "3,1001,2023-03-02,withdrawal,200,CAD,Groceries\n")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, "input_data.csv")
+        self.cache_directory = os.path.join(directory.name, "cache")
+        with open(self.file_path, "w") as output_file:
+            output_file.write(self.FILE_CONTENTS)
+
+    def cache_files(self) -> list:
+        """Gets the names of the cache files."""
+        return [file_name for file_name in os.listdir(self.cache_directory)
+                if file_name.endswith(".cache")]
+
+    def test_second_read_loads_from_cache(self):
+        """Returns the same transactions without parsing the file again."""
+        # Arrange
+        input = InputHandler(self.file_path, self.cache_directory)
+        expected = list(input.iter_transactions())
+
+        # Act
+        with patch.object(InputHandler, "iter_input_rows") as iter_input_rows:
+            actual = list(input.iter_transactions())
+
+        # Assert
+        iter_input_rows.assert_not_called()
+        self.assertEqual(expected, actual)
+        self.assertEqual(["1", "3"],
+                         [transaction.transaction_id for transaction in actual])
+        self.assertEqual(1, len(self.cache_files()))
+
+    def test_changed_file_is_parsed_again(self):
+        """Parses the file again and replaces the old cache file when the
+        file changes."""
+        # Arrange
+        input = InputHandler(self.file_path, self.cache_directory)
+        list(input.iter_transactions())
+        with open(self.file_path, "a") as output_file:
+            output_file.write("4,1003,2023-03-03,deposit,50,CAD,Gift\n")
+
+        # Act
+        actual = list(input.iter_transactions())
+
+        # Assert
+        self.assertEqual(["1", "3", "4"],
+                         [transaction.transaction_id for transaction in actual])
+        self.assertEqual(1, len(self.cache_files()))
+
+    def test_partly_read_file_is_not_cached(self):
+        """Does not keep a cache file when not every transaction was read."""
+        # Arrange
+        input = InputHandler(self.file_path, self.cache_directory)
+
+        # Act
+        transactions = input.iter_transactions()
+        next(transactions)
+        transactions.close()
+
+        # Assert
+        self.assertEqual([], os.listdir(self.cache_directory))
+
+    def test_quarantine_written_on_every_read(self):
+        """Does not use the cache when rejected rows are quarantined, so
+        each read writes them and counts them."""
+        for read in range(2):
+            with self.subTest(read=read):
+                # Arrange
+                quarantine_path = os.path.join(self.cache_directory,
+                                               f"quarantine_{read}.csv")
+                input = InputHandler(self.file_path, self.cache_directory,
+                                     quarantine_path=quarantine_path)
+
+                # Act
+                actual = list(input.iter_transactions())
+
+                # Assert
+                self.assertEqual(["1", "3"], [transaction.transaction_id
+                                              for transaction in actual])
+                self.assertEqual(1, input.rejected_count)
+                self.assertEqual({"NON_NUMERIC_AMOUNT": 1}, input.rejection_counts)
+                with open(quarantine_path) as quarantine_file:
+                    self.assertIn("abc", quarantine_file.read())
+
+    def test_evict_removes_least_recently_used(self):
+        """Deletes the least recently used files when over max_bytes."""
+        # Arrange
+        cache = ParseCache(self.cache_directory, max_bytes=10)
+        for index, file_name in enumerate(["a.cache", "b.cache", "c.cache"]):
+            file_path = os.path.join(self.cache_directory, file_name)
+            with open(file_path, "wb") as output_file:
+                output_file.write(b"12345")
+            os.utime(file_path, ns=(index, index))
+
+        # Act
+        cache.evict()
+
+        # Assert
+        self.assertEqual(["b.cache", "c.cache"], sorted(self.cache_files()))
+
+if __name__ == "__main__":
+    unittest.main()
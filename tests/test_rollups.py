@@ -0,0 +1,226 @@
+"""
+Test suite for the time-bucketed rollups.
+
+Validates the daily and monthly buckets, the range queries, the balances as
+of a date, merging, saving the rollups and the rollups DataProcessor keeps.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import os
+import random
+import tempfile
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.rollups import TimeRollups, get_day, parse_day
+from data_processor.sharded_processor import ShardedDataProcessor
+from transaction.transaction import Transaction
+
+
+class TestTimeRollups(TestCase):
+    """Defines the unit tests for the TimeRollups class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        generator = random.Random(7)
+        self.transactions = [
+            Transaction(str(index), str(1000 + generator.randrange(5)),
+                        f"2023-{generator.randint(1, 3):02d}-{generator.randint(1, 28):02d}",
+                        generator.choice(["deposit", "withdrawal", "transfer"]),
+                        generator.randint(1, 500), "CAD", "Test")
+            for index in range(1000)]
+
+    def make_rollups(self, transactions: list) -> TimeRollups:
+        """Makes rollups of the transactions."""
+        rollups = TimeRollups()
+        for transaction in transactions:
+            rollups.add(transaction, transaction.amount)
+        return rollups
+
+    def expected_balance(self, account_number: str, day: str) -> int:
+        """Adds up the balance of an account up to a day from the rows."""
+        balance = 0
+        for transaction in self.transactions:
+            if transaction.account_number == account_number and transaction.date <= day:
+                if transaction.transaction_type == "deposit":
+                    balance += transaction.amount
+                elif transaction.transaction_type == "withdrawal":
+                    balance -= transaction.amount
+        return balance
+
+    def test_balance_as_of_matches_rescan(self):
+        # Act
+        rollups = self.make_rollups(self.transactions)
+
+        # Assert
+        for day in ("2022-12-31", "2023-01-01", "2023-02-14", "2023-03-15 10:00", "2024-01-01"):
+            for account_number in ("1000", "1003"):
+                self.assertEqual(self.expected_balance(account_number, day[:10]),
+                                 rollups.balance_as_of(account_number, day),
+                                 f"{account_number} {day}")
+
+    def test_balances_as_of_after_more_transactions(self):
+        # Arrange
+        rollups = self.make_rollups(self.transactions[:500])
+        rollups.balances_as_of("2023-03-31")
+
+        # Act
+        for transaction in self.transactions[500:]:
+            rollups.add(transaction, transaction.amount)
+
+        # Assert
+        self.assertEqual({account_number: self.expected_balance(account_number, "2023-02-28")
+                          for account_number in rollups.balances_as_of("2023-02-28")},
+                         rollups.balances_as_of("2023-02-28"))
+
+    def test_month_buckets(self):
+        # Act
+        rollups = self.make_rollups(self.transactions)
+
+        # Assert
+        months = rollups.account_rollups("1002", "month")
+        self.assertEqual(["2023-01", "2023-02", "2023-03"], [period for period, _ in months])
+        self.assertEqual(sum(1 for transaction in self.transactions
+                             if transaction.account_number == "1002"),
+                         sum(bucket["transaction_count"] for _, bucket in months))
+        self.assertEqual(sum(transaction.amount for transaction in self.transactions
+                             if transaction.transaction_type == "deposit"
+                             and transaction.date.startswith("2023-02")),
+                         rollups.type_rollups("deposit", "month")[1][1]["total_amount"])
+
+    def test_account_rollups_range(self):
+        # Arrange
+        rollups = self.make_rollups(self.transactions)
+
+        # Act
+        days = rollups.account_rollups("1001", "day", "2023-02-01", "2023-02-28")
+        months = rollups.account_rollups("1001", "month", "2023-02-15", "2023-03-15")
+
+        # Assert
+        self.assertTrue(days)
+        self.assertTrue(all(period.startswith("2023-02") for period, _ in days))
+        self.assertEqual(sorted(period for period, _ in days), [period for period, _ in days])
+        self.assertEqual(["2023-02", "2023-03"], [period for period, _ in months])
+
+    def test_undated_and_invalid_dates(self):
+        # Arrange
+        rollups = TimeRollups()
+
+        # Act
+        added = rollups.add(Transaction("1", "1001", "", "deposit", 5, "CAD", "Test"), 5)
+
+        # Assert
+        self.assertFalse(added)
+        self.assertEqual(1, rollups.undated_count)
+        self.assertEqual(0, rollups.balance_as_of("1001", "2023-03-01"))
+        with self.assertRaises(ValueError):
+            rollups.balance_as_of("1001", "not a date")
+        with self.assertRaises(ValueError):
+            rollups.account_rollups("1001", "week")
+
+    def test_days_parsed_once(self):
+        # Arrange
+        parse_day.cache_clear()
+
+        # Act
+        for _ in range(100):
+            get_day("2023-03-01 10:00")
+
+        # Assert
+        self.assertEqual(1, parse_day.cache_info().misses)
+
+    def test_merge_matches_single_pass(self):
+        # Arrange
+        expected = self.make_rollups(self.transactions)
+
+        # Act
+        merged = self.make_rollups(self.transactions[:300]).merge(
+            self.make_rollups(self.transactions[300:]))
+
+        # Assert
+        self.assertEqual(expected.balances_as_of("2023-02-15"),
+                         merged.balances_as_of("2023-02-15"))
+        self.assertEqual(expected.type_rollups("withdrawal"), merged.type_rollups("withdrawal"))
+
+    def test_to_dict_round_trip(self):
+        # Arrange
+        rollups = self.make_rollups(self.transactions)
+
+        # Act
+        rebuilt = TimeRollups.from_dict(rollups.to_dict())
+
+        # Assert
+        self.assertEqual(rollups.account_rollups("1004"), rebuilt.account_rollups("1004"))
+        self.assertEqual(rollups.balances_as_of("2023-03-01"),
+                         rebuilt.balances_as_of("2023-03-01"))
+
+
+class TestDataProcessorRollups(TestCase):
+    """Defines the unit tests for the rollups of the processors."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.transactions = [{"Transaction ID": str(index),
+                              "Account number": str(1000 + index % 4),
+                              "Date": f"2023-03-{1 + index // 10:02d}",
+                              "Transaction type": "deposit" if index % 3 else "withdrawal",
+                              "Amount": "10.10",
+                              "Currency": "CAD"}
+                             for index in range(100)]
+
+    def test_data_processor_rollups(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, track_rollups=True,
+                                  money_mode="minor_units")
+
+        # Act
+        processor.process_data()
+
+        # Assert
+        balances = processor.rollups.balances_as_of("2023-03-31")
+        self.assertEqual({account_number: summary["balance"] for account_number, summary
+                          in processor.account_summaries.items()}, balances)
+        self.assertEqual(1010, processor.rollups.balance_as_of("1001", "2023-03-01"))
+
+    def test_sharded_processor_rollups(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, track_rollups=True)
+        sharded = ShardedDataProcessor(self.transactions, workers=2, track_rollups=True)
+
+        # Act
+        processor.process_data()
+        sharded.process_data()
+
+        # Assert
+        self.assertEqual(processor.rollups.balances_as_of("2023-03-05"),
+                         sharded.rollups.balances_as_of("2023-03-05"))
+
+    def test_snapshot_keeps_rollups(self):
+        # Arrange
+        first = DataProcessor(self.transactions[:50], track_rollups=True)
+        first.process_data()
+        expected = DataProcessor(self.transactions, track_rollups=True)
+        expected.process_data()
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "state.snap")
+            first.save_snapshot(snapshot_path)
+            resumed = DataProcessor(self.transactions, track_rollups=True)
+
+            # Act
+            resumed.load_snapshot(snapshot_path)
+            resumed.process_data()
+
+        # Assert
+        self.assertEqual(expected.rollups.account_rollups("1002"),
+                         resumed.rollups.account_rollups("1002"))
+
+    def test_no_rollups_by_default(self):
+        # Act
+        processor = DataProcessor([])
+
+        # Assert
+        self.assertIsNone(processor.rollups)
@@ -0,0 +1,127 @@
+"""
+Test suite for the suspicious transaction rule engine.
+
+Validates rule compilation, single and batch matching and the rule names
+DataProcessor records for flagged transactions.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.rules import RuleEngine, compile_rule, default_rules
+from transaction.transaction import Transaction
+
+
+class TestRuleEngine(TestCase):
+    """Defines the unit tests for the RuleEngine class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        self.rules = [
+            {"name": "deny_list", "account_numbers": ["1003"]},
+            {"name": "large_usd", "currencies": ["USD"], "amount_above": 5000},
+            {"name": "gambling", "description_keywords": ["casino", "bet.com"]},
+            {"name": "large_transfer", "transaction_types": ["transfer"],
+             "amount_above": 2000}
+        ]
+        rows = [
+            ("1", "1001", "deposit", "6000", "USD", "Salary"),
+            ("2", "1002", "deposit", "6000", "CAD", "Salary"),
+            ("3", "1003", "deposit", "10", "CAD", "Coffee"),
+            ("4", "1001", "withdrawal", "50", "CAD", "Grand CASINO night"),
+            ("5", "1002", "transfer", "2500", "CAD", ""),
+            ("6", "1002", "withdrawal", "50", "CAD", "betXcom")
+        ]
+        self.transactions = [
+            Transaction.from_row({"Transaction ID": transaction_id,
+                                  "Account number": account_number,
+                                  "Transaction type": transaction_type,
+                                  "Amount": amount,
+                                  "Currency": currency,
+                                  "Description": description})
+            for transaction_id, account_number, transaction_type, amount,
+            currency, description in rows]
+
+    def test_match(self):
+        # Arrange
+        engine = RuleEngine(self.rules)
+
+        # Act
+        matches = [engine.match(transaction) for transaction in self.transactions]
+
+        # Assert
+        self.assertEqual(["large_usd", None, "deny_list", "gambling",
+                          "large_transfer", None], matches)
+
+    def test_match_batch_matches_single(self):
+        # Arrange
+        engine = RuleEngine(self.rules)
+
+        # Act
+        matches = engine.match_batch(self.transactions)
+
+        # Assert
+        self.assertEqual([engine.match(transaction)
+                          for transaction in self.transactions], matches)
+
+    def test_first_rule_in_definition_order_wins(self):
+        # Arrange
+        engine = RuleEngine([{"name": "any_usd", "currencies": ["USD"]}]
+                            + self.rules)
+
+        # Act
+        match = engine.match_batch(self.transactions[:1])
+
+        # Assert
+        self.assertEqual(["any_usd"], match)
+
+    def test_compile_rule_orders_regex_last(self):
+        # Act
+        _, conditions = compile_rule({"name": "rule",
+                                      "description_keywords": ["x"],
+                                      "amount_above": 1,
+                                      "currencies": ["USD"]})
+
+        # Assert
+        self.assertEqual(["currency", "amount", "description"],
+                         [attribute for attribute, _, _ in conditions])
+
+    def test_compile_rule_unknown_condition(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            compile_rule({"name": "rule", "amount_below": 5})
+
+    def test_compile_rule_no_name(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            compile_rule({"amount_above": 5})
+
+    def test_data_processor_records_rule_names(self):
+        # Arrange
+        processor = DataProcessor(self.transactions, rules=self.rules)
+
+        # Act
+        result = processor.process_data()
+
+        # Assert
+        self.assertEqual(["1", "3", "4", "5"],
+                         [transaction["Transaction ID"]
+                          for transaction in result["suspicious_transactions"]])
+        self.assertEqual(["large_usd", "deny_list", "gambling", "large_transfer"],
+                         processor.suspicious_rule_names)
+
+    def test_default_rules(self):
+        # Arrange
+        engine = RuleEngine(default_rules(DataProcessor.LARGE_TRANSACTION_THRESHOLD,
+                                          DataProcessor.UNCOMMON_CURRENCIES))
+        transaction = Transaction.from_row({"Transaction type": "deposit",
+                                            "Amount": "10", "Currency": "XRP"})
+
+        # Act
+        match = engine.match(transaction)
+
+        # Assert
+        self.assertEqual("uncommon_currency", match)
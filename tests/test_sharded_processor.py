@@ -0,0 +1,176 @@
+"""
+Test suite for the sharded transaction processor and the mergeable aggregates.
+
+Validates that ShardedDataProcessor returns the same results as
+DataProcessor in the same order, and that the merge functions are
+associative.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import itertools
+import random
+from unittest import TestCase
+from data_processor.aggregates import (merge_account_summaries,
+                                       merge_suspicious_transactions,
+                                       merge_transaction_statistics,
+                                       sum_balances,
+                                       sum_totals)
+from data_processor.data_processor import DataProcessor
+from data_processor.sharded_processor import ShardedDataProcessor, get_shard
+
+
+class TestShardedDataProcessor(TestCase):
+    """Defines the unit tests for the ShardedDataProcessor class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        currencies = ["CAD", "USD", "XRP", "CAD", "LTC"]
+        types = ["deposit", "withdrawal", "transfer"]
+        self.transactions = [
+            {"Transaction ID": str(index),
+             "Account number": str(1000 + index % 7),
+             "Transaction type": types[index % 3],
+             "Amount": str(index * 250 % 13000 + 1),
+             "Currency": currencies[index % 5]}
+            for index in range(1, 101)
+        ]
+
+    def test_process_data_matches_data_processor(self):
+        # Arrange
+        expected = DataProcessor(self.transactions).process_data()
+
+        # Act
+        actual = ShardedDataProcessor(self.transactions, workers=3).process_data()
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(list(expected["account_summaries"]),
+                         list(actual["account_summaries"]))
+        self.assertEqual(list(expected["transaction_statistics"]),
+                         list(actual["transaction_statistics"]))
+        self.assertEqual(
+            [transaction["Transaction ID"]
+             for transaction in expected["suspicious_transactions"]],
+            [transaction["Transaction ID"]
+             for transaction in actual["suspicious_transactions"]])
+
+    def test_process_data_single_worker(self):
+        # Arrange
+        expected = DataProcessor(self.transactions).process_data()
+
+        # Act
+        actual = ShardedDataProcessor(self.transactions, workers=1).process_data()
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_process_data_twice(self):
+        # Arrange
+        expected = DataProcessor(self.transactions).process_data()
+        processor = ShardedDataProcessor(self.transactions, workers=2)
+        processor.process_data()
+
+        # Act
+        actual = processor.process_data()
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(len(expected["suspicious_transactions"]),
+                         len(processor.suspicious_rule_names))
+
+    def test_process_data_minor_units_exact(self):
+        # Arrange
+        generator = random.Random(5)
+        transactions = [dict(transaction, Amount=f"{generator.randint(1, 10 ** 6) / 100:.2f}")
+                        for transaction in self.transactions * 20]
+        expected = DataProcessor(transactions, money_mode="minor_units").process_data()
+
+        # Act
+        actual = ShardedDataProcessor(transactions, workers=3,
+                                      money_mode="minor_units").process_data()
+
+        # Assert
+        self.assertEqual(expected, actual)
+
+    def test_process_data_empty(self):
+        # Act
+        actual = ShardedDataProcessor([], workers=2).process_data()
+
+        # Assert
+        self.assertEqual({"account_summaries": {},
+                          "suspicious_transactions": [],
+                          "transaction_statistics": {}}, actual)
+
+    def test_get_shard_is_stable(self):
+        # Act
+        shards = [get_shard("1001", 4) for _ in range(3)]
+
+        # Assert
+        self.assertEqual(1, len(set(shards)))
+        self.assertTrue(0 <= shards[0] < 4)
+
+
+class TestAggregates(TestCase):
+    """Defines the unit tests for the merge functions."""
+
+    def test_merge_account_summaries_associative(self):
+        # Arrange
+        first = {"1": {"account_number": "1", "balance": 5,
+                       "total_deposits": 5, "total_withdrawals": 0}}
+        second = {"1": {"account_number": "1", "balance": -2,
+                        "total_deposits": 0, "total_withdrawals": 2},
+                  "2": {"account_number": "2", "balance": 1,
+                        "total_deposits": 1, "total_withdrawals": 0}}
+        third = {"2": {"account_number": "2", "balance": 3,
+                       "total_deposits": 3, "total_withdrawals": 0}}
+
+        # Act
+        left = merge_account_summaries(merge_account_summaries(first, second), third)
+        right = merge_account_summaries(first, merge_account_summaries(second, third))
+
+        # Assert
+        self.assertEqual(left, right)
+        self.assertEqual(3, left["1"]["balance"])
+        self.assertEqual(4, left["2"]["total_deposits"])
+        self.assertEqual(5, first["1"]["balance"])
+
+    def test_sum_totals_order_independent(self):
+        # Arrange
+        parts = [{"1": {"balance": 0.1, "total_deposits": 1e16}},
+                 {"1": {"balance": 0.2, "total_deposits": 1.0}},
+                 {"1": {"balance": 0.3, "total_deposits": -1e16}}]
+
+        # Act
+        sums = [sum_totals(list(order), ("balance", "total_deposits"))
+                for order in itertools.permutations(parts)]
+
+        # Assert
+        self.assertTrue(all(summed == sums[0] for summed in sums))
+        self.assertEqual(0.6, sums[0]["1"]["balance"])
+        self.assertEqual(1.0, sums[0]["1"]["total_deposits"])
+        self.assertIs(int, type(sum_balances([{"1": 2}, {"1": 3}])["1"]))
+
+    def test_merge_transaction_statistics_identity(self):
+        # Arrange
+        statistics = {"deposit": {"total_amount": 10, "transaction_count": 2}}
+
+        # Act
+        merged = merge_transaction_statistics({}, statistics)
+
+        # Assert
+        self.assertEqual(statistics, merged)
+        self.assertIsNot(statistics["deposit"], merged["deposit"])
+
+    def test_merge_suspicious_transactions_row_order(self):
+        # Arrange
+        left = [(0, "a"), (4, "e")]
+        right = [(1, "b"), (3, "d")]
+
+        # Act
+        merged = merge_suspicious_transactions(left, right)
+
+        # Assert
+        self.assertEqual([(0, "a"), (1, "b"), (3, "d"), (4, "e")], merged)
@@ -0,0 +1,167 @@
+"""
+Test suite for the processing state snapshots.
+
+Validates that DataProcessor state saved to a snapshot is loaded back with
+the same values and value types, and that a run resumed from a snapshot
+only processes the transactions after the high-water mark.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import os
+import tempfile
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.snapshot import load_snapshot, transaction_id_key
+
+
+class TestSnapshot(TestCase):
+    """Defines the unit tests for the snapshot module."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function. It makes a temporary directory for the snapshot file."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, "state.snapshot")
+        self.transactions = [
+            {"Transaction ID": str(index),
+             "Account number": str(1001 + index % 3),
+             "Transaction type": "deposit" if index % 2 else "withdrawal",
+             "Amount": str(index * 10.1),
+             "Currency": "CAD"}
+            for index in range(1, 11)
+        ]
+
+    def test_save_and_load_round_trip(self):
+        # Arrange
+        processor = DataProcessor(self.transactions[:1])
+        processor.process_data()
+
+        # Act
+        processor.save_snapshot(self.file_path)
+        state = load_snapshot(self.file_path)
+
+        # Assert
+        self.assertEqual(processor.account_summaries, state["account_summaries"])
+        self.assertEqual(processor.transaction_statistics,
+                         state["transaction_statistics"])
+        self.assertEqual("1", state["high_water_mark"])
+        self.assertIs(int, type(state["account_summaries"]["1002"]["total_withdrawals"]))
+        self.assertIs(float, type(state["account_summaries"]["1002"]["balance"]))
+
+    def test_minor_units_round_trip_exact(self):
+        # Arrange
+        processor = DataProcessor([
+            {"Transaction ID": "1", "Account number": "1001",
+             "Transaction type": "deposit", "Amount": "90071992547409.93",
+             "Currency": "CAD"}], money_mode="minor_units")
+        processor.process_data()
+
+        # Act
+        processor.save_snapshot(self.file_path)
+        state = load_snapshot(self.file_path)
+        resumed = DataProcessor([], money_mode="minor_units")
+        resumed.load_snapshot(self.file_path)
+
+        # Assert
+        self.assertEqual(2 ** 53 + 1, state["account_summaries"]["1001"]["balance"])
+        self.assertIs(int, type(state["account_summaries"]["1001"]["balance"]))
+        self.assertEqual(2 ** 53 + 1, resumed.account_summaries["1001"]["total_deposits"])
+
+    def test_resume_matches_full_run(self):
+        # Arrange
+        expected = DataProcessor(self.transactions).process_data()
+        first_run = DataProcessor(self.transactions[:6])
+        first_run.process_data()
+        first_run.save_snapshot(self.file_path)
+
+        # Act
+        second_run = DataProcessor(self.transactions)
+        second_run.load_snapshot(self.file_path)
+        actual = second_run.process_data()
+
+        # Assert
+        self.assertEqual(expected["account_summaries"], actual["account_summaries"])
+        self.assertEqual(expected["transaction_statistics"],
+                         actual["transaction_statistics"])
+        self.assertEqual("10", second_run.high_water_mark)
+
+    def test_resume_after_out_of_order_ids(self):
+        """The high-water mark is the highest ID, not the last one."""
+        # Arrange
+        first_run = DataProcessor([
+            {"Transaction ID": transaction_id, "Account number": "1001",
+             "Transaction type": "deposit", "Amount": "100", "Currency": "CAD"}
+            for transaction_id in ("5", "3")])
+        first_run.process_data()
+        first_run.save_snapshot(self.file_path)
+
+        # Act
+        second_run = DataProcessor([
+            {"Transaction ID": transaction_id, "Account number": "1001",
+             "Transaction type": "deposit", "Amount": "100", "Currency": "CAD"}
+            for transaction_id in ("4", "5", "6")])
+        second_run.load_snapshot(self.file_path)
+        actual = second_run.process_data()
+
+        # Assert
+        self.assertEqual("5", first_run.high_water_mark)
+        self.assertEqual(300, actual["account_summaries"]["1001"]["balance"])
+        self.assertEqual("6", second_run.high_water_mark)
+
+    def test_load_snapshot_other_money_mode(self):
+        # Arrange
+        first_run = DataProcessor(self.transactions)
+        first_run.process_data()
+        first_run.save_snapshot(self.file_path)
+        second_run = DataProcessor(self.transactions, money_mode="minor_units")
+
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            second_run.load_snapshot(self.file_path)
+        self.assertEqual("float", load_snapshot(self.file_path)["money_mode"])
+
+    def test_resume_keeps_amount_distributions(self):
+        # Arrange
+        expected = DataProcessor(self.transactions, track_distributions=True)
+        expected.process_data()
+        first_run = DataProcessor(self.transactions[:6], track_distributions=True)
+        first_run.process_data()
+        first_run.save_snapshot(self.file_path)
+
+        # Act
+        second_run = DataProcessor(self.transactions, track_distributions=True)
+        second_run.load_snapshot(self.file_path)
+        second_run.process_data()
+
+        # Assert
+        for group in ("transaction_type", "currency"):
+            self.assertEqual(
+                {key: distribution.summary()["p50"] for key, distribution
+                 in expected.amount_distributions[group].items()},
+                {key: distribution.summary()["p50"] for key, distribution
+                 in second_run.amount_distributions[group].items()})
+        self.assertEqual(10, second_run.amount_distributions["currency"]["CAD"].count)
+
+    def test_load_snapshot_not_a_snapshot(self):
+        # Arrange
+        with open(self.file_path, "wb") as snapshot_file:
+            snapshot_file.write(b"Transaction ID,Account number\n")
+
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            load_snapshot(self.file_path)
+
+    def test_load_snapshot_missing_file(self):
+        # Act and Assert
+        with self.assertRaises(FileNotFoundError):
+            load_snapshot(self.file_path)
+
+    def test_transaction_id_key_numeric_order(self):
+        # Act
+        keys = sorted(["10", "9", "A1", "100"], key=transaction_id_key)
+
+        # Assert
+        self.assertEqual(["9", "10", "100", "A1"], keys)
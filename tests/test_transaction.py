@@ -0,0 +1,91 @@
+"""This module is for making and running tests to test the transaction module.
+To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_transaction.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import pickle
+import sys
+import unittest
+from unittest import TestCase
+from transaction.transaction import Transaction, TransactionType
+
+class TransactionTests(TestCase):
+    """Defines the unit tests for the Transaction class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function.
+        """
+        self.ROW = {'Transaction ID': '1',
+                    'Account number': '1001',
+                    'Date': '2023-03-01',
+                    'Transaction type': 'deposit',
+                    'Amount': '1000.50',
+                    'Currency': 'CAD',
+                    'Description': 'Salary'}
+
+    def test_from_row_parses_amount_and_type(self):
+        """Builds a transaction with a numeric amount and an enum type."""
+        # Act
+        transaction = Transaction.from_row(self.ROW)
+
+        # Assert
+        self.assertEqual(1000.5, transaction.amount)
+        self.assertIs(TransactionType.DEPOSIT, transaction.transaction_type)
+        self.assertIs(sys.intern("1001"), transaction.account_number)
+
+    def test_getitem_returns_fields_as_read(self):
+        """Returns the same values as the row for every column."""
+        # Act
+        transaction = Transaction.from_row(self.ROW)
+
+        # Assert
+        self.assertEqual(self.ROW, transaction.to_dict())
+        self.assertEqual("deposit", transaction["Transaction type"])
+        self.assertEqual("1000.50", transaction["Amount"])
+        with self.assertRaises(KeyError):
+            transaction["Balance"]
+
+    def test_from_row_missing_fields(self):
+        """Sets fields that are not in the row to None."""
+        # Act
+        transaction = Transaction.from_row({"Amount": 5, "Currency": "XRP"})
+
+        # Assert
+        self.assertEqual(5.0, transaction.amount)
+        self.assertIsNone(transaction.account_number)
+        self.assertIsNone(transaction.transaction_type)
+
+    def test_coerce_returns_same_transaction(self):
+        """Returns a Transaction unchanged instead of building a new one."""
+        # Arrange
+        transaction = Transaction.from_row(self.ROW)
+
+        # Act
+        actual = Transaction.coerce(transaction)
+
+        # Assert
+        self.assertIs(transaction, actual)
+
+    def test_pickle_round_trip(self):
+        """Pickles and unpickles to an equal transaction."""
+        # Arrange
+        transaction = Transaction.from_row(self.ROW)
+
+        # Act
+        actual = pickle.loads(pickle.dumps(transaction))
+
+        # Assert
+        self.assertEqual(transaction, actual)
+
+    def test_type_writes_as_its_value(self):
+        """Converts the transaction type to its plain string value."""
+        # Assert
+        self.assertEqual("withdrawal", str(TransactionType.WITHDRAWAL))
+        self.assertEqual("withdrawal", f"{TransactionType.WITHDRAWAL}")
+
+if __name__ == "__main__":
+    unittest.main()
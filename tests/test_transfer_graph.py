@@ -0,0 +1,352 @@
+"""
+Test suite for the transfer graph and double-entry transfers.
+
+Validates the edges, cycles, fan-in and fan-out in a time window, merging
+and saving the graph, and the balances DataProcessor books for transfers
+with a Destination account.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+import csv
+import json
+import os
+import random
+import tempfile
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.fx_rates import FxRateTable
+from data_processor.sharded_processor import ShardedDataProcessor
+from data_processor.transfer_graph import TransferGraph, to_timestamp
+from input_handler.input_handler import InputHandler
+from output_handler.output_handler import OutputHandler
+from transaction.transaction import Transaction
+
+
+class TestTransferGraph(TestCase):
+    """Defines the unit tests for the TransferGraph class."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        generator = random.Random(11)
+        self.transfers = [
+            (str(1000 + generator.randrange(20)), str(1000 + generator.randrange(20)),
+             generator.randint(1, 500),
+             f"2023-{generator.randint(1, 3):02d}-{generator.randint(1, 28):02d}")
+            for _ in range(500)]
+
+    def make_graph(self, transfers: list) -> TransferGraph:
+        """Makes a graph of the transfers."""
+        graph = TransferGraph()
+        for source, destination, amount, date in transfers:
+            graph.add(source, destination, amount, date)
+        return graph
+
+    def test_edges_add_up_transfers(self):
+        # Arrange
+        graph = TransferGraph()
+
+        # Act
+        graph.add("1001", "1002", 100, "2023-03-01")
+        graph.add("1001", "1002", 50, "2023-03-02")
+        graph.add("1001", "1003", 25, "2023-03-02")
+
+        # Assert
+        self.assertEqual({"1002": (2, 150), "1003": (1, 25)}, graph.destinations("1001"))
+        self.assertEqual({"1001": (2, 150)}, graph.sources("1002"))
+        self.assertEqual({}, graph.sources("1001"))
+        self.assertEqual(3, graph.transfer_count)
+        self.assertEqual(2, graph.edge_count)
+        self.assertEqual(["1001", "1002", "1003"], graph.accounts)
+
+    def test_find_cycles(self):
+        # Arrange
+        graph = TransferGraph()
+        for source, destination in [("A", "B"), ("B", "C"), ("C", "A"), ("C", "D"),
+                                    ("D", "E"), ("E", "D"), ("F", "F"), ("G", "A")]:
+            graph.add(source, destination, 10)
+
+        # Act
+        cycles = graph.find_cycles()
+
+        # Assert
+        self.assertEqual([["D", "E"], ["A", "B", "C"], ["F"]],
+                         [sorted(cycle) for cycle in cycles])
+
+    def test_find_cycles_without_cycles(self):
+        # Arrange
+        graph = TransferGraph()
+        for source, destination in [("A", "B"), ("B", "C"), ("A", "C")]:
+            graph.add(source, destination, 10)
+
+        # Act
+        cycles = graph.find_cycles()
+
+        # Assert
+        self.assertEqual([], cycles)
+
+    def test_find_cycles_of_long_chain(self):
+        """A chain deeper than the recursion limit is one cycle."""
+        # Arrange
+        graph = TransferGraph()
+        length = 20000
+        for index in range(length):
+            graph.add(str(index), str((index + 1) % length), 1)
+
+        # Act
+        cycles = graph.find_cycles()
+
+        # Assert
+        self.assertEqual(1, len(cycles))
+        self.assertEqual(length, len(cycles[0]))
+
+    def test_fan_in_and_fan_out_in_window_match_rescan(self):
+        # Arrange
+        graph = self.make_graph(self.transfers)
+
+        for start, end in [("2023-01-01", "2023-01-31"), ("2023-02-10", "2023-02-10"),
+                           (None, "2023-02-14"), ("2023-03-01 12:00", None)]:
+            for account_number in ("1000", "1007"):
+                # Act
+                fan_out = graph.fan_out(account_number, start, end)
+                fan_in = graph.fan_in(account_number, start, end)
+
+                # Assert
+                window = [(source, destination) for source, destination, _, date
+                          in self.transfers
+                          if (start is None or date >= start)
+                          and (end is None or date <= end)]
+                self.assertEqual(len({destination for source, destination in window
+                                      if source == account_number}), fan_out)
+                self.assertEqual(len({source for source, destination in window
+                                      if destination == account_number}), fan_in)
+
+    def test_fan_out_without_window(self):
+        # Arrange
+        graph = self.make_graph(self.transfers)
+
+        # Act
+        fan_out = graph.fan_out("1000")
+
+        # Assert
+        self.assertEqual(len({destination for source, destination, _, _ in self.transfers
+                              if source == "1000"}), fan_out)
+        self.assertEqual(0, graph.fan_out("9999", "2023-01-01", "2023-12-31"))
+
+    def test_fan_out_window_with_invalid_date(self):
+        # Arrange
+        graph = self.make_graph(self.transfers)
+
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            graph.fan_out("1000", "not a date")
+
+    def test_to_timestamp_end_of_day(self):
+        # Act
+        start = to_timestamp("2023-03-15")
+        end = to_timestamp("2023-03-15", end_of_day=True)
+
+        # Assert
+        self.assertLess(start, to_timestamp("2023-03-15 23:59:59"))
+        self.assertGreater(end, to_timestamp("2023-03-15 23:59:59"))
+        self.assertLess(end, to_timestamp("2023-03-16"))
+
+    def test_merge_matches_single_graph(self):
+        # Arrange
+        graph = self.make_graph(self.transfers)
+
+        # Act
+        merged = self.make_graph(self.transfers[:200]).merge(
+            self.make_graph(self.transfers[200:]))
+
+        # Assert
+        self.assertEqual(graph.transfer_count, merged.transfer_count)
+        for account_number in graph.accounts:
+            self.assertEqual(graph.destinations(account_number),
+                             merged.destinations(account_number))
+            self.assertEqual(graph.fan_in(account_number, "2023-02-01", "2023-02-28"),
+                             merged.fan_in(account_number, "2023-02-01", "2023-02-28"))
+        self.assertEqual(sorted(map(sorted, graph.find_cycles())),
+                         sorted(map(sorted, merged.find_cycles())))
+
+    def test_to_dict_round_trip(self):
+        # Arrange
+        graph = self.make_graph(self.transfers)
+
+        # Act
+        rebuilt = TransferGraph.from_dict(json.loads(json.dumps(graph.to_dict())))
+
+        # Assert
+        self.assertEqual(graph.transfer_count, rebuilt.transfer_count)
+        for account_number in graph.accounts:
+            self.assertEqual(graph.sources(account_number), rebuilt.sources(account_number))
+            self.assertEqual(graph.fan_out(account_number, "2023-01-15", "2023-03-15"),
+                             rebuilt.fan_out(account_number, "2023-01-15", "2023-03-15"))
+
+
+class TestDoubleEntryTransfers(TestCase):
+    """Defines the unit tests for the transfers DataProcessor books."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function."""
+        generator = random.Random(3)
+        self.transactions = []
+        for index in range(1000):
+            transaction_type = generator.choice(["deposit", "withdrawal", "transfer"])
+            destination = str(1000 + generator.randrange(12)) \
+                if transaction_type == "transfer" and generator.random() < 0.8 else None
+            self.transactions.append(Transaction(
+                str(index), str(1000 + generator.randrange(10)),
+                f"2023-{generator.randint(1, 3):02d}-{generator.randint(1, 28):02d}",
+                transaction_type, generator.randint(1, 500),
+                generator.choice(["CAD", "USD"]), "Test", None, destination))
+
+    def test_transfer_moves_balance(self):
+        # Arrange
+        data_processor = DataProcessor([
+            Transaction("1", "1001", "2023-03-01", "deposit", 500, "CAD", "Pay"),
+            Transaction("2", "1001", "2023-03-02", "transfer", 200, "CAD", "Rent", None, "1002"),
+            Transaction("3", "1001", "2023-03-03", "transfer", 50, "CAD", "Transfer to Savings")
+        ], track_transfer_graph=True)
+
+        # Act
+        account_summaries = data_processor.process_data()["account_summaries"]
+
+        # Assert
+        self.assertEqual({"account_number": "1001", "balance": 300,
+                          "total_deposits": 500, "total_withdrawals": 0},
+                         dict(account_summaries["1001"]))
+        self.assertEqual({"account_number": "1002", "balance": 200,
+                          "total_deposits": 0, "total_withdrawals": 0},
+                         dict(account_summaries["1002"]))
+        self.assertEqual(1, data_processor.unresolved_transfer_count)
+        self.assertEqual({"1002": (1, 200)}, data_processor.transfer_graph.destinations("1001"))
+
+    def test_transfers_keep_total_balance(self):
+        # Arrange
+        data_processor = DataProcessor(self.transactions, track_rollups=True,
+                                       track_currency_balances=True)
+
+        # Act
+        account_summaries = data_processor.process_data()["account_summaries"]
+
+        # Assert
+        deposits = sum(transaction.amount for transaction in self.transactions
+                       if transaction.transaction_type == "deposit")
+        withdrawals = sum(transaction.amount for transaction in self.transactions
+                          if transaction.transaction_type == "withdrawal")
+        self.assertEqual(deposits - withdrawals,
+                         sum(summary["balance"] for summary in account_summaries.values()))
+        for account_number, summary in account_summaries.items():
+            self.assertEqual(summary["balance"],
+                             sum(data_processor.currency_balances[account_number].values()))
+            self.assertEqual(summary["balance"],
+                             data_processor.rollups.balance_as_of(account_number, "2023-12-31"))
+
+    def test_transfer_reporting_balances(self):
+        # Arrange
+        fx_rates = FxRateTable("CAD")
+        fx_rates.add_rate("USD", "2023-01-01", 1.25)
+        data_processor = DataProcessor([
+            Transaction("1", "1001", "2023-03-02", "transfer", 200, "USD", "Rent", None, "1002")
+        ], fx_rates=fx_rates)
+
+        # Act
+        data_processor.process_data()
+
+        # Assert
+        self.assertEqual({"1001": {"USD": -200}, "1002": {"USD": 200}},
+                         data_processor.currency_balances)
+        self.assertEqual({"1001": -250.0, "1002": 250.0}, data_processor.reporting_balances)
+
+    def test_sharded_processor_matches_data_processor(self):
+        # Arrange
+        data_processor = DataProcessor(self.transactions, track_transfer_graph=True,
+                                       track_currency_balances=True)
+        sharded = ShardedDataProcessor(self.transactions, workers=3,
+                                       track_transfer_graph=True,
+                                       track_currency_balances=True)
+
+        # Act
+        expected = data_processor.process_data()["account_summaries"]
+        actual = sharded.process_data()["account_summaries"]
+
+        # Assert
+        self.assertEqual(list(expected), list(actual))
+        self.assertEqual({account_number: dict(summary) for account_number, summary
+                          in expected.items()}, actual)
+        self.assertEqual(data_processor.currency_balances, sharded.currency_balances)
+        self.assertEqual(data_processor.transfer_graph.transfer_count,
+                         sharded.transfer_graph.transfer_count)
+        for account_number in data_processor.transfer_graph.accounts:
+            self.assertEqual(data_processor.transfer_graph.destinations(account_number),
+                             sharded.transfer_graph.destinations(account_number))
+
+    def test_snapshot_keeps_transfer_graph(self):
+        # Arrange
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        file_path = os.path.join(directory.name, "state.snapshot")
+        data_processor = DataProcessor(self.transactions[:500], track_transfer_graph=True)
+        data_processor.process_data()
+        data_processor.save_snapshot(file_path)
+        full = DataProcessor(self.transactions, track_transfer_graph=True)
+        full.process_data()
+
+        # Act
+        resumed = DataProcessor(self.transactions, track_transfer_graph=True)
+        resumed.load_snapshot(file_path)
+        resumed.process_data()
+
+        # Assert
+        self.assertEqual(full.transfer_graph.transfer_count,
+                         resumed.transfer_graph.transfer_count)
+        for account_number in full.transfer_graph.accounts:
+            self.assertEqual(full.transfer_graph.sources(account_number),
+                             resumed.transfer_graph.sources(account_number))
+
+    def test_reads_destination_account_column(self):
+        # Arrange
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        file_path = os.path.join(directory.name, "transfers.csv")
+        with open(file_path, "w", newline="") as input_file:
+            writer = csv.writer(input_file)
+            writer.writerow(list(Transaction.COLUMNS) + ["Destination account"])
+            writer.writerow(["1", "1001", "2023-03-01", "transfer", "100.00", "CAD", "Rent", "1002"])
+            writer.writerow(["2", "1001", "2023-03-01", "deposit", "50.00", "CAD", "Pay", ""])
+
+        # Act
+        transactions = list(InputHandler(file_path).iter_transactions())
+
+        # Assert
+        self.assertEqual(["1002", None],
+                         [transaction.destination_account for transaction in transactions])
+        self.assertEqual("1002", transactions[0]["Destination account"])
+        self.assertNotIn("Destination account", transactions[1].to_dict())
+
+    def test_write_transfer_graph_to_csv(self):
+        # Arrange
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        file_path = os.path.join(directory.name, "transfer_graph.csv")
+        graph = TransferGraph()
+        for source, destination, amount in [("1001", "1002", 100), ("1002", "1001", 40),
+                                            ("1001", "1003", 10)]:
+            graph.add(source, destination, amount, "2023-03-01")
+        output_handler = OutputHandler({}, [], {}, transfer_graph=graph)
+
+        # Act
+        output_handler.write_transfer_graph_to_csv(file_path)
+
+        # Assert
+        with open(file_path, newline="") as output_file:
+            rows = list(csv.reader(output_file))
+        self.assertEqual(["Account number", "Transfers out", "Amount out", "Transfers in",
+                          "Amount in", "Fan-out", "Fan-in", "Cycle"], rows[0])
+        self.assertEqual([["1001", "2", "110", "1", "40", "2", "1", "1"],
+                          ["1002", "1", "40", "1", "100", "1", "1", "1"],
+                          ["1003", "0", "0", "1", "10", "0", "1", ""]], rows[1:])
@@ -0,0 +1,99 @@
+"""This module is for making and running tests to test the validation module.
+To be able to run the tests use this command in the terminal.
+python3 -m unittest tests/test_validation.py
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import csv
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+from input_handler.input_handler import InputHandler
+from input_handler import validation
+from transaction.transaction import TransactionType
+
+class ValidationTests(TestCase):
+    """Defines the unit tests for the validation module."""
+
+    def setUp(self):
+        """This function is invoked before executing a unit test
+        function. It writes a csv file to a temporary directory.
+        """
+        self.FILE_CONTENTS = \
+            ("Transaction ID,Account number,Date,Transaction type,"
+            + "Amount,Currency,Description\n"
+            + "1,1001,2023-03-01,deposit,1000,CAD,Salary\n"
+            + "2,1002,2023-03-01,deposit,-1500,CAD,Salary\n"
+            + "3,1001,2023-03-02,refund,200,CAD,Groceries\n"
+            + "4,1002,2023-03-03,transfer,abc,CAD,Savings\n")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.file_path = os.path.join(directory.name, "input_data.csv")
+        self.quarantine_path = os.path.join(directory.name, "quarantine.csv")
+        with open(self.file_path, "w") as output_file:
+            output_file.write(self.FILE_CONTENTS)
+
+    def test_to_floats_marks_values_that_are_not_numbers(self):
+        """Returns None for each value that is not a number."""
+        # Act
+        actual = validation.to_floats(["1", "2.5", "a", None, "-3"])
+
+        # Assert
+        self.assertEqual([1.0, 2.5, None, None, -3.0], actual)
+
+    def test_to_transaction_types(self):
+        """Returns None for each value that is not a transaction type."""
+        # Act
+        actual = validation.to_transaction_types(["deposit", "a", None, 1])
+
+        # Assert
+        self.assertEqual([TransactionType.DEPOSIT, None, None, None], actual)
+
+    def test_rejection_reason(self):
+        """Returns the reason code of a row that is not valid."""
+        # Arrange
+        rows = [{"Amount": "a", "Transaction type": "deposit"},
+                {"Amount": "nan", "Transaction type": "deposit"},
+                {"Amount": 0, "Transaction type": "deposit"},
+                {"Amount": 10, "Transaction type": "a"},
+                {"Amount": 10, "Transaction type": "deposit"}]
+
+        # Act
+        actual = [validation.rejection_reason(row) for row in rows]
+
+        # Assert
+        expected = [validation.NON_NUMERIC_AMOUNT,
+                    validation.NON_NUMERIC_AMOUNT,
+                    validation.NON_POSITIVE_AMOUNT,
+                    validation.INVALID_TRANSACTION_TYPE, ""]
+        self.assertEqual(expected, actual)
+
+    def test_rejected_rows_written_to_quarantine(self):
+        """Writes every rejected row with its reason in the same pass as
+        reading the valid transactions."""
+        # Arrange
+        input = InputHandler(self.file_path,
+                             quarantine_path=self.quarantine_path)
+
+        # Act
+        transactions = list(input.iter_transactions())
+
+        # Assert
+        with open(self.quarantine_path, newline="") as quarantine_file:
+            actual = [(row["Transaction ID"], row["Rejection reason"])
+                      for row in csv.DictReader(quarantine_file)]
+        self.assertEqual(["1"], [transaction.transaction_id
+                                 for transaction in transactions])
+        self.assertEqual([("2", "NON_POSITIVE_AMOUNT"),
+                          ("3", "INVALID_TRANSACTION_TYPE"),
+                          ("4", "NON_NUMERIC_AMOUNT")], actual)
+        self.assertEqual(3, input.rejected_count)
+        self.assertEqual({"NON_POSITIVE_AMOUNT": 1,
+                          "INVALID_TRANSACTION_TYPE": 1,
+                          "NON_NUMERIC_AMOUNT": 1}, input.rejection_counts)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Test suite for the sliding-window velocity detector.
+
+Validates window counts and totals, expiry of old transactions, dropping of
+idle accounts and the velocity rule names DataProcessor records.
+"""
+
+__author__ = "sandeep kaur"
+__version__ = "1.0."
+
+from unittest import TestCase
+from data_processor.data_processor import DataProcessor
+from data_processor.velocity import VelocityDetector, parse_timestamp
+from transaction.transaction import Transaction
+
+
+def make_transaction(account_number: str, date: str, amount: str,
+                     transaction_type: str = "withdrawal") -> Transaction:
+    """Makes a Transaction with the fields the detector uses."""
+    return Transaction.from_row({"Transaction ID": "1",
+                                 "Account number": account_number,
+                                 "Date": date,
+                                 "Transaction type": transaction_type,
+                                 "Amount": amount,
+                                 "Currency": "CAD"})
+
+
+class TestVelocityDetector(TestCase):
+    """Defines the unit tests for the VelocityDetector class."""
+
+    def test_count_over_limit(self):
+        # Arrange
+        detector = VelocityDetector("many_withdrawals", 24, max_count=2)
+
+        # Act
+        flags = [detector.observe(make_transaction("1001", "2023-03-01", "10"))
+                 for _ in range(3)]
+
+        # Assert
+        self.assertEqual([False, False, True], flags)
+
+    def test_amount_over_limit_expires(self):
+        # Arrange
+        detector = VelocityDetector("structuring", 48, max_amount=9000)
+        dates = ["2023-03-01", "2023-03-02", "2023-03-03", "2023-03-05"]
+
+        # Act
+        flags = [detector.observe(make_transaction("1001", date, "4000"))
+                 for date in dates]
+
+        # Assert
+        self.assertEqual([False, False, False, False], flags)
+
+    def test_amount_over_limit_within_window(self):
+        # Arrange
+        detector = VelocityDetector("structuring", 48, max_amount=9000)
+        dates = ["2023-03-01", "2023-03-02", "2023-03-02", "2023-03-04"]
+
+        # Act
+        flags = [detector.observe(make_transaction("1001", date, "4000"))
+                 for date in dates]
+
+        # Assert
+        self.assertEqual([False, False, True, False], flags)
+
+    def test_other_types_not_counted(self):
+        # Arrange
+        detector = VelocityDetector("many_withdrawals", 24, max_count=1)
+
+        # Act
+        flags = [detector.observe(make_transaction("1001", "2023-03-01", "10",
+                                                   "deposit"))
+                 for _ in range(3)]
+
+        # Assert
+        self.assertEqual([False, False, False], flags)
+        self.assertEqual(0, detector.account_count)
+
+    def test_idle_accounts_dropped(self):
+        # Arrange
+        detector = VelocityDetector("many_withdrawals", 24, max_count=5)
+        detector.observe(make_transaction("1001", "2023-03-01", "10"))
+        detector.observe(make_transaction("1002", "2023-03-01", "10"))
+
+        # Act
+        detector.observe(make_transaction("1003", "2023-03-03", "10"))
+
+        # Assert
+        self.assertEqual(1, detector.account_count)
+
+    def test_max_accounts_bound(self):
+        # Arrange
+        detector = VelocityDetector("many_withdrawals", 24, max_count=5,
+                                    max_accounts=10)
+
+        # Act
+        for account_number in range(100):
+            detector.observe(make_transaction(str(account_number),
+                                              "2023-03-01", "10"))
+
+        # Assert
+        self.assertEqual(10, detector.account_count)
+
+    def test_needs_a_limit(self):
+        # Act and Assert
+        with self.assertRaises(ValueError):
+            VelocityDetector("no_limit", 24)
+
+    def test_limits_not_valid(self):
+        # Act and Assert
+        for window_hours, max_count in [(0, 1), (-1, 1), (24, 0)]:
+            with self.subTest(window_hours=window_hours, max_count=max_count):
+                with self.assertRaises(ValueError):
+                    VelocityDetector("not_valid", window_hours, max_count=max_count)
+
+    def test_parse_timestamp_invalid(self):
+        # Act and Assert
+        self.assertIsNone(parse_timestamp("not a date"))
+        self.assertIsNone(parse_timestamp(None))
+        self.assertEqual(86400, parse_timestamp("1970-01-02"))
+
+    def test_data_processor_flags_velocity(self):
+        # Arrange
+        transactions = [make_transaction("1001", "2023-03-01", "100")
+                        for _ in range(3)]
+        detector = VelocityDetector("many_withdrawals", 24, max_count=2)
+        processor = DataProcessor(transactions, velocity_detectors=[detector])
+
+        # Act
+        result = processor.process_data()
+
+        # Assert
+        self.assertEqual([transactions[2]], result["suspicious_transactions"])
+        self.assertEqual(["many_withdrawals"], processor.suspicious_rule_names)
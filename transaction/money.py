@@ -0,0 +1,104 @@
+"""This module is for exact money arithmetic with integer minor units, e.g.
+cents. Amounts are parsed straight from their decimal strings into integers,
+so sums of any number of amounts are exact, and are only turned back into
+decimal strings for output.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+
+MINOR_UNIT_SCALE = 2
+"""The number of decimal places of a minor unit, e.g. 2 for cents."""
+
+EXACT_FLOAT_LIMIT = 2 ** 50
+"""The largest number of minor units a float amount is converted from
+without parsing the amount string. Below it the float times the factor is
+within 0.5 of the exact number of minor units, so rounding it is exact."""
+
+
+def parse_minor_units(amount, scale: int = MINOR_UNIT_SCALE,
+                      parsed: float = None) -> int:
+    """Parses an amount into integer minor units without going through a
+    float, so "0.1" is exactly 10 cents.
+
+    Plain decimal strings such as "-1234.5" are parsed with string and int
+    operations only, and those with exactly scale decimal places, the usual
+    case, with a single int call. Anything else, e.g. "1e3" or more decimal
+    places than the scale, goes through Decimal and is rounded half to even.
+
+    When the float already parsed from the string is given, it is
+    rounded to minor units instead, and the string is only parsed when that
+    is not exact. This is checked by converting the minor units back: only
+    the float of an amount with at most scale decimal places is equal to
+    its minor units divided by the factor.
+
+    Args:
+        amount: The amount as a str, int or float.
+        scale (int): The number of decimal places of a minor unit.
+        parsed (float): The float of the amount, e.g. Transaction.amount.
+
+    Returns:
+        units: the amount in minor units.
+
+    Raises:
+        ValueError: If the amount is not a finite number.
+    """
+    factor = 10 ** scale
+
+    if parsed is not None:
+        scaled = parsed * factor
+        if -EXACT_FLOAT_LIMIT < scaled < EXACT_FLOAT_LIMIT:
+            units = round(scaled)
+            if units / factor == parsed:
+                return units
+
+    if isinstance(amount, int):
+        return amount * factor
+    if isinstance(amount, float):
+        amount = repr(amount)
+    if not isinstance(amount, str):
+        raise ValueError(f"Amount: {amount!r} is not a number.")
+
+    amount = amount.strip()
+
+    # int() would also take spaces and underscores, so the fast path is
+    # only for a sign, decimal digits, a point and scale decimal digits.
+    if scale and amount[-scale - 1:-scale] == "." and amount[-scale:].isdecimal():
+        whole = amount[:-scale - 1]
+        if (whole[1:] if whole[:1] in ("-", "+") else whole).isdecimal():
+            return int(whole + amount[-scale:])
+
+    whole, _, fraction = amount.partition(".")
+    digits = whole[1:] if whole[:1] in ("-", "+") else whole
+
+    if len(fraction) <= scale and (digits.isdecimal() or not digits) \
+            and (fraction.isdecimal() or not fraction) and (digits or fraction):
+        units = int(digits or "0") * factor + int(fraction.ljust(scale, "0") or "0")
+        return -units if whole[:1] == "-" else units
+
+    try:
+        return int((Decimal(amount) * factor).quantize(Decimal(1),
+                                                       rounding=ROUND_HALF_EVEN))
+    except InvalidOperation:
+        raise ValueError(f"Amount: {amount!r} is not a number.") from None
+
+
+def format_minor_units(units: int, scale: int = MINOR_UNIT_SCALE) -> str:
+    """Formats integer minor units as a decimal string, e.g. 123456 as
+    "1234.56".
+
+    Args:
+        units (int): The amount in minor units.
+        scale (int): The number of decimal places of a minor unit.
+
+    Returns:
+        amount: the decimal string with exactly scale decimal places.
+    """
+    sign = "-" if units < 0 else ""
+    whole, fraction = divmod(abs(units), 10 ** scale)
+
+    if not scale:
+        return f"{sign}{whole}"
+    return f"{sign}{whole}.{fraction:0{scale}d}"
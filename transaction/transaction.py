@@ -0,0 +1,185 @@
+"""This module is for the typed transaction record that is built once when
+a row is read, so the amount is only parsed once and each row is stored
+in a small slotted object instead of a dictionary of strings.
+"""
+
+__author__ = "Thomas Littleton"
+__version__ = "1.0."
+
+import sys
+from enum import Enum
+
+
+class TransactionType(str, Enum):
+    """The types a valid transaction can have. The members compare equal to
+    their string values, so they can be used anywhere a type string is."""
+
+    DEPOSIT = "deposit"
+    WITHDRAWAL = "withdrawal"
+    TRANSFER = "transfer"
+
+    __str__ = str.__str__
+
+
+TRANSACTION_TYPES = {member.value: member for member in TransactionType}
+"""The TransactionType members by their string values."""
+
+
+class Transaction:
+    """One transaction with typed fields.
+
+    Fields can also be read by their column name, e.g.
+    transaction["Amount"], so code written for the dictionaries from
+    csv.DictReader keeps working.
+    """
+
+    __slots__ = ("transaction_id", "account_number", "date",
+                 "transaction_type", "amount", "currency", "description",
+                 "raw_amount", "destination_account")
+
+    COLUMNS = {
+        "Transaction ID": "transaction_id",
+        "Account number": "account_number",
+        "Date": "date",
+        "Transaction type": "transaction_type",
+        "Amount": "raw_amount",
+        "Currency": "currency",
+        "Description": "description"
+    }
+    """The attribute names by column name, in the order of the columns."""
+
+    OPTIONAL_COLUMNS = {
+        "Destination account": "destination_account"
+    }
+    """The attribute names of the columns a file can leave out. The
+    Destination account is the account a transfer moves money into."""
+
+    def __init__(self, transaction_id, account_number, date,
+                 transaction_type, amount: float, currency, description,
+                 raw_amount=None, destination_account=None):
+        """Initializes a new instance of the Transaction class.
+
+        Args:
+            transaction_id: The Transaction ID.
+            account_number: The account number, stored as an interned string.
+            date: The date of the transaction.
+            transaction_type: A TransactionType, or the string for a type
+                that is not valid.
+            amount (float): The amount as a number.
+            currency: The currency code.
+            description: The description.
+            raw_amount: The amount as it was read. Defaults to amount.
+            destination_account: The account a transfer moves money into,
+                stored as an interned string, or None if there is none.
+        """
+        self.transaction_id = transaction_id
+        self.account_number = None if account_number is None \
+            else sys.intern(str(account_number))
+        self.date = date
+        self.transaction_type = transaction_type
+        self.amount = amount
+        self.currency = currency
+        self.description = description
+        self.raw_amount = amount if raw_amount is None else raw_amount
+        self.destination_account = None if destination_account in (None, "") \
+            else sys.intern(str(destination_account))
+
+    @classmethod
+    def from_row(cls, row: dict, amount: float = None) -> "Transaction":
+        """Builds a transaction from a csv or json row. Missing fields are
+        set to None.
+
+        Args:
+            row (dict): The row with the column names as keys.
+            amount (float): The amount if it has already been parsed.
+
+        Returns:
+            transaction: the new Transaction.
+        """
+        raw_amount = row["Amount"]
+        transaction_type = row.get("Transaction type")
+
+        return cls(row.get("Transaction ID"),
+                   row.get("Account number"),
+                   row.get("Date"),
+                   TRANSACTION_TYPES.get(transaction_type, transaction_type),
+                   float(raw_amount) if amount is None else amount,
+                   row.get("Currency"),
+                   row.get("Description"),
+                   raw_amount,
+                   row.get("Destination account"))
+
+    @classmethod
+    def coerce(cls, transaction) -> "Transaction":
+        """Returns the transaction as a Transaction, building one if it is a
+        dictionary.
+
+        Args:
+            transaction: A Transaction or a row dictionary.
+
+        Returns:
+            transaction: the Transaction.
+        """
+        if isinstance(transaction, cls):
+            return transaction
+        return cls.from_row(transaction)
+
+    def __getitem__(self, column: str):
+        """Gets a field by its column name.
+
+        Args:
+            column (str): The column name, e.g. "Account number".
+
+        Returns:
+            value: the value of the field.
+        """
+        attribute = self.COLUMNS.get(column) or self.OPTIONAL_COLUMNS.get(column)
+        if attribute is None:
+            raise KeyError(column)
+        return getattr(self, attribute)
+
+    def get(self, column: str, default=None):
+        """Gets a field by its column name, or default if there is no such
+        column.
+        """
+        try:
+            return self[column]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> dict:
+        """Gets the transaction as a row dictionary.
+
+        Returns:
+            row: a dictionary with the column names as keys, and the
+            optional columns that have a value.
+        """
+        row = {column: getattr(self, attribute)
+               for column, attribute in self.COLUMNS.items()}
+        for column, attribute in self.OPTIONAL_COLUMNS.items():
+            if getattr(self, attribute) is not None:
+                row[column] = getattr(self, attribute)
+        return row
+
+    def to_tuple(self) -> tuple:
+        """Gets the field values in the order of the __init__ arguments, so
+        Transaction(*transaction.to_tuple()) is an equal transaction.
+        """
+        return tuple(getattr(self, attribute) for attribute in self.__slots__)
+
+    def __reduce__(self):
+        """Pickles the transaction as its field values only."""
+        return (Transaction, self.to_tuple())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute)
+                   for attribute in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Transaction({self.transaction_id!r}, {self.account_number!r}, "
+                f"{self.date!r}, {str(self.transaction_type)!r}, "
+                f"{self.amount!r}, {self.currency!r}, {self.description!r})")